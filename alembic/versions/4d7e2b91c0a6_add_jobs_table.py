@@ -0,0 +1,45 @@
+"""add jobs table
+
+Revision ID: 4d7e2b91c0a6
+Revises: b8ecf4830e28
+Create Date: 2026-10-18 10:12:41.208317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d7e2b91c0a6'
+down_revision = 'b8ecf4830e28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('data_source_id', sa.Integer(), nullable=True),
+        sa.Column('kind', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('phase', sa.String(), nullable=True),
+        sa.Column('accounts_total', sa.Integer(), nullable=True),
+        sa.Column('accounts_fetched', sa.Integer(), nullable=True),
+        sa.Column('rows_loaded', sa.Integer(), nullable=True),
+        sa.Column('timings', sa.JSON(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        schema='public',
+    )
+    op.create_index(op.f('ix_public_jobs_user_id'), 'jobs', ['user_id'], unique=False, schema='public')
+
+
+def downgrade():
+    op.drop_index(op.f('ix_public_jobs_user_id'), table_name='jobs', schema='public')
+    op.drop_table('jobs', schema='public')
@@ -0,0 +1,30 @@
+"""add sync state to data_sources
+
+Revision ID: 7a1c5e0f3b28
+Revises: 4d7e2b91c0a6
+Create Date: 2026-10-18 11:02:17.530946
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a1c5e0f3b28'
+down_revision = '4d7e2b91c0a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('data_sources', sa.Column('ad_accounts', sa.JSON(), nullable=True), schema='public')
+    op.add_column('data_sources', sa.Column('field_options', sa.JSON(), nullable=True), schema='public')
+    op.add_column('data_sources', sa.Column('date_window', sa.String(), nullable=True), schema='public')
+    op.add_column('data_sources', sa.Column('synced_until', sa.DateTime(), nullable=True), schema='public')
+
+
+def downgrade():
+    op.drop_column('data_sources', 'synced_until', schema='public')
+    op.drop_column('data_sources', 'date_window', schema='public')
+    op.drop_column('data_sources', 'field_options', schema='public')
+    op.drop_column('data_sources', 'ad_accounts', schema='public')
@@ -0,0 +1,24 @@
+"""add refresh_interval_hours to data_sources
+
+Revision ID: c3f9a6d2e741
+Revises: 7a1c5e0f3b28
+Create Date: 2026-10-18 12:24:05.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f9a6d2e741'
+down_revision = '7a1c5e0f3b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('data_sources', sa.Column('refresh_interval_hours', sa.Integer(), nullable=True), schema='public')
+
+
+def downgrade():
+    op.drop_column('data_sources', 'refresh_interval_hours', schema='public')
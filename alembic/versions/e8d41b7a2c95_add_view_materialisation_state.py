@@ -0,0 +1,32 @@
+"""add view materialisation state
+
+Revision ID: e8d41b7a2c95
+Revises: c3f9a6d2e741
+Create Date: 2026-10-18 16:02:41.530218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8d41b7a2c95'
+down_revision = 'c3f9a6d2e741'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('views', sa.Column('materialized_at', sa.DateTime(), nullable=True), schema='public')
+    op.add_column('views', sa.Column('refresh_date_column', sa.String(), nullable=True), schema='public')
+    op.create_index(op.f('ix_public_join_conditions_view_id'), 'join_conditions', ['view_id'], unique=False, schema='public')
+    op.create_index(op.f('ix_public_join_conditions_left_data_source_id'), 'join_conditions', ['left_data_source_id'], unique=False, schema='public')
+    op.create_index(op.f('ix_public_join_conditions_right_data_source_id'), 'join_conditions', ['right_data_source_id'], unique=False, schema='public')
+
+
+def downgrade():
+    op.drop_index(op.f('ix_public_join_conditions_right_data_source_id'), table_name='join_conditions', schema='public')
+    op.drop_index(op.f('ix_public_join_conditions_left_data_source_id'), table_name='join_conditions', schema='public')
+    op.drop_index(op.f('ix_public_join_conditions_view_id'), table_name='join_conditions', schema='public')
+    op.drop_column('views', 'refresh_date_column', schema='public')
+    op.drop_column('views', 'materialized_at', schema='public')
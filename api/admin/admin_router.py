@@ -2,8 +2,10 @@
 
 from fastapi import APIRouter
 
-from api.admin import user
+from api.admin import user, metrics, scheduler
 
 router = APIRouter(prefix="/admin")
 
 router.include_router(user.router)
+router.include_router(metrics.router)
+router.include_router(scheduler.router)
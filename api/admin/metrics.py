@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+
+from api.core.auth import get_admin_user
+from api.core.jobs import job_queue
+from api.utilities.cache import cache_stats
+from api.utilities.http import http_client
+from api.utilities.rate_limit import rate_limiter
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("", response_model=Dict[str, Any])
+def metrics(token: str) -> Dict[str, Any]:
+    get_admin_user(token)
+
+    return {
+        "caches": cache_stats(),
+        "http": http_client.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "jobs": job_queue.stats(),
+    }
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+
+from api.core.auth import get_admin_user
+from api.core.scheduler import refresh_scheduler
+
+router = APIRouter(prefix="/scheduler")
+
+
+@router.get("", response_model=Dict[str, Any])
+def scheduler(token: str) -> Dict[str, Any]:
+    get_admin_user(token)
+
+    return refresh_scheduler.stats()
@@ -33,4 +33,51 @@ class Config(object):
     POSTGRES_HOST = os.getenv("POSTGRES_HOST")
     POSTGRES_USERNAME= os.getenv("POSTGRES_USERNAME")
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-    POSTGRES_DB_NAME = os.getenv("POSTGRES_DB_NAME")
\ No newline at end of file
+    POSTGRES_DB_NAME = os.getenv("POSTGRES_DB_NAME")
+    STREAM_BATCH_SIZE = os.getenv("STREAM_BATCH_SIZE", "5000")
+    LOAD_CHUNK_ROWS = os.getenv("LOAD_CHUNK_ROWS", "50000")
+    FETCH_MAX_WORKERS = os.getenv("FETCH_MAX_WORKERS", "8")
+    FETCH_PLATFORM_CONCURRENCY = os.getenv("FETCH_PLATFORM_CONCURRENCY", "4")
+    FETCH_PLATFORM_CONCURRENCY_GOOGLE = os.getenv("FETCH_PLATFORM_CONCURRENCY_GOOGLE")
+    FETCH_PLATFORM_CONCURRENCY_GOOGLE_VIDEO = os.getenv("FETCH_PLATFORM_CONCURRENCY_GOOGLE_VIDEO")
+    FETCH_PLATFORM_CONCURRENCY_GOOGLE_ANALYTICS = os.getenv("FETCH_PLATFORM_CONCURRENCY_GOOGLE_ANALYTICS")
+    FETCH_PLATFORM_CONCURRENCY_YOUTUBE = os.getenv("FETCH_PLATFORM_CONCURRENCY_YOUTUBE")
+    FETCH_PLATFORM_CONCURRENCY_FACEBOOK = os.getenv("FETCH_PLATFORM_CONCURRENCY_FACEBOOK", "2")
+    FETCH_PLATFORM_CONCURRENCY_INSTAGRAM_MEDIA = os.getenv("FETCH_PLATFORM_CONCURRENCY_INSTAGRAM_MEDIA", "2")
+    FETCH_PLATFORM_CONCURRENCY_INSTAGRAM_ACCOUNT = os.getenv("FETCH_PLATFORM_CONCURRENCY_INSTAGRAM_ACCOUNT", "2")
+    FETCH_DATE_WINDOW = os.getenv("FETCH_DATE_WINDOW")
+    FETCH_WINDOW_WORKERS = os.getenv("FETCH_WINDOW_WORKERS", "4")
+    FETCH_WINDOW_RETRIES = os.getenv("FETCH_WINDOW_RETRIES", "2")
+    HTTP_CONNECT_TIMEOUT = os.getenv("HTTP_CONNECT_TIMEOUT", "5")
+    HTTP_READ_TIMEOUT = os.getenv("HTTP_READ_TIMEOUT", "120")
+    HTTP_POOL_CONNECTIONS = os.getenv("HTTP_POOL_CONNECTIONS", "20")
+    HTTP_POOL_MAXSIZE = os.getenv("HTTP_POOL_MAXSIZE", "20")
+    HTTP_RETRIES = os.getenv("HTTP_RETRIES", "3")
+    HTTP_BACKOFF_FACTOR = os.getenv("HTTP_BACKOFF_FACTOR", "0.5")
+    FACEBOOK_ASYNC_REPORT_DAYS = os.getenv("FACEBOOK_ASYNC_REPORT_DAYS", "90")
+    FACEBOOK_REPORT_TIMEOUT = os.getenv("FACEBOOK_REPORT_TIMEOUT", "900")
+    INSTAGRAM_BATCH_CONCURRENCY = os.getenv("INSTAGRAM_BATCH_CONCURRENCY", "4")
+    FACEBOOK_AD_ACCOUNTS_TTL = os.getenv("FACEBOOK_AD_ACCOUNTS_TTL", "300")
+    GOOGLE_AD_ACCOUNTS_TTL = os.getenv("GOOGLE_AD_ACCOUNTS_TTL", "300")
+    GOOGLE_CUSTOMER_QUERY_WORKERS = os.getenv("GOOGLE_CUSTOMER_QUERY_WORKERS", "8")
+    GOOGLE_ANALYTICS_PAGE_SIZE = os.getenv("GOOGLE_ANALYTICS_PAGE_SIZE", "100000")
+    GOOGLE_ANALYTICS_BATCH_REPORTS = os.getenv("GOOGLE_ANALYTICS_BATCH_REPORTS", "false")
+    YOUTUBE_PAGE_SIZE = os.getenv("YOUTUBE_PAGE_SIZE", "200")
+    RATE_LIMIT_DEFAULT_RATE = os.getenv("RATE_LIMIT_DEFAULT_RATE", "5")
+    RATE_LIMIT_DEFAULT_BURST = os.getenv("RATE_LIMIT_DEFAULT_BURST", "10")
+    RATE_LIMIT_ACCOUNT_RATE = os.getenv("RATE_LIMIT_ACCOUNT_RATE", "2")
+    RATE_LIMIT_ACCOUNT_BURST = os.getenv("RATE_LIMIT_ACCOUNT_BURST", "5")
+    JOB_WORKERS = os.getenv("JOB_WORKERS", "4")
+    JOB_MAX_PER_USER = os.getenv("JOB_MAX_PER_USER", "1")
+    SYNC_LOOKBACK_DAYS = os.getenv("SYNC_LOOKBACK_DAYS", "7")
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true")
+    SCHEDULER_INTERVAL_HOURS = os.getenv("SCHEDULER_INTERVAL_HOURS", "24")
+    SCHEDULER_JITTER_MINUTES = os.getenv("SCHEDULER_JITTER_MINUTES", "60")
+    SCHEDULER_MAX_RUNNING = os.getenv("SCHEDULER_MAX_RUNNING", "4")
+    SCHEDULER_PLATFORM_LIMIT = os.getenv("SCHEDULER_PLATFORM_LIMIT", "2")
+    SCHEDULER_POLL_SECONDS = os.getenv("SCHEDULER_POLL_SECONDS", "30")
+    SCHEDULER_RELOAD_SECONDS = os.getenv("SCHEDULER_RELOAD_SECONDS", "300")
+    FIELDS_MAX_AGE = os.getenv("FIELDS_MAX_AGE", "3600")
+    RESULT_CACHE_MAX_BYTES = os.getenv("RESULT_CACHE_MAX_BYTES", "268435456")
+    RESULT_CACHE_TTL = os.getenv("RESULT_CACHE_TTL", "3600")
+    ADMIN_EMAILS = os.getenv("ADMIN_EMAILS", "")
@@ -1,7 +1,7 @@
 from api.config import Config
 
 from api.models.connector import AdAccount
-from api.core.static_data import ChannelType, facebook_metrics, facebook_dimensions
+from api.core.static_data import ChannelType
 from api.config import Config
 from api.models.user import User
 from api.core.auth import get_current_user
@@ -11,7 +11,7 @@ from api.database.crud import get_user_by_email, get_data_source_by_airbyte_sour
 from api.models.data import FieldOption
 
 from fastapi import APIRouter, Request, HTTPException
-import requests
+from api.utilities.http import http_client
 from starlette.responses import RedirectResponse
 from typing import List, Optional
 
@@ -59,7 +59,7 @@ def create_postgres_destination(token: str) -> UserDB:
         "authorization": f"Basic {AIRBYTE_BASIC_TOKEN}"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http_client.post(url, json=payload, headers=headers)
 
     if response.status_code == 200:
         destination_id = response.json()['destinationId']
@@ -114,7 +114,7 @@ def create_connection(token: str, stream_name, source_id: str, destination_id: O
         "authorization": f"Basic {AIRBYTE_BASIC_TOKEN}"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http_client.post(url, json=payload, headers=headers)
 
     if response.status_code == 200:
         connection_id = response.json()['connectionId']
@@ -1,20 +1,23 @@
 from api.config import Config
 
 from api.models.connector import AdAccount
-from api.core.static_data import ChannelType, facebook_metrics, facebook_dimensions
+from api.core.field_catalog import field_catalog
+from api.core.static_data import ChannelType
 from api.models.user import User
 from api.core.auth import get_current_user
+from api.core.facebook import FACEBOOK_GRAPH_URL, iter_facebook_pages
 from api.core.data import add_data_source_row_to_db
 from api.database.crud import get_user_by_email
 from api.database.database import session
 from api.database.models import UserDB, DataSourceDB
 from api.models.data import FieldOption
+from api.utilities.cache import TTLCache
 from api.utilities.responses import SuccessResponse
 
-from fastapi import APIRouter, Request, HTTPException
-import requests
-from starlette.responses import RedirectResponse
-from typing import List
+from fastapi import APIRouter, Request, HTTPException, Header
+from api.utilities.http import http_client
+from starlette.responses import RedirectResponse, Response
+from typing import List, Optional
 
 
 DOMAIN_URL = Config.DOMAIN_URL
@@ -22,6 +25,11 @@ FB_CLIENT_SECRET = Config.FB_CLIENT_SECRET
 CLIENT_URL = Config.CLIENT_URL
 AIRBYTE_WORKSPACE_ID = Config.AIRBYTE_WORKSPACE_ID
 AIRBYTE_BASIC_TOKEN = Config.AIRBYTE_BASIC_TOKEN
+AD_ACCOUNTS_PAGE_LIMIT = 100
+
+ad_accounts_cache = TTLCache(
+    "facebook_ad_accounts", ttl=float(Config.FACEBOOK_AD_ACCOUNTS_TTL), maxsize=1024
+)
 
 
 router = APIRouter(prefix="/facebook")
@@ -38,7 +46,7 @@ def login(request: Request):
     auth_url = f"https://graph.facebook.com/v17.0/oauth/access_token?client_id={app_id}&redirect_uri={redirect_uri}&code={code}&client_secret={FB_CLIENT_SECRET}"
 
     # Save the access token to the user's database.
-    response = requests.get(auth_url)
+    response = http_client.get(auth_url)
 
     json = response.json()
     try:
@@ -58,6 +66,7 @@ def login(request: Request):
         user.facebook_access_token = access_token
         session.add(user)
         session.commit()
+        ad_accounts_cache.invalidate(user.email)
     except Exception as e:
         print(e)
         session.rollback()
@@ -73,52 +82,66 @@ def login(request: Request):
     return RedirectResponse(url=redirect_client_url)
 
 
-@router.get("/ad_accounts", response_model=List[AdAccount])
-def ad_accounts(token: str):
-    current_user: User = get_current_user(token)
-    adaccounts = []
+def fetch_ad_accounts(access_token: str) -> List[AdAccount]:
+    """
+    Lists the ad accounts of a Facebook user, with their names expanded in the
+    same request and the remaining pages followed through the paging cursor.
 
-    url = f"https://graph.facebook.com/v17.0/me?fields=adaccounts&access_token={current_user.facebook_access_token}"
-    response = requests.get(url)
-    json = response.json()
-    accounts = json["adaccounts"]["data"]
-
-    for account in accounts:
-        id = account["id"]
-        account_id = account["account_id"]
-        url = f"https://graph.facebook.com/v17.0/{id}?fields=name&access_token={current_user.facebook_access_token}"
-        response = requests.get(url)
-        json = response.json()
-        name = json["name"]
-
-        adaccount: AdAccount = AdAccount(
-            id=id,
+    Args:
+        access_token (str): The Facebook access token of the user.
+
+    Returns:
+        List[AdAccount]: The ad accounts.
+    """
+    response = http_client.get(
+        f"{FACEBOOK_GRAPH_URL}/me",
+        params={
+            "fields": f"adaccounts.limit({AD_ACCOUNTS_PAGE_LIMIT}){{name,account_id}}",
+            "access_token": access_token,
+        },
+    )
+    if response.status_code != 200:
+        print(response.text)
+        raise HTTPException(
+            status_code=400, detail=f"Could not get Facebook ad accounts. {response.text}"
+        )
+    first_page = response.json().get("adaccounts", {})
+    accounts = list(first_page.get("data", []))
+    next_url = first_page.get("paging", {}).get("next")
+    if next_url:
+        for page in iter_facebook_pages(next_url, error="Could not get Facebook ad accounts"):
+            accounts.extend(page)
+
+    return [
+        AdAccount(
+            id=account["id"],
             channel=ChannelType.facebook,
-            account_id=account_id,
-            name=name,
+            account_id=account["account_id"],
+            name=account["name"],
             img="facebook-icon",
         )
-        adaccounts.append(adaccount)
+        for account in accounts
+    ]
 
-    return adaccounts
 
+@router.get("/ad_accounts", response_model=List[AdAccount])
+def ad_accounts(token: str):
+    current_user: User = get_current_user(token)
 
-@router.get("/fields", response_model=List[FieldOption])
-def fields(
-    default: bool = False, metrics: bool = False, dimensions: bool = False
-) -> List[FieldOption]:
-    fields_options = None
-    if metrics:
-        fields_options = facebook_metrics
-    elif dimensions:
-        fields_options = facebook_dimensions
-    else:
-        fields_options = facebook_metrics + facebook_dimensions
+    return ad_accounts_cache.get_or_load(
+        current_user.email,
+        lambda: fetch_ad_accounts(current_user.facebook_access_token),
+    )
 
-    if default:
-        fields_options = [f for f in fields_options if f["default"]]
 
-    return fields_options
+@router.get("/fields", response_model=List[FieldOption])
+def fields(
+    default: bool = False, metrics: bool = False, dimensions: bool = False,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    return field_catalog.field_options_response(
+        ChannelType.facebook, default, metrics, dimensions, if_none_match
+    )
 
 
 @router.get("/delete")
@@ -155,7 +178,7 @@ def create_airbyte_source(token: str, ad_account: AdAccount) -> DataSourceDB:
         "authorization": f"Basic {AIRBYTE_BASIC_TOKEN}"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http_client.post(url, json=payload, headers=headers)
 
     if response.status_code == 200:
         print(response.text)
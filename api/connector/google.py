@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Request, HTTPException
-from typing import List
-import requests
-from starlette.responses import RedirectResponse
+from fastapi import APIRouter, Request, HTTPException, Header
+from typing import List, Optional
+from api.utilities.http import http_client
+from starlette.responses import RedirectResponse, Response
 
 
 from api.config import Config
 from api.core.auth import get_current_user
 from api.core.data import add_data_source_row_to_db
-from api.core.static_data import ChannelType, ReportType, google_metrics, google_dimensions, google_video_metrics, google_video_dimensions
+from api.core.field_catalog import REPORT_TYPE_CHANNELS, field_catalog
+from api.core.static_data import ChannelType, ReportType
 from api.core.google import get_access_token
 from api.database.database import session
 from api.database.crud import get_user_by_email
@@ -16,6 +17,8 @@ from api.database.models import UserDB, DataSourceDB
 from api.models.user import User
 from api.models.connector import AdAccount
 from api.models.data import FieldOption
+from api.utilities.cache import TTLCache
+from api.utilities.concurrency import map_ordered
 
 
 CLIENT_URL = Config.CLIENT_URL
@@ -24,6 +27,11 @@ GOOGLE_CLIENT_ID = Config.GOOGLE_CLIENT_ID
 GOOGLE_CLIENT_SECRET = Config.GOOGLE_CLIENT_SECRET
 AIRBYTE_WORKSPACE_ID = Config.AIRBYTE_WORKSPACE_ID
 AIRBYTE_BASIC_TOKEN = Config.AIRBYTE_BASIC_TOKEN
+CUSTOMER_QUERY_WORKERS = int(Config.GOOGLE_CUSTOMER_QUERY_WORKERS)
+
+ad_accounts_cache = TTLCache(
+    "google_ad_accounts", ttl=float(Config.GOOGLE_AD_ACCOUNTS_TTL), maxsize=1024
+)
 
 router = APIRouter(prefix="/google")
 
@@ -84,6 +92,8 @@ def oauth2_callback(request: Request) -> RedirectResponse:
     try:
         session.add(user)
         session.commit()
+        if channel_type == ChannelType.google:
+            ad_accounts_cache.invalidate(user.email)
     except Exception as e:
         print(e)
 
@@ -104,87 +114,109 @@ def oauth2_callback(request: Request) -> RedirectResponse:
     return response
 
 
-@router.get("/ad_accounts", response_model=List[AdAccount])
-def ad_accounts(token: str):
-    current_user: User = get_current_user(token)
-    access_token = get_access_token(current_user.google_refresh_token)
+def fetch_customer_clients(manager_id: str, headers: dict) -> List[AdAccount]:
+    """
+    Lists the client accounts that a customer has access to.
+
+    Args:
+        manager_id (str): The id of the accessible customer.
+        headers (dict): The authorization headers shared by all customer queries.
+
+    Returns:
+        List[AdAccount]: The non-manager client accounts, empty if access to the customer is denied.
+    """
+    query = "SELECT customer_client.id, customer_client.descriptive_name, customer_client.client_customer, customer_client.manager FROM customer_client WHERE customer_client.manager = False "
+    url = f"https://googleads.googleapis.com/v14/customers/{manager_id}/googleAds:searchStream"
+    body = {"query": query}
+    response = http_client.post(url, headers=headers, data=body, idempotent=True)
+    stream = response.json()
+
+    ad_accounts = []
+    for batch in stream:
+        try:
+            results = batch["results"]
+        except KeyError as e:
+
+            error_status = batch['error']['status']
+
+            if error_status == "PERMISSION_DENIED":
+                print(f"Permission denied error. {response.text}")
+                continue
+            else:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Could not get ad accounts. {response.text}",
+                )
+        for result in results:
+            customer = result["customerClient"]
+
+            if "descriptiveName" not in customer:
+                name = "Google ads account"
+            else:
+                name = customer["descriptiveName"]
+
+            ad_accounts.append(
+                AdAccount(
+                    id=manager_id,
+                    channel=ChannelType.google,
+                    account_id=customer["id"],
+                    name=name,
+                    img="google-ads-icon",
+                )
+            )
+    return ad_accounts
+
+
+def fetch_ad_accounts(refresh_token: str) -> List[AdAccount]:
+    """
+    Lists the Google Ads accounts of a user. The client accounts of every
+    accessible customer are queried concurrently with a single access token.
+
+    Args:
+        refresh_token (str): The Google Ads refresh token of the user.
+
+    Returns:
+        List[AdAccount]: The ad accounts, grouped by accessible customer.
+    """
+    access_token = get_access_token(refresh_token)
     url = "https://googleads.googleapis.com/v14/customers:listAccessibleCustomers"
     headers = {
         "Authorization": f"Bearer {access_token}",
         "developer-token": GOOGLE_ADS_DEVELOPER_TOKEN,
     }
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
     resource_names = response.json()["resourceNames"]
 
-    ad_accounts = []
-    for resource_name in resource_names:
-        id = resource_name.replace("customers/", "")
-        query = "SELECT customer_client.id, customer_client.descriptive_name, customer_client.client_customer, customer_client.manager FROM customer_client WHERE customer_client.manager = False "
-        url = f"https://googleads.googleapis.com/v14/customers/{id}/googleAds:searchStream"
-        body = {"query": query}
-        response = requests.post(url, headers=headers, data=body)
-        stream = response.json()
-
-        for batch in stream:
-            try:
-                results = batch["results"]
-            except KeyError as e:
-
-                error_status = batch['error']['status']
-
-                if error_status == "PERMISSION_DENIED":
-                    print(f"Permission denied error. {response.text}")
-                    pass
-                else:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Could not get ad accounts. {response.text}",
-                    )
-            for result in results:
-                customer = result["customerClient"]
-
-                if "descriptiveName" not in customer:
-                    name = "Google ads account"
-                else:
-                    name = customer["descriptiveName"]
-
-                ad_accounts.append(
-                    AdAccount(
-                        id=id,
-                        channel=ChannelType.google,
-                        account_id=customer["id"],
-                        name=name,
-                        img="google-ads-icon",
-                    )
-                )
-    return ad_accounts
+    customer_accounts = map_ordered(
+        lambda resource_name: fetch_customer_clients(
+            resource_name.replace("customers/", ""), headers
+        ),
+        resource_names,
+        max_workers=CUSTOMER_QUERY_WORKERS,
+    )
+    return [ad_account for accounts in customer_accounts for ad_account in accounts]
+
+
+@router.get("/ad_accounts", response_model=List[AdAccount])
+def ad_accounts(token: str, refresh: bool = False):
+    current_user: User = get_current_user(token)
+    if refresh:
+        ad_accounts_cache.invalidate(current_user.email)
+
+    return ad_accounts_cache.get_or_load(
+        current_user.email,
+        lambda: fetch_ad_accounts(current_user.google_refresh_token),
+    )
 
 
 @router.get("/fields", response_model=List[FieldOption])
 def fields(
-    default: bool = False, metrics: bool = False, dimensions: bool = False, report_type: ReportType = ReportType.google_standard
-) -> List[FieldOption]:
-    fields_options = None
-
-    if report_type == ReportType.google_standard:
-        if metrics:
-            fields_options = google_metrics
-        elif dimensions:
-            fields_options = google_dimensions
-        else:
-            fields_options = google_metrics + google_dimensions
-    elif report_type == ReportType.google_video:
-        if metrics:
-            fields_options = google_video_metrics
-        elif dimensions:
-            fields_options = google_video_dimensions
-        else:
-            fields_options = google_video_metrics + google_video_dimensions
-
-    if default:
-        fields_options = [f for f in fields_options if f["default"]]
-
-    return fields_options
+    default: bool = False, metrics: bool = False, dimensions: bool = False, report_type: ReportType = ReportType.google_standard,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    return field_catalog.field_options_response(
+        REPORT_TYPE_CHANNELS.get(report_type), default, metrics, dimensions, if_none_match
+    )
 
 
 @router.post("/create_airbyte_source")
@@ -217,7 +249,7 @@ def create_airbyte_source(token: str, ad_account: AdAccount) -> DataSourceDB:
         "authorization": f"Basic {AIRBYTE_BASIC_TOKEN}"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http_client.post(url, json=payload, headers=headers)
 
     if response.status_code == 200:
         print(response.text)
@@ -1,18 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Header
+from starlette.responses import Response
+from typing import List, Optional
 import os
 from pathlib import Path
-import requests
+from api.utilities.http import http_client
 
 
 from api.config import Config
 from api.core.auth import get_current_user
 from api.core.google import get_access_token
-from api.core.static_data import (
-    ChannelType,
-    google_analytics_dimensions,
-    google_analytics_metrics,
-)
+from api.core.field_catalog import field_catalog
+from api.core.static_data import ChannelType
 from api.core.data import add_data_source_row_to_db
 from api.database.crud import get_user_by_email
 from api.database.database import session
@@ -31,6 +29,7 @@ GOOGLE_CLIENT_ID = Config.GOOGLE_CLIENT_ID
 GOOGLE_CLIENT_SECRET = Config.GOOGLE_CLIENT_SECRET
 AIRBYTE_WORKSPACE_ID = Config.AIRBYTE_WORKSPACE_ID
 AIRBYTE_BASIC_TOKEN = Config.AIRBYTE_BASIC_TOKEN
+ACCOUNT_SUMMARIES_PAGE_SIZE = 200
 
 
 # p = Path(r"api/utilities/google/airpipe-378522-ed48c2ad4a0d.json")
@@ -48,65 +47,51 @@ def ad_accounts(token: str):
     access_token = get_access_token(current_user.google_analytics_refresh_token)
 
     headers = {"Authorization": f"Bearer {access_token}"}
-    url = "https://analyticsadmin.googleapis.com/v1alpha/accounts"
-
-    response = requests.get(url, headers=headers)
+    url = "https://analyticsadmin.googleapis.com/v1alpha/accountSummaries"
+    params = {"pageSize": ACCOUNT_SUMMARIES_PAGE_SIZE}
 
+    # Account summaries list every account with its properties, so a single
+    # paginated traversal replaces a properties request per account.
     ad_accounts = []
-    if response.status_code == 200:
+    while True:
+        response = http_client.get(url, headers=headers, params=params)
+        if response.status_code != 200:
+            print(response.text)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Could not get ad accounts. {response.text}",
+            )
         results = response.json()
-        accounts = results["accounts"]
-        for account in accounts:
-            id = account["name"].replace("accounts/", "")
-            url = f"https://analyticsadmin.googleapis.com/v1alpha/properties?filter=ancestor:accounts/{id}"
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                properties = response.json()
-                for property_ in properties["properties"]:
-                    property_id = property_["name"].replace("properties/", "")
-                    name = property_["displayName"].replace("display_name:", "")
-                    ad_accounts.append(
-                        AdAccount(
-                            id=property_id,
-                            account_id=id,
-                            channel=ChannelType.google_analytics,
-                            name=name,
-                            img="google-analytics-icon",
-                        )
+        for account in results.get("accountSummaries", []):
+            id = account["account"].replace("accounts/", "")
+            for property_ in account.get("propertySummaries", []):
+                property_id = property_["property"].replace("properties/", "")
+                name = property_["displayName"].replace("display_name:", "")
+                ad_accounts.append(
+                    AdAccount(
+                        id=property_id,
+                        account_id=id,
+                        channel=ChannelType.google_analytics,
+                        name=name,
+                        img="google-analytics-icon",
                     )
-            else:
-                print(response.text)
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Could not get ad accounts. {response.text}",
                 )
 
-    else:
-        print(response.text)
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=f"Could not get ad accounts. {response.text}",
-        )
+        if not results.get("nextPageToken"):
+            break
+        params["pageToken"] = results["nextPageToken"]
 
     return ad_accounts
 
 
 @router.get("/fields", response_model=List[FieldOption])
 def fields(
-    default: bool = False, metrics: bool = False, dimensions: bool = False
-) -> List[FieldOption]:
-    fields_options = None
-    if metrics:
-        fields_options = google_analytics_metrics
-    elif dimensions:
-        fields_options = google_analytics_dimensions
-    else:
-        fields_options = google_analytics_metrics + google_analytics_dimensions
-
-    if default:
-        fields_options = [f for f in fields_options if f["default"]]
-
-    return fields_options
+    default: bool = False, metrics: bool = False, dimensions: bool = False,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    return field_catalog.field_options_response(
+        ChannelType.google_analytics, default, metrics, dimensions, if_none_match
+    )
 
 
 def handleGoogleTokenException(ex, current_user: User):
@@ -171,7 +156,7 @@ def create_airbyte_source(token: str, ad_account: AdAccount) -> DataSourceDB:
         "authorization": f"Basic {AIRBYTE_BASIC_TOKEN}"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http_client.post(url, json=payload, headers=headers)
 
     if response.status_code == 200:
         print(response.text)
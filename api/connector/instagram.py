@@ -1,17 +1,18 @@
 from api.config import Config
 
 from api.models.connector import AdAccount
-from api.core.static_data import ChannelType, ReportType, instagram_account_metrics, instagram_account_dimensions, instagram_media_dimensions, instagram_media_metrics
+from api.core.field_catalog import field_catalog
+from api.core.static_data import ChannelType, ReportType
 from api.models.user import User
 from api.core.auth import get_current_user
 from api.database.database import session
 from api.database.models import UserDB
 from api.models.data import FieldOption
 
-from fastapi import APIRouter, Request, HTTPException
-import requests
-from starlette.responses import RedirectResponse
-from typing import List
+from fastapi import APIRouter, Request, HTTPException, Header
+from api.utilities.http import http_client
+from starlette.responses import RedirectResponse, Response
+from typing import List, Optional
 
 
 DOMAIN_URL = Config.DOMAIN_URL
@@ -32,7 +33,7 @@ def login(request: Request):
     auth_url = f"https://graph.facebook.com/v17.0/oauth/access_token?client_id={app_id}&redirect_uri={redirect_uri}&code={code}&client_secret={FB_CLIENT_SECRET}"
 
     # Save the access token to the user's database.
-    response = requests.get(auth_url)
+    response = http_client.get(auth_url)
 
     json = response.json()
     try:
@@ -73,7 +74,7 @@ def ad_accounts(token: str):
     adaccounts = []
 
     url = f"https://graph.facebook.com/v17.0/me/accounts?access_token={current_user.facebook_access_token}"
-    response = requests.get(url)
+    response = http_client.get(url)
     if response.status_code == 200:
         json = response.json()
         accounts = json["data"]
@@ -87,7 +88,7 @@ def ad_accounts(token: str):
     instagram_account_ids = []
     for id in account_ids:
         url = f"https://graph.facebook.com/v18.0/{id}?fields=instagram_business_account&access_token={current_user.facebook_access_token}"
-        response = requests.get(url)
+        response = http_client.get(url)
         if response.status_code == 200:
             json = response.json()
             id = json["instagram_business_account"]["id"]
@@ -95,7 +96,7 @@ def ad_accounts(token: str):
 
     for id in instagram_account_ids:
         url = f"https://graph.facebook.com/v17.0/{id}?fields=username&access_token={current_user.facebook_access_token}"
-        response = requests.get(url)
+        response = http_client.get(url)
         if response.status_code == 200:
             json = response.json()
             username = json["username"]
@@ -113,29 +114,17 @@ def ad_accounts(token: str):
 
 @router.get("/fields", response_model=List[FieldOption])
 def fields(
-    default: bool = False, metrics: bool = False, dimensions: bool = False, report_type: ReportType = ReportType.instagram_media
-) -> List[FieldOption]:
-    fields_options = None
-
-    if report_type == ReportType.instagram_media:
-        if metrics:
-            fields_options = instagram_media_metrics
-        elif dimensions:
-            fields_options = instagram_media_dimensions
-        else:
-            fields_options = instagram_media_metrics + instagram_media_dimensions
-    else:
-        if metrics:
-            fields_options = instagram_account_metrics
-        elif dimensions:
-            fields_options = instagram_account_dimensions
-        else:
-            fields_options = instagram_account_metrics + instagram_account_dimensions
-
-    if default:
-        fields_options = [f for f in fields_options if f["default"]]
-
-    return fields_options
+    default: bool = False, metrics: bool = False, dimensions: bool = False, report_type: ReportType = ReportType.instagram_media,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    channel = (
+        ChannelType.instagram_media
+        if report_type == ReportType.instagram_media
+        else ChannelType.instagram_account
+    )
+    return field_catalog.field_options_response(
+        channel, default, metrics, dimensions, if_none_match
+    )
 
 
 @router.get("/delete")
@@ -1,18 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Header
+from starlette.responses import Response
+from typing import List, Optional
 import os
 from pathlib import Path
-import requests
+from api.utilities.http import http_client
 
 
 from api.config import Config
 from api.core.auth import get_current_user
 from api.core.google import get_access_token
-from api.core.static_data import (
-    ChannelType,
-    youtube_metrics,
-    youtube_dimensions,
-)
+from api.core.field_catalog import field_catalog
+from api.core.static_data import ChannelType
 from api.core.data import add_data_source_row_to_db
 from api.database.crud import get_user_by_email
 from api.database.database import session
@@ -55,7 +53,7 @@ def ad_accounts(token: str):
         'mine': 'true'
     }
 
-    response = requests.get(url, headers=headers, params=params)
+    response = http_client.get(url, headers=headers, params=params)
 
     print(response.json())
 
@@ -91,20 +89,12 @@ def ad_accounts(token: str):
 
 @router.get("/fields", response_model=List[FieldOption])
 def fields(
-    default: bool = False, metrics: bool = False, dimensions: bool = False
-) -> List[FieldOption]:
-    fields_options = None
-    if metrics:
-        fields_options = youtube_metrics
-    elif dimensions:
-        fields_options = youtube_dimensions
-    else:
-        fields_options = youtube_metrics + youtube_dimensions
-
-    if default:
-        fields_options = [f for f in fields_options if f["default"]]
-
-    return fields_options
+    default: bool = False, metrics: bool = False, dimensions: bool = False,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    return field_catalog.field_options_response(
+        ChannelType.youtube, default, metrics, dimensions, if_none_match
+    )
 
 
 def handleGoogleTokenException(ex, current_user: User):
@@ -163,7 +153,7 @@ def create_airbyte_source(token: str, ad_account: AdAccount) -> DataSourceDB:
         "authorization": f"Basic {AIRBYTE_BASIC_TOKEN}"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http_client.post(url, json=payload, headers=headers)
 
     if response.status_code == 200:
         print(response.text)
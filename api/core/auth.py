@@ -14,6 +14,8 @@ SECRET_KEY = Config.SECRET_KEY
 ALGORITHM = Config.ALGORITHM
 LOOKER_ACCESS_TOKEN = Config.LOOKER_ACCESS_TOKEN
 ACCESS_TOKEN_EXPIRE_MINUTES = int(Config.ACCESS_TOKEN_EXPIRE_MINUTES)
+# The comma separated emails of the users allowed to use the /admin endpoints.
+ADMIN_EMAILS = {email.strip().lower() for email in Config.ADMIN_EMAILS.split(",") if email.strip()}
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -102,6 +104,28 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
     return user
 
 
+def get_admin_user(token: str) -> UserInDB:
+    """
+    Retrieves the current user if they are an admin, one of ADMIN_EMAILS.
+
+    Parameters:
+    - token (str): The authentication token.
+
+    Returns:
+      UserInDB: The current user.
+
+    Raises:
+    - HTTPException: If the token is expired or invalid, or the user is not an admin.
+    """
+    user = get_current_user(token)
+    if user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint.",
+        )
+    return user
+
+
 def get_user(username: str):
     """
     Retrieves a user from the database based on the provided username.
@@ -1,13 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+import csv
 from datetime import datetime, timedelta
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+import io
+import itertools
+import json
 import pandas as pd
-from typing import List, Optional
+import queue
+import sqlalchemy
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import uuid
 
-from api.core.google import build_google_query, fetch_google_data, build_google_video_query
-from api.core.facebook import fetch_facebook_data
+from api.config import Config
+from api.core.google import build_google_query, iter_google_rows, build_google_video_query
+from api.core.facebook import iter_facebook_rows
 from api.core.instagram import fetch_instagram_data
-from api.core.youtube import fetch_youtube_data
+from api.core.loader import copy_frames_to_db, copy_rows_by_column, quote_identifier, LOAD_CHUNK_ROWS
+from api.core.youtube import iter_youtube_pages
 from api.database.database import engine, session
 from api.models.data import (
     FieldOption,
@@ -15,7 +27,8 @@ from api.models.data import (
     JoinCondition,
     DataSourceInDB,
     FieldOptionWithDataSourceId,
-    AdAccount
+    AdAccount,
+    AccountFetchResult
 )
 from api.database.models import DataSourceDB, UserDB
 from api.models.google import GoogleQuery
@@ -25,60 +38,53 @@ from api.models.instagram import InstagramQuery
 from api.core.static_data import (
     FieldType,
     ChannelType,
-    google_metrics,
-    google_dimensions,
-    google_video_metrics,
-    google_video_dimensions,
-    google_analytics_metrics,
-    google_analytics_dimensions,
-    facebook_metrics,
-    facebook_dimensions,
-    youtube_metrics,
-    youtube_dimensions,
-    instagram_account_metrics,
-    instagram_account_dimensions,
-    instagram_media_metrics,
-    instagram_media_dimensions,
+    DateWindow,
+    ResultFormat,
 )
-from api.core.google_analytics import fetch_google_analytics_data
+from api.core.google_analytics import REPORTS_PER_BATCH, iter_google_analytics_rows
 from api.models.google_analytics import GoogleAnalyticsQuery
-
-
-all_fields: List[FieldOption] = (
-    [FieldOption(**item) for item in google_metrics] +
-    [FieldOption(**item) for item in google_dimensions] +
-    [FieldOption(**item) for item in google_analytics_metrics] +
-    [FieldOption(**item) for item in google_analytics_dimensions] +
-    [FieldOption(**item) for item in facebook_metrics] +
-    [FieldOption(**item) for item in facebook_dimensions] +
-    [FieldOption(**item) for item in youtube_metrics] +
-    [FieldOption(**item) for item in youtube_dimensions] + 
-    [FieldOption(**item) for item in instagram_account_metrics] +
-    [FieldOption(**item) for item in instagram_account_dimensions] +
-    [FieldOption(**item) for item in instagram_media_metrics] +
-    [FieldOption(**item) for item in instagram_media_dimensions] +
-    [FieldOption(**item) for item in google_video_metrics] +
-    [FieldOption(**item) for item in google_video_dimensions]
+from api.utilities.concurrency import PlatformLimiter, iter_ordered
+from api.utilities.data import json_default, split_date_range
+
+STREAM_BATCH_SIZE = int(Config.STREAM_BATCH_SIZE)
+FETCH_MAX_WORKERS = int(Config.FETCH_MAX_WORKERS)
+
+# Maximum number of concurrent fetches per platform, shared by all requests.
+# Platforms without a limit of their own use FETCH_PLATFORM_CONCURRENCY.
+PLATFORM_CONCURRENCY = {
+    ChannelType.google: Config.FETCH_PLATFORM_CONCURRENCY_GOOGLE,
+    ChannelType.google_video: Config.FETCH_PLATFORM_CONCURRENCY_GOOGLE_VIDEO,
+    ChannelType.google_analytics: Config.FETCH_PLATFORM_CONCURRENCY_GOOGLE_ANALYTICS,
+    ChannelType.youtube: Config.FETCH_PLATFORM_CONCURRENCY_YOUTUBE,
+    ChannelType.facebook: Config.FETCH_PLATFORM_CONCURRENCY_FACEBOOK,
+    ChannelType.instagram_media: Config.FETCH_PLATFORM_CONCURRENCY_INSTAGRAM_MEDIA,
+    ChannelType.instagram_account: Config.FETCH_PLATFORM_CONCURRENCY_INSTAGRAM_ACCOUNT,
+}
+
+platform_limiter = PlatformLimiter(
+    {channel: int(limit) for channel, limit in PLATFORM_CONCURRENCY.items() if limit},
+    default=int(Config.FETCH_PLATFORM_CONCURRENCY),
 )
 
+DEFAULT_DATE_WINDOW = DateWindow(Config.FETCH_DATE_WINDOW) if Config.FETCH_DATE_WINDOW else None
+FETCH_WINDOW_WORKERS = int(Config.FETCH_WINDOW_WORKERS)
+FETCH_WINDOW_RETRIES = int(Config.FETCH_WINDOW_RETRIES)
+GOOGLE_ANALYTICS_BATCH_REPORTS = Config.GOOGLE_ANALYTICS_BATCH_REPORTS.lower() == "true"
 
-all_metrics: List[FieldOption] = (
-    [FieldOption(**item) for item in google_metrics] +
-    [FieldOption(**item) for item in google_analytics_metrics] +
-    [FieldOption(**item) for item in facebook_metrics] +
-    [FieldOption(**item) for item in youtube_metrics] + 
-    [FieldOption(**item) for item in instagram_account_metrics] +
-    [FieldOption(**item) for item in instagram_media_metrics]
-)
+# Channels whose reports take a date range and can be fetched in windows.
+WINDOWED_CHANNELS = {
+    ChannelType.google,
+    ChannelType.google_video,
+    ChannelType.google_analytics,
+    ChannelType.facebook,
+    ChannelType.youtube,
+}
 
-all_dimensions: List[FieldOption] = (
-    [FieldOption(**item) for item in google_dimensions] +
-    [FieldOption(**item) for item in google_analytics_dimensions] +
-    [FieldOption(**item) for item in facebook_dimensions] +
-    [FieldOption(**item) for item in youtube_dimensions] + 
-    [FieldOption(**item) for item in instagram_account_dimensions] +
-    [FieldOption(**item) for item in instagram_media_dimensions]
-)
+# Channels whose fetchers yield pages of column arrays instead of row dicts.
+COLUMNAR_CHANNELS = {ChannelType.youtube}
+
+# Failures that retrying a window cannot fix.
+NON_RETRYABLE_STATUS_CODES = {401, 403}
 
 
 def load_postgresql_table(table_name):
@@ -147,108 +153,453 @@ def create_field_list(
     return filtered_fields, metrics, dimensions
 
 
-def fetch_data(data_source: DataSource):
+def fetch_account_data(
+    data_source: DataSource,
+    ad_account: AdAccount,
+    date_ranges: Optional[List[Tuple[datetime, datetime]]] = None,
+):
     """
-    Fetches data from a given data source.
+    Fetches data for a single ad account of a data source.
 
     Args:
         data_source (DataSource): The data source to fetch data from.
+        ad_account (AdAccount): The ad account to fetch data for.
+        date_ranges (List[Tuple[datetime, datetime]], optional): The consecutive date ranges to fetch. Only Google Analytics requests several ranges at once, other channels fetch from the first to the last day. Defaults to the date range of the data source.
 
     Returns:
-        list: A list of fetched data.
+        Iterable[dict]: The fetched rows, or for COLUMNAR_CHANNELS pages of column arrays keyed by column name. Google Ads, Google Analytics, Facebook and YouTube results are streamed lazily as the responses arrive.
 
     Raises:
         HTTPException: If the channel type is not supported.
 
     """
-    print(data_source.adAccounts)
-    data_list = []
-    for adAccount in data_source.adAccounts:
-        account_id = adAccount.id 
-        fields, metrics, dimensions = create_field_list(
-            data_source.fields, channel=adAccount.channel
+    account_id = ad_account.id
+    fields, metrics, dimensions = create_field_list(
+        data_source.fields, channel=ad_account.channel
+    )
+    if date_ranges:
+        start_date, end_date = date_ranges[0][0], date_ranges[-1][1]
+    else:
+        start_date, end_date = data_source.start_date, data_source.end_date
+
+    # Builds query depending on the channel type
+    if ad_account.channel == ChannelType.google:
+        data_query = build_google_query(
+            fields=fields,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        query = GoogleQuery(
+            account_id=ad_account.account_id, #  Use account id instead of id
+            metrics=metrics,
+            dimensions=dimensions,
+            start_date=start_date,
+            end_date=end_date,
+            manager_id=ad_account.id
+        )
+        data = iter_google_rows(
+            current_user=data_source.user, query=query, data_query=data_query
+        )
+    elif ad_account.channel == ChannelType.google_video:
+        data_query = build_google_video_query(
+            fields=fields,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        query = GoogleQuery(
+            account_id=ad_account.account_id, #  Use account id instead of id
+            metrics=metrics,
+            dimensions=dimensions,
+            start_date=start_date,
+            end_date=end_date,
+            manager_id=ad_account.id
+        )
+        data = iter_google_rows(
+            current_user=data_source.user, query=query, data_query=data_query
+        )
+    elif ad_account.channel == ChannelType.google_analytics:
+        query = GoogleAnalyticsQuery(
+            property_id=account_id,
+            metrics=metrics,
+            dimensions=dimensions,
+            start_date=start_date,
+            end_date=end_date,
+            date_ranges=date_ranges,
+        )
+        data = iter_google_analytics_rows(
+            current_user=data_source.user, query=query
+        )
+    elif ad_account.channel == ChannelType.facebook:
+        query = FacebookQuery(
+            account_id=account_id, metrics=metrics, dimensions=dimensions
+        )
+        if date_ranges or data_source.incremental:
+            query.start_date = int(start_date.timestamp())
+            query.end_date = int(end_date.timestamp())
+        data = iter_facebook_rows(current_user=data_source.user, query=query)
+    elif ad_account.channel == ChannelType.instagram_media or ad_account.channel == ChannelType.instagram_account:
+        query = InstagramQuery(
+            account_id=account_id, metrics=metrics, dimensions=dimensions, channel=ad_account.channel
+        )
+        data = fetch_instagram_data(current_user=data_source.user, query=query)
+    elif ad_account.channel == ChannelType.youtube:
+        query = YoutubeQuery(
+            account_id=account_id,
+            metrics=metrics,
+            dimensions=dimensions,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        data = iter_youtube_pages(current_user=data_source.user, query=query)
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Channel type {ad_account.channel} not supported.",
         )
 
-        # Builds query depending on the channel type
-        if adAccount.channel == ChannelType.google:
-            data_query = build_google_query(
-                fields=fields,
-                start_date=data_source.start_date,
-                end_date=data_source.end_date,
-            )
-            query = GoogleQuery(
-                account_id=adAccount.account_id, #  Use account id instead of id
-                metrics=metrics,
-                dimensions=dimensions,
-                start_date=data_source.start_date,
-                end_date=data_source.end_date,
-                manager_id=adAccount.id
-            )
-            data = fetch_google_data(
-                current_user=data_source.user, query=query, data_query=data_query
-            )
-        elif adAccount.channel == ChannelType.google_video:
-            data_query = build_google_video_query(
-                fields=fields,
-                start_date=data_source.start_date,
-                end_date=data_source.end_date,
-            )
-            query = GoogleQuery(
-                account_id=adAccount.account_id, #  Use account id instead of id
-                metrics=metrics,
-                dimensions=dimensions,
-                start_date=data_source.start_date,
-                end_date=data_source.end_date,
-                manager_id=adAccount.id
-            )
-            data = fetch_google_data(
-                current_user=data_source.user, query=query, data_query=data_query
-            )
-        elif adAccount.channel == ChannelType.google_analytics:
-            query = GoogleAnalyticsQuery(
-                property_id=account_id,
-                metrics=metrics,
-                dimensions=dimensions,
-                start_date=data_source.start_date,
-                end_date=data_source.end_date,
-            )
-            data = fetch_google_analytics_data(
-                current_user=data_source.user, query=query
-            )
-        elif adAccount.channel == ChannelType.facebook:
-            query = FacebookQuery(
-                account_id=account_id, metrics=metrics, dimensions=dimensions
-            )
-            data = fetch_facebook_data(current_user=data_source.user, query=query)
-        elif adAccount.channel == ChannelType.instagram_media or adAccount.channel == ChannelType.instagram_account:
-            query = InstagramQuery(
-                account_id=account_id, metrics=metrics, dimensions=dimensions, channel=adAccount.channel
+    return data
+
+
+def fetch_window(
+    data_source: DataSource,
+    ad_account: AdAccount,
+    windows: List[Tuple[datetime, datetime]],
+) -> List[dict]:
+    """
+    Fetches date windows of an ad account in one request under the platform
+    limit, retrying them on their own if the request fails.
+
+    Args:
+        data_source (DataSource): The data source to fetch data from.
+        ad_account (AdAccount): The ad account to fetch data for.
+        windows (List[Tuple[datetime, datetime]]): The windows to fetch, a single one except for batched Google Analytics reports.
+
+    Returns:
+        List[dict]: The rows of the windows.
+
+    Raises:
+        HTTPException: If the request still fails after FETCH_WINDOW_RETRIES retries.
+    """
+    for attempt in range(FETCH_WINDOW_RETRIES + 1):
+        try:
+            with platform_limiter.limit(ad_account.channel):
+                return list(fetch_account_data(data_source, ad_account, windows))
+        except HTTPException as e:
+            if e.status_code in NON_RETRYABLE_STATUS_CODES or attempt == FETCH_WINDOW_RETRIES:
+                raise
+            print(
+                f"Retrying {windows[0][0]:%Y-%m-%d} to {windows[-1][1]:%Y-%m-%d} for ad account {ad_account.id}. {e.detail}"
             )
-            data = fetch_instagram_data(current_user=data_source.user, query=query)
-        elif adAccount.channel == ChannelType.youtube:
-            query = YoutubeQuery(
-                account_id=account_id,
-                metrics=metrics,
-                dimensions=dimensions,
-                start_date=data_source.start_date,
-                end_date=data_source.end_date,
+        time.sleep(2 ** attempt)
+
+
+def iter_account_rows(data_source: DataSource, ad_account: AdAccount) -> Iterator[dict]:
+    """
+    Yields the rows of an ad account, holding a platform slot only while the
+    next row or page is fetched, not while the caller handles it.
+
+    When the data source has a date window, the date range is split into
+    windows that are fetched concurrently, up to FETCH_WINDOW_WORKERS at a time
+    and within the platform limit, and merged back in date order. A failed
+    window is retried on its own rather than refetching the whole range.
+    With GOOGLE_ANALYTICS_BATCH_REPORTS, Google Analytics windows are grouped
+    into batchRunReports requests instead.
+
+    Args:
+        data_source (DataSource): The data source to fetch data from.
+        ad_account (AdAccount): The ad account to fetch data for.
+
+    Yields:
+        dict: The next row, or for COLUMNAR_CHANNELS the next page of column arrays.
+    """
+    window = data_source.window or DEFAULT_DATE_WINDOW
+    if window is None or ad_account.channel not in WINDOWED_CHANNELS:
+        yield from platform_limiter.iter_limited(
+            ad_account.channel, lambda: fetch_account_data(data_source, ad_account)
+        )
+        return
+
+    windows = split_date_range(data_source.start_date, data_source.end_date, window)
+    group_size = 1
+    if ad_account.channel == ChannelType.google_analytics and GOOGLE_ANALYTICS_BATCH_REPORTS:
+        group_size = REPORTS_PER_BATCH
+    groups = [windows[i : i + group_size] for i in range(0, len(windows), group_size)]
+    for rows in iter_ordered(
+        lambda group: fetch_window(data_source, ad_account, group),
+        groups,
+        max_workers=FETCH_WINDOW_WORKERS,
+    ):
+        yield from rows
+
+
+def queried_account_id(ad_account: AdAccount) -> str:
+    """
+    Returns the id of the account that is actually queried for an ad account.
+    Google Ads accounts are queried by customer id, the `id` being the manager.
+
+    Args:
+        ad_account (AdAccount): The ad account.
+
+    Returns:
+        str: The queried account id.
+    """
+    if ad_account.channel in (ChannelType.google, ChannelType.google_video):
+        return ad_account.account_id
+    return ad_account.id
+
+
+def iter_column_chunks(
+    pages: Iterable[Dict[str, list]], chunk_rows: int
+) -> Iterator[Dict[str, list]]:
+    """
+    Concatenates pages of column arrays into chunks of at least `chunk_rows`
+    rows, so that small API pages do not each become a frame of their own.
+
+    Args:
+        pages (Iterable[Dict[str, list]]): The pages, keyed by column name.
+        chunk_rows (int): The number of rows after which a chunk is yielded.
+
+    Yields:
+        Dict[str, list]: The next chunk, keyed by column name.
+    """
+    chunk: Dict[str, list] = {}
+    rows = 0
+    for page in pages:
+        for name, values in page.items():
+            chunk.setdefault(name, []).extend(values)
+        rows += len(next(iter(page.values()), []))
+        if rows >= chunk_rows:
+            yield chunk
+            chunk, rows = {}, 0
+    if rows:
+        yield chunk
+
+
+def iter_row_chunks(rows: Iterable[dict], chunk_rows: int) -> Iterator[List[dict]]:
+    """
+    Splits a stream of rows into lists of at most `chunk_rows` rows.
+
+    Args:
+        rows (Iterable[dict]): The rows.
+        chunk_rows (int): The maximum number of rows per chunk.
+
+    Yields:
+        List[dict]: The next chunk.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def frame_from_rows(
+    rows: Union[Iterable[dict], Dict[str, list]],
+    field_lookup: Dict[str, str],
+    ad_account: AdAccount,
+) -> pd.DataFrame:
+    """
+    Reads fetched rows straight into a columnar frame, renames the columns to
+    their alt values and records the ad account each row came from.
+
+    Args:
+        rows (Union[Iterable[dict], Dict[str, list]]): The fetched rows, or their column arrays keyed by column name.
+        field_lookup (Dict[str, str]): Maps field values to alt values.
+        ad_account (AdAccount): The ad account the rows were fetched for.
+
+    Returns:
+        pd.DataFrame: The rows as a frame.
+    """
+    if isinstance(rows, dict):
+        frame = pd.DataFrame(rows)
+    else:
+        frame = pd.DataFrame.from_records(rows)
+    frame = frame.rename(columns=field_lookup)
+    frame["ad_account_id"] = queried_account_id(ad_account)
+    return frame
+
+
+def iter_data_source_frames(
+    data_source: DataSource,
+    failures: List[AccountFetchResult],
+    chunk_rows: int = LOAD_CHUNK_ROWS,
+    on_account_done: Optional[Callable[[AdAccount], None]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Fetches every ad account of a data source concurrently and yields the rows
+    as typed frames of at most `chunk_rows` rows, ready to be passed to
+    `copy_frames_to_db`.
+
+    Rows stream from the fetchers into frames as they arrive. Frames are handed
+    over through a bounded queue, so at most a few chunks per worker are held in
+    memory regardless of how much data the accounts return. An account that
+    fails part way through may already have yielded some rows, pass the
+    failures to `delete_failed_account_rows` before the table is swapped in.
+
+    Args:
+        data_source (DataSource): The data source to fetch data from.
+        failures (List[AccountFetchResult]): Collects a result for every ad account that failed, in account order.
+        chunk_rows (int, optional): The maximum number of rows per frame.
+        on_account_done (Callable, optional): Called with every ad account once it has finished, whether it failed or not.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows, from any account.
+
+    Raises:
+        HTTPException: If every ad account failed, after all of them have finished.
+    """
+    field_lookup = {
+        field.value: field.alt_value for field in data_source.fields if field.alt_value
+    }
+    ad_accounts = data_source.adAccounts
+    frames: queue.Queue = queue.Queue(maxsize=FETCH_MAX_WORKERS)
+    cancelled = threading.Event()
+    done = object()
+    failed = []
+
+    def put(item):
+        while not cancelled.is_set():
+            try:
+                frames.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def produce(ad_account: AdAccount):
+        try:
+            records = iter_account_rows(data_source, ad_account)
+            if ad_account.channel in COLUMNAR_CHANNELS:
+                chunks = iter_column_chunks(records, chunk_rows)
+            else:
+                chunks = iter_row_chunks(records, chunk_rows)
+            try:
+                for chunk in chunks:
+                    if cancelled.is_set():
+                        break
+                    frame = frame_from_rows(chunk, field_lookup, ad_account)
+                    put(frame.apply(pd.to_numeric, errors="ignore"))
+            finally:
+                records.close()
+        except HTTPException as e:
+            print(f"Could not fetch data for ad account {ad_account.id}. {e.detail}")
+            failed.append(
+                AccountFetchResult(
+                    ad_account=ad_account, error=str(e.detail), status_code=e.status_code
+                )
             )
-            data = fetch_youtube_data(current_user=data_source.user, query=query)
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Channel type { data_source.adAccount.channel} not supported.",
+        except Exception as e:
+            print(f"Could not fetch data for ad account {ad_account.id}. {e}")
+            failed.append(
+                AccountFetchResult(ad_account=ad_account, error=str(e), status_code=500)
             )
+        finally:
+            if on_account_done is not None:
+                on_account_done(ad_account)
+            put(done)
+
+    executor = ThreadPoolExecutor(max_workers=min(FETCH_MAX_WORKERS, len(ad_accounts)) or 1)
+    try:
+        for ad_account in ad_accounts:
+            executor.submit(produce, ad_account)
+
+        remaining = len(ad_accounts)
+        while remaining:
+            item = frames.get()
+            if item is done:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False)
+
+    # Reports failures in account order.
+    failed.sort(key=lambda result: ad_accounts.index(result.ad_account))
+    failures.extend(failed)
+
+    if ad_accounts and len(failed) == len(ad_accounts):
+        raise HTTPException(
+            status_code=failed[0].status_code,
+            detail=f"Could not fetch data for any ad account. {[result.error for result in failed]}",
+        )
+
+
+def delete_failed_account_rows(failures: List[AccountFetchResult]):
+    """
+    Returns a `before_swap` hook for `copy_frames_to_db` that removes any rows
+    loaded for ad accounts whose fetch failed part way through.
+
+    Args:
+        failures (List[AccountFetchResult]): The failed accounts.
+
+    Returns:
+        Callable: The hook.
+    """
+
+    def before_swap(connection, schema: str, table_name: str):
+        if not failures:
+            return
+        has_account_column = connection.execute(
+            sqlalchemy.text(
+                "SELECT 1 FROM information_schema.columns WHERE table_schema = :schema "
+                "AND table_name = :table_name AND column_name = 'ad_account_id'"
+            ),
+            schema=schema,
+            table_name=table_name,
+        ).first()
+        if has_account_column is None:
+            return
+        account_ids = [queried_account_id(result.ad_account) for result in failures]
+        connection.execute(
+            sqlalchemy.text(
+                f"DELETE FROM {quote_identifier(schema)}.{quote_identifier(table_name)} "
+                "WHERE CAST(ad_account_id AS TEXT) IN :account_ids"
+            ).bindparams(sqlalchemy.bindparam("account_ids", expanding=True)),
+            account_ids=account_ids,
+        )
 
-        data_list.append(data)
+    return before_swap
+
+
+def keep_failed_account_rows(failures: List[AccountFetchResult], table_name: str):
+    """
+    Returns a `before_swap` hook for `copy_frames_to_db` that replaces any rows
+    loaded for ad accounts whose fetch failed with their rows in the table
+    being replaced, so a failed account keeps its history.
+
+    Args:
+        failures (List[AccountFetchResult]): The failed accounts.
+        table_name (str): The name of the table being replaced.
+
+    Returns:
+        Callable: The hook.
+    """
+    delete_rows = delete_failed_account_rows(failures)
+
+    def before_swap(connection, schema: str, staging: str):
+        if not failures:
+            return
+        delete_rows(connection, schema, staging)
+        copy_rows_by_column(
+            connection,
+            schema,
+            table_name,
+            staging,
+            "ad_account_id",
+            [queried_account_id(result.ad_account) for result in failures],
+        )
 
-    return data_list
+    return before_swap
 
 
 def add_table_to_db(schema: str, table_name: str, df: pd.DataFrame):
     """
     Adds a table to the database.
 
+    The rows are bulk loaded with COPY into a staging table which then replaces
+    the existing table atomically, see `copy_frames_to_db`.
+
     Parameters:
         schema (str): The name of the schema to add the table to.
         table_name (str): The name of the table to add.
@@ -257,24 +608,74 @@ def add_table_to_db(schema: str, table_name: str, df: pd.DataFrame):
     Returns:
         dict: A dictionary with a single key "message" and value "success" indicating that the table was successfully added to the database.
     """
-    connection = engine.connect()
-    if not engine.dialect.has_schema(connection, schema):
-        # Create the schema
-        engine.execute(f'CREATE SCHEMA "{schema}"')
-
-    df.to_sql(
-        table_name,
-        engine,
-        schema=schema,
-        if_exists="replace",
-        index=False,
-        chunksize=100,
-    )
-    connection.close()
+    copy_frames_to_db(schema, table_name, [df])
 
     return {"message": "success"}
 
 
+def stream_query_results(
+    query: str,
+    result_format: ResultFormat,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> StreamingResponse:
+    """
+    Streams the results of a query through a server-side cursor.
+
+    Rows are read from Postgres in batches of `batch_size` and written to the
+    response as they arrive, so memory is bounded by the batch size rather than
+    the size of the table.
+
+    Args:
+        query (str): The SQL query to run.
+        result_format (ResultFormat): The format of the streamed body, either ndjson or csv.
+        batch_size (int, optional): The number of rows fetched from the cursor at a time.
+
+    Returns:
+        StreamingResponse: The response streaming the query results.
+
+    Raises:
+        HTTPException: If the query is invalid.
+    """
+    connection = engine.connect().execution_options(
+        stream_results=True, max_row_buffer=batch_size
+    )
+    try:
+        results = connection.execute(query)
+    except sqlalchemy.exc.ProgrammingError as e:
+        connection.close()
+        raise HTTPException(status_code=400, detail=str(e))
+    columns = list(results.keys())
+
+    def generate_ndjson():
+        try:
+            for partition in results.partitions(batch_size):
+                yield "".join(
+                    json.dumps(dict(zip(columns, row)), default=json_default) + "\n"
+                    for row in partition
+                )
+        finally:
+            connection.close()
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        try:
+            writer.writerow(columns)
+            for partition in results.partitions(batch_size):
+                writer.writerows(partition)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            yield buffer.getvalue()
+        finally:
+            connection.close()
+
+    if result_format == ResultFormat.csv:
+        return StreamingResponse(generate_csv(), media_type="text/csv")
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+
 def build_blend_query(
     fields: List[FieldOptionWithDataSourceId],
     join_conditions: List[JoinCondition],
@@ -1,23 +1,40 @@
 from datetime import datetime, timedelta
-from typing import List
-import requests
+import json
+import time
+from typing import Iterator, List
+from api.config import Config
+from api.utilities.http import http_client
 from fastapi import HTTPException
 
+from api.core.static_data import ChannelType
 from api.models.facebook import FacebookQuery
 from api.models.user import User
 
+GRAPH_URL = "https://graph.facebook.com"
+FACEBOOK_GRAPH_URL = f"{GRAPH_URL}/v17.0"
+GRAPH_BATCH_SIZE = 50
+FACEBOOK_PAGE_LIMIT = 500
+
+# Date ranges longer than this many days are run as asynchronous report jobs.
+FACEBOOK_ASYNC_REPORT_DAYS = int(Config.FACEBOOK_ASYNC_REPORT_DAYS)
+FACEBOOK_REPORT_TIMEOUT = float(Config.FACEBOOK_REPORT_TIMEOUT)
+REPORT_POLL_INITIAL_DELAY = 1.0
+REPORT_POLL_MAX_DELAY = 30.0
+
+REPORT_COMPLETED = "Job Completed"
+REPORT_FAILED = ("Job Failed", "Job Skipped")
 
-def fetch_facebook_data(current_user: User, query: FacebookQuery) -> List[object]:
-    fields = query.dimensions + query.metrics
-    if "date" in fields:
-        fields.remove("date")
-    if "video_view" in fields or "post" in fields:
-        fields.remove("video_view")
-        fields.remove("post")
-        fields.append("actions")
 
-    fields = ",".join(fields)
+def query_date_range(query: FacebookQuery):
+    """
+    Returns the first and last day of a query, defaulting to the last year.
 
+    Args:
+        query (FacebookQuery): The query.
+
+    Returns:
+        Tuple[str, str]: The since and until dates, formatted as YYYY-MM-DD.
+    """
     if query.start_date is None or query.end_date is None:
         # today's date
         end_date = datetime.today().strftime("%Y-%m-%d")
@@ -31,53 +48,255 @@ def fetch_facebook_data(current_user: User, query: FacebookQuery) -> List[object
         start_date = start_datetime.strftime("%Y-%m-%d")
         end_date = end_datetime.strftime("%Y-%m-%d")
 
-    url = f"https://graph.facebook.com/v17.0/{query.account_id}/insights?level=ad&fields={fields}&time_range={{'since':'{start_date}','until':'{end_date}'}}&time_increment=1&access_token={current_user.facebook_access_token}"
-    print(url)
+    return start_date, end_date
+
+
+def insights_params(query: FacebookQuery, start_date: str, end_date: str) -> dict:
+    """
+    Builds the parameters of an ad level daily insights request.
+
+    Args:
+        query (FacebookQuery): The query.
+        start_date (str): The first day, formatted as YYYY-MM-DD.
+        end_date (str): The last day, formatted as YYYY-MM-DD.
+
+    Returns:
+        dict: The request parameters, without the access token.
+    """
+    fields = query.dimensions + query.metrics
+    if "date" in fields:
+        fields.remove("date")
+    if "video_view" in fields or "post" in fields:
+        fields = [field for field in fields if field not in ("video_view", "post")]
+        fields.append("actions")
+
+    return {
+        "level": "ad",
+        "fields": ",".join(fields),
+        "time_range": json.dumps({"since": start_date, "until": end_date}),
+        "time_increment": 1,
+        "limit": FACEBOOK_PAGE_LIMIT,
+    }
+
+
+def parse_facebook_row(datum: dict, query: FacebookQuery) -> dict:
+    """
+    Flattens an insights row into the metrics and dimensions of the query.
+
+    Args:
+        datum (dict): The insights row.
+        query (FacebookQuery): The query the row was fetched for.
+
+    Returns:
+        dict: The row keyed by metric and dimension.
+    """
+    # check if metric doe snot exist in the datum keys and set it to 0.
+    for metric in query.metrics:
+        if metric not in datum.keys():
+            datum[metric] = 0
+
+    if datum["date_start"] == datum["date_stop"]:
+        datum["date"] = datum["date_start"]
+        del datum["date_start"]
+        del datum["date_stop"]
+
+        if "date" not in query.dimensions:
+            del datum["date"]
+
+    for key, value in list(datum.items()):
+        # Check if the value is a list
+        if isinstance(value, list):
+            # Extract the video_view from the list
+            video_view = next((item['value'] for item in value if item['action_type'] == 'video_view'), None)
+            # Extract post shares from the list
+            post_shares = next((item['value'] for item in value if item['action_type'] == 'post'), None)
+            if video_view is not None:
+                if key != "actions":
+                    datum[key] = video_view
+                else:
+                    datum["video_view"] = video_view
+            if post_shares is not None:
+                if key != "actions":
+                    datum[key] = post_shares
+                else:
+                    datum["post"] = post_shares
+
+    # Remove the action key from each datum
+    datum.pop("actions", None)
+
+    return datum
 
-    response = requests.get(url)
+
+def iter_facebook_pages(
+    url: str,
+    params: dict = None,
+    error: str = "Facebook query failed",
+    platform: str = ChannelType.facebook,
+    account: str = None,
+) -> Iterator[List[dict]]:
+    """
+    Follows the `paging.next` cursor of a Graph API edge and yields the rows of
+    every page.
+
+    Args:
+        url (str): The URL of the first page.
+        params (dict, optional): The query parameters of the first page. Later pages carry them in the `next` URL.
+        error (str, optional): The detail of the exception raised if a page fails.
+        platform (str, optional): The platform the requests count against.
+        account (str, optional): The account the requests count against.
+
+    Yields:
+        List[dict]: The rows of the next page.
+
+    Raises:
+        HTTPException: If a page could not be fetched.
+    """
+    while url:
+        response = http_client.get(
+            url, params=params, platform=platform, account=account
+        )
+        if response.status_code != 200:
+            print(response.text)
+            raise HTTPException(status_code=400, detail=error)
+        page = response.json()
+        yield page.get("data", [])
+        url = page.get("paging", {}).get("next")
+        params = None
+
+
+def graph_batch(
+    relative_urls: List[str],
+    access_token: str,
+    platform: str = ChannelType.facebook,
+    account: str = None,
+) -> List[dict]:
+    """
+    Runs up to GRAPH_BATCH_SIZE GET requests in a single Graph API batch call.
+
+    Args:
+        relative_urls (List[str]): The versioned URLs to fetch, relative to the Graph API host.
+        access_token (str): The access token used for every request.
+        platform (str, optional): The platform the batch counts against.
+        account (str, optional): The account the batch counts against.
+
+    Returns:
+        List[dict]: The parsed body of each request, in the same order as `relative_urls`.
+
+    Raises:
+        HTTPException: If the batch or any request in it failed.
+    """
+    batch = [{"method": "GET", "relative_url": url} for url in relative_urls]
+    response = http_client.post(
+        GRAPH_URL,
+        data={"batch": json.dumps(batch), "access_token": access_token},
+        idempotent=True,
+        platform=platform,
+        account=account,
+    )
+    if response.status_code != 200:
+        print(response.text)
+        raise HTTPException(status_code=response.status_code, detail=f"Graph batch request failed: {response.text}")
+
+    bodies = []
+    for result in response.json():
+        # Requests that were not processed in time are returned as null.
+        if result is None or result.get("code") != 200:
+            detail = result.get("body") if result else "request timed out"
+            print(detail)
+            raise HTTPException(
+                status_code=result.get("code", 504) if result else 504,
+                detail=f"Graph batch request failed: {detail}",
+            )
+        bodies.append(json.loads(result["body"]))
+    return bodies
+
+
+def run_report(account_id: str, params: dict, access_token: str) -> str:
+    """
+    Submits an asynchronous insights report and waits for it to complete,
+    polling with a backoff capped at REPORT_POLL_MAX_DELAY seconds.
+
+    Args:
+        account_id (str): The ad account to report on.
+        params (dict): The insights parameters.
+        access_token (str): The Facebook access token.
+
+    Returns:
+        str: The id of the completed report run.
+
+    Raises:
+        HTTPException: If the report could not be submitted, failed, or did not complete within FACEBOOK_REPORT_TIMEOUT seconds.
+    """
+    response = http_client.post(
+        f"{FACEBOOK_GRAPH_URL}/{account_id}/insights",
+        data={**params, "access_token": access_token},
+        platform=ChannelType.facebook,
+        account=account_id,
+    )
     if response.status_code != 200:
         print(response.text)
-        raise HTTPException(status_code=400, detail="Facebook query failed")
-    json = response.json()
-    data = json["data"]
-    print(data)
-
-    for datum in data:
-        # check if metric doe snot exist in the datum keys and set it to 0.
-        for metric in query.metrics:
-            if metric not in datum.keys():
-                datum[metric] = 0
-
-        if datum["date_start"] == datum["date_stop"]:
-            datum["date"] = datum["date_start"]
-            del datum["date_start"]
-            del datum["date_stop"]
-
-            if "date" not in query.dimensions:
-                del datum["date"]
-
-        for key, value in datum.items():
-            # Check if the value is a list
-            if isinstance(value, list):
-                # Extract the video_view from the list
-                video_view = next((item['value'] for item in value if item['action_type'] == 'video_view'), None)
-                # Extract post shares from the list
-                post_shares = next((item['value'] for item in value if item['action_type'] == 'post'), None)
-                if video_view is not None:
-                    if key != "actions":
-                        datum[key] = video_view
-                    else:
-                        datum["video_view"] = video_view
-                if post_shares is not None:
-                    if key != "actions":
-                        datum[key] = post_shares
-                    else:
-                        datum["post"] = post_shares
-        
-        # Remove the action key from each datum
-        for datum in data:
-            # Remove the action key from each datum
-            if "actions" in datum:
-                del datum["actions"]
-    
-    return data
+        raise HTTPException(status_code=400, detail="Facebook report could not be started")
+    report_run_id = response.json()["report_run_id"]
+
+    deadline = time.monotonic() + FACEBOOK_REPORT_TIMEOUT
+    delay = REPORT_POLL_INITIAL_DELAY
+    while True:
+        response = http_client.get(
+            f"{FACEBOOK_GRAPH_URL}/{report_run_id}",
+            params={"access_token": access_token},
+            platform=ChannelType.facebook,
+            account=account_id,
+        )
+        if response.status_code != 200:
+            print(response.text)
+            raise HTTPException(status_code=400, detail="Facebook report status could not be read")
+        report = response.json()
+        status = report.get("async_status")
+        if status == REPORT_COMPLETED and report.get("async_percent_completion") == 100:
+            return report_run_id
+        if status in REPORT_FAILED:
+            raise HTTPException(status_code=400, detail=f"Facebook report {status.lower()}")
+        if time.monotonic() + delay > deadline:
+            raise HTTPException(status_code=504, detail="Facebook report timed out")
+        time.sleep(delay)
+        delay = min(delay * 2, REPORT_POLL_MAX_DELAY)
+
+
+def iter_facebook_rows(current_user: User, query: FacebookQuery) -> Iterator[dict]:
+    """
+    Fetches the ad level daily insights of an account and yields the rows page
+    by page, so large accounts are never held in memory at once.
+
+    Date ranges longer than FACEBOOK_ASYNC_REPORT_DAYS are run as asynchronous
+    report jobs instead of on the synchronous endpoint, which times out for
+    large accounts.
+
+    Args:
+        current_user (User): The user whose access token is used.
+        query (FacebookQuery): The account, metrics, dimensions and date range to fetch.
+
+    Yields:
+        dict: The next row.
+    """
+    access_token = current_user.facebook_access_token
+    start_date, end_date = query_date_range(query)
+    params = insights_params(query, start_date, end_date)
+
+    days = (datetime.strptime(end_date, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")).days
+    if days > FACEBOOK_ASYNC_REPORT_DAYS:
+        report_run_id = run_report(query.account_id, params, access_token)
+        pages = iter_facebook_pages(
+            f"{FACEBOOK_GRAPH_URL}/{report_run_id}/insights",
+            {"limit": FACEBOOK_PAGE_LIMIT, "access_token": access_token},
+            account=query.account_id,
+        )
+    else:
+        pages = iter_facebook_pages(
+            f"{FACEBOOK_GRAPH_URL}/{query.account_id}/insights",
+            {**params, "access_token": access_token},
+            account=query.account_id,
+        )
+
+    for page in pages:
+        for datum in page:
+            yield parse_facebook_row(datum, query)
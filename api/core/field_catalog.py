@@ -0,0 +1,309 @@
+from collections import defaultdict
+from functools import lru_cache
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.responses import Response
+
+from api.config import Config
+from api.core.static_data import ChannelType, FieldType, ReportType
+from api.models.data import FieldOption
+from api.utilities.responses import json_body
+
+# The field data files, one per channel.
+FIELDS_DIR = os.path.join(os.path.dirname(__file__), "fields")
+
+# The channels of the catalog, in the order their fields are listed and matched.
+CATALOG_CHANNELS = (
+    ChannelType.google,
+    ChannelType.google_analytics,
+    ChannelType.facebook,
+    ChannelType.youtube,
+    ChannelType.instagram_account,
+    ChannelType.instagram_media,
+    ChannelType.google_video,
+)
+
+# The channel whose fields each report type of the /fields endpoints lists.
+REPORT_TYPE_CHANNELS = {
+    ReportType.google_standard: ChannelType.google,
+    ReportType.google_video: ChannelType.google_video,
+    ReportType.instagram_media: ChannelType.instagram_media,
+    ReportType.instagram_account: ChannelType.instagram_account,
+}
+
+# The values of the date dimension of every channel.
+DATE_FIELD_VALUES = {"date", "segments.date", "day"}
+
+# The keys a field can be looked up by across channels.
+LOOKUP_KEYS = ("value", "alt_value", "airbyte_value")
+
+# Seconds browsers and CDNs may reuse a /fields response before revalidating it.
+FIELDS_MAX_AGE = int(Config.FIELDS_MAX_AGE)
+
+
+@lru_cache(maxsize=None)
+def load_field_records(channel: ChannelType) -> Dict[str, List[dict]]:
+    """
+    Reads the field data file of a channel.
+
+    A file holds the field groups of its channel, "metrics" and "dimensions"
+    and for Google Ads also the "airbyte_fields" of its Airbyte streams, as
+    rows of the values of its "columns". Trailing empty values are left out
+    of the rows.
+
+    Args:
+        channel (ChannelType): The channel.
+
+    Returns:
+        Dict[str, List[dict]]: The fields of each group, as FieldOption keyword arguments.
+    """
+    channel = ChannelType(channel)
+    with open(os.path.join(FIELDS_DIR, f"{channel.value}.json")) as f:
+        data = json.load(f)
+    columns = data.pop("columns")
+    return {
+        group: [dict(zip(columns, row), channel=channel) for row in rows]
+        for group, rows in data.items()
+    }
+
+
+class ChannelFields:
+    """
+    The field options of one channel, metrics before dimensions, and its
+    subsets by type and default.
+    """
+
+    def __init__(self, records: Dict[str, List[dict]]):
+        self.fields: List[FieldOption] = [
+            FieldOption(**record) for record in records["metrics"] + records["dimensions"]
+        ]
+        # Keyed by (type, default), with None as the type for all fields.
+        self.subsets: Dict[Tuple[Optional[FieldType], bool], List[FieldOption]] = defaultdict(list)
+        for field in self.fields:
+            for field_type in (field.type, None):
+                self.subsets[(field_type, False)].append(field)
+                if field.default:
+                    self.subsets[(field_type, True)].append(field)
+        self.subsets = dict(self.subsets)
+
+
+class FieldCatalog:
+    """
+    The field options of every channel, indexed by value, alt_value,
+    airbyte_value and (channel, type).
+
+    Nothing is loaded up front. The field data file of a channel is read, and
+    its FieldOption models built, the first time the channel is needed. Lookups
+    across channels index the raw records of every channel, which is cheap,
+    and only build the models of the channels they match.
+
+    Several fields may share a value, e.g. the date of both Instagram
+    channels, single lookups return the first one in catalog order like a scan
+    would. Returned lists are shared and must not be modified.
+    """
+
+    def __init__(self, channels: Iterable[ChannelType]):
+        self.channels: Tuple[ChannelType, ...] = tuple(channels)
+        self._channel_fields: Dict[ChannelType, ChannelFields] = {}
+        # Lookup key -> key value -> (channel, index in the channel's fields), in catalog order.
+        self._indexes: Optional[Dict[str, Dict[str, List[Tuple[ChannelType, int]]]]] = None
+        # (channel, type, default) -> serialised /fields response body and its ETag.
+        self._payloads: Dict[Tuple[Optional[ChannelType], Optional[FieldType], bool], Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def _channel(self, channel: ChannelType) -> Optional[ChannelFields]:
+        channel_fields = self._channel_fields.get(channel)
+        if channel_fields is None and channel in self.channels:
+            with self._lock:
+                channel_fields = self._channel_fields.get(channel)
+                if channel_fields is None:
+                    channel_fields = ChannelFields(load_field_records(channel))
+                    self._channel_fields[channel] = channel_fields
+        return channel_fields
+
+    def _index(self, key: str) -> Dict[str, List[Tuple[ChannelType, int]]]:
+        if self._indexes is None:
+            indexes = {name: defaultdict(list) for name in LOOKUP_KEYS}
+            for channel in self.channels:
+                records = load_field_records(channel)
+                for position, record in enumerate(records["metrics"] + records["dimensions"]):
+                    for name in LOOKUP_KEYS:
+                        value = record.get(name)
+                        if value is not None:
+                            indexes[name][value].append((channel, position))
+            self._indexes = {name: dict(index) for name, index in indexes.items()}
+        return self._indexes[key]
+
+    def _first(self, key: str, value: str) -> Optional[FieldOption]:
+        matches = self._index(key).get(value)
+        if not matches:
+            return None
+        channel, position = matches[0]
+        return self._channel(channel).fields[position]
+
+    @property
+    def fields(self) -> List[FieldOption]:
+        return [field for channel in self.channels for field in self._channel(channel).fields]
+
+    def by_value(self, value: str) -> Optional[FieldOption]:
+        return self._first("value", value)
+
+    def by_alt_value(self, alt_value: str) -> Optional[FieldOption]:
+        return self._first("alt_value", alt_value)
+
+    def by_airbyte_value(self, airbyte_value: str) -> Optional[FieldOption]:
+        return self._first("airbyte_value", airbyte_value)
+
+    def with_alt_values(self, alt_values: Iterable[str]) -> List[FieldOption]:
+        """
+        Returns every field with one of the given alt values, in catalog order.
+
+        Args:
+            alt_values (Iterable[str]): The alt values, e.g. the columns of a table.
+
+        Returns:
+            List[FieldOption]: The matching fields.
+        """
+        index = self._index("alt_value")
+        order = {channel: rank for rank, channel in enumerate(self.channels)}
+        matches = sorted(
+            {match for alt_value in set(alt_values) for match in index.get(alt_value, [])},
+            key=lambda match: (order[match[0]], match[1]),
+        )
+        return [self._channel(channel).fields[position] for channel, position in matches]
+
+    def for_channel(
+        self,
+        channel: ChannelType,
+        field_type: Optional[FieldType] = None,
+        default: bool = False,
+    ) -> List[FieldOption]:
+        """
+        Returns the fields of a channel, metrics before dimensions.
+
+        Args:
+            channel (ChannelType): The channel.
+            field_type (FieldType, optional): Only return metrics or dimensions.
+            default (bool, optional): Only return the fields selected by default.
+
+        Returns:
+            List[FieldOption]: The fields.
+        """
+        channel_fields = self._channel(channel)
+        if channel_fields is None:
+            return []
+        return channel_fields.subsets.get((field_type, default), [])
+
+    def field_options(
+        self,
+        channel: Optional[ChannelType],
+        default: bool = False,
+        metrics: bool = False,
+        dimensions: bool = False,
+    ) -> List[FieldOption]:
+        """
+        Returns the fields listed by the /fields endpoint of a connector.
+
+        Args:
+            channel (ChannelType, optional): The channel of the connector, None if it has no fields.
+            default (bool, optional): Only return the fields selected by default.
+            metrics (bool, optional): Only return metrics.
+            dimensions (bool, optional): Only return dimensions, unless `metrics` is set.
+
+        Returns:
+            List[FieldOption]: The fields.
+        """
+        return self.for_channel(channel, fields_type(metrics, dimensions), default)
+
+    def field_options_payload(
+        self,
+        channel: Optional[ChannelType],
+        default: bool = False,
+        metrics: bool = False,
+        dimensions: bool = False,
+    ) -> Tuple[bytes, str]:
+        """
+        Returns the /fields response body of a connector, serialised the way
+        FastAPI serialises `List[FieldOption]`, and its strong ETag.
+
+        Bodies are serialised on first use and kept for the life of the
+        process. The ETag is a hash of the body, so every worker and deploy
+        serving the same catalog gives the same ETag.
+
+        Args:
+            channel (ChannelType, optional): The channel of the connector, None if it has no fields.
+            default (bool, optional): Only return the fields selected by default.
+            metrics (bool, optional): Only return metrics.
+            dimensions (bool, optional): Only return dimensions, unless `metrics` is set.
+
+        Returns:
+            Tuple[bytes, str]: The JSON body and its quoted ETag.
+        """
+        key = (channel, fields_type(metrics, dimensions), default)
+        payload = self._payloads.get(key)
+        if payload is None:
+            body = json_body(self.for_channel(*key))
+            payload = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+            self._payloads[key] = payload
+        return payload
+
+    def field_options_response(
+        self,
+        channel: Optional[ChannelType],
+        default: bool = False,
+        metrics: bool = False,
+        dimensions: bool = False,
+        if_none_match: Optional[str] = None,
+    ) -> Response:
+        """
+        Returns the /fields response of a connector, or an empty 304 if the
+        client already has it.
+
+        Args:
+            channel (ChannelType, optional): The channel of the connector, None if it has no fields.
+            default (bool, optional): Only return the fields selected by default.
+            metrics (bool, optional): Only return metrics.
+            dimensions (bool, optional): Only return dimensions, unless `metrics` is set.
+            if_none_match (str, optional): The If-None-Match header of the request.
+
+        Returns:
+            Response: The response.
+        """
+        body, etag = self.field_options_payload(channel, default, metrics, dimensions)
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={FIELDS_MAX_AGE}"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def fields_type(metrics: bool, dimensions: bool) -> Optional[FieldType]:
+    if metrics:
+        return FieldType.metric
+    if dimensions:
+        return FieldType.dimension
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag, using the weak comparison
+    RFC 9110 asks for, so W/ prefixed tags added by proxies still match.
+
+    Args:
+        if_none_match (str, optional): The header.
+        etag (str): The quoted ETag of the current response.
+
+    Returns:
+        bool: Whether the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.replace("W/", "", 1) == etag for tag in tags)
+
+
+field_catalog = FieldCatalog(CATALOG_CHANNELS)
@@ -2,14 +2,16 @@ from api.config import Config
 from api.models.user import User
 from api.models.google import GoogleQuery
 from api.database.models import UserDB
-from api.utilities.string import underscore_to_camel_case
 from api.database.database import session
-from api.utilities.data import convert_metric
+from api.core.static_data import ChannelType
+from api.utilities.cache import TTLCache
+from api.utilities.google.fields import compile_google_fields, extract_google_row
 
 from datetime import datetime
 from fastapi import HTTPException
-import requests
-from typing import List
+from api.utilities.http import http_client
+from api.utilities.json_stream import iter_json_array
+from typing import Iterator, List, Optional
 
 REFRESH_ERROR = "Invalid refresh token"
 
@@ -17,6 +19,13 @@ GOOGLE_CLIENT_ID = Config.GOOGLE_CLIENT_ID
 GOOGLE_CLIENT_SECRET = Config.GOOGLE_CLIENT_SECRET
 GOOGLE_ADS_DEVELOPER_TOKEN = Config.GOOGLE_ADS_DEVELOPER_TOKEN
 
+# Seconds before the reported expiry at which a cached access token is refreshed.
+ACCESS_TOKEN_EXPIRY_MARGIN = 300
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+access_token_cache = TTLCache("google_access_token", ttl=0, maxsize=1024)
+
 
 def handleGoogleTokenException(ex, current_user: User):
     error = str(ex)
@@ -25,6 +34,7 @@ def handleGoogleTokenException(ex, current_user: User):
             user = (
                 session.query(UserDB).filter(UserDB.email == current_user.email).first()
             )
+            clear_cached_access_token(user.google_refresh_token)
             user.google_refresh_token = None
             session.add(user)
             session.commit()
@@ -77,10 +87,24 @@ def build_google_video_query(
     return data_query
 
 
-
-def fetch_google_data(
+def iter_google_rows(
     current_user: User, query: GoogleQuery, data_query: str
-) -> List[object]:
+) -> Iterator[dict]:
+    """
+    Runs a Google Ads searchStream query and yields the parsed rows as the
+    response arrives.
+
+    The response body is parsed batch by batch, so neither the whole payload
+    nor the full list of rows is ever held in memory.
+
+    Args:
+        current_user (User): The user whose refresh token is used.
+        query (GoogleQuery): The account, metrics and dimensions to fetch.
+        data_query (str): The GAQL query.
+
+    Yields:
+        dict: One row per result, keyed by metric and dimension.
+    """
     access_token = get_access_token(current_user.google_refresh_token)
     url = f"https://googleads.googleapis.com/v14/customers/{query.account_id}/googleAds:searchStream"
     body = {"query": data_query}
@@ -90,92 +114,40 @@ def fetch_google_data(
         "login-customer-id": query.manager_id,
     }
 
-    response = requests.post(url, headers=headers, data=body)
-    stream = response.json()
-
-
-    data = []
-    for batch in stream:
-        try:
-            results = batch["results"]
-        except KeyError as e:
+    accessors = compile_google_fields(query.metrics, query.dimensions)
+
+    response = http_client.post(
+        url,
+        headers=headers,
+        data=body,
+        idempotent=True,
+        stream=True,
+        platform=ChannelType.google,
+        account=query.account_id,
+    )
+    try:
+        if response.status_code != 200:
             print(response.text)
-            print(batch)
             raise HTTPException(
                 status_code=400,
                 detail=f"Could not get results in Google Ads data. {response.text}",
             )
-        for row in results:
-            data_row = {}
-            for metric in query.metrics:
-                metric_name = metric.replace("metrics.", "")
-                metric_name = underscore_to_camel_case(metric_name)
-                try:
-                    data_row[metric] = convert_metric(
-                        row["metrics"][metric_name], metric_name
-                    )
-                except KeyError as e:
-                    print("KeyError: could not find metrics", e)
-                    pass
-            for dimension in query.dimensions:
-                dimension_components = dimension.split(".")
-                if dimension_components[0] == "segments":
-                    if dimension_components[1] == "keyword":
-                        try:
-                            data_row[dimension] = row["segments"]["keyword"]["info"][
-                                "text"
-                            ]
-                        except KeyError as e:
-                            print("KeyError: could not find segments keyword", e)
-
-                    else:
-                        dimension_name = dimension.replace("segments.", "")
-                        dimension_name = underscore_to_camel_case(dimension_name)
-                        try:
-                            data_row[dimension] = row["segments"][dimension_name]
-                        except BaseException as e:
-                            print("KeyError: could not find segments", e)
-                elif dimension_components[0] == "ad_group":
-                    dimension_name = dimension.replace("ad_group.", "")
-                    dimension_name = underscore_to_camel_case(dimension_name)
-                    try:
-                        data_row[dimension] = row["adGroup"][dimension_name]
-                    except BaseException as e:
-                        print("KeyError: could not find ad_group dimension", e)
-                elif dimension_components[0] == "ad_group_ad":
-                    dimension_name = dimension.replace("ad_group_ad.ad.", "")
-                    dimension_name = underscore_to_camel_case(dimension_name)
-
-                    try:
-                        data_row[dimension] = row["adGroupAd"]["ad"][dimension_name]
-                    except KeyError as e:
-                        print("KeyError: could not find ad_group_ad.ad dimension", e)
-
-                elif dimension_components[0] == "campaign":
-                    dimension_name = dimension.replace("campaign.", "")
-                    dimension_name = underscore_to_camel_case(dimension_name)
-                    try:
-                        data_row[dimension] = row["campaign"][dimension_name]
-                    except KeyError as e:
-                        print("KeyError: could not find campaign dimension", e)
-                elif dimension_components[0] == "video":
-                    dimension_name = dimension.replace("video.", "")
-                    dimension_name = underscore_to_camel_case(dimension_name)
-                    try:
-                        data_row[dimension] = row["video"][dimension_name]
-                    except KeyError as e:
-                        print("KeyError: could not find video dimension", e)
-                else:
-                    raise HTTPException(
-                        status_code=400, detail=f"Invalid dimension: {dimension}"
-                    )
-
-            data.append(data_row)
-
-    return data
-
 
-def get_access_token(refresh_token: str):
+        for batch in iter_json_array(response.iter_content(chunk_size=STREAM_CHUNK_BYTES)):
+            if "error" in batch:
+                print(batch)
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Could not get results in Google Ads data. {batch['error']}",
+                )
+            # Batches without results carry only the field mask of an empty result.
+            for row in batch.get("results", []):
+                yield extract_google_row(row, accessors)
+    finally:
+        response.close()
+
+
+def request_access_token(refresh_token: str) -> dict:
     url = "https://oauth2.googleapis.com/token"
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     data = {
@@ -184,9 +156,41 @@ def get_access_token(refresh_token: str):
         "refresh_token": refresh_token,
         "grant_type": "refresh_token",
     }
-    response = requests.post(url, headers=headers, data=data)
+    response = http_client.post(url, headers=headers, data=data, idempotent=True)
 
     if response.status_code != 200:
         raise HTTPException(status_code=400, detail=f"Could not get access token: {response.text}")
     else:
-        return response.json()["access_token"]
+        return response.json()
+
+
+def get_access_token(refresh_token: str):
+    """
+    Returns an access token for the refresh token, reusing a cached token until
+    shortly before it expires.
+
+    Args:
+        refresh_token (str): The Google OAuth refresh token.
+
+    Returns:
+        str: The access token.
+    """
+    token = access_token_cache.get_or_load(
+        refresh_token,
+        lambda: request_access_token(refresh_token),
+        ttl_of=lambda token: max(
+            float(token.get("expires_in", 0)) - ACCESS_TOKEN_EXPIRY_MARGIN, 0
+        ),
+    )
+    return token["access_token"]
+
+
+def clear_cached_access_token(refresh_token: Optional[str]):
+    """
+    Drops the cached access token of a refresh token that has been cleared.
+
+    Args:
+        refresh_token (Optional[str]): The Google OAuth refresh token.
+    """
+    if refresh_token:
+        access_token_cache.invalidate(refresh_token)
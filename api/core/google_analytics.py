@@ -1,9 +1,12 @@
 from datetime import datetime
 from fastapi import HTTPException
-import requests
+from typing import Iterator, List, Tuple
+from api.config import Config
+from api.utilities.http import http_client
 
 from api.models.user import User
 from api.models.google_analytics import GoogleAnalyticsQuery
+from api.core.static_data import ChannelType
 from api.core.google import get_access_token
 
 from google.analytics.data_v1beta import BetaAnalyticsDataClient
@@ -14,62 +17,177 @@ from google.analytics.data_v1beta.types import (
     RunReportRequest,
 )
 
+GOOGLE_ANALYTICS_DATA_URL = "https://analyticsdata.googleapis.com/v1beta"
+GOOGLE_ANALYTICS_PAGE_SIZE = int(Config.GOOGLE_ANALYTICS_PAGE_SIZE)
+# The maximum number of reports in a batchRunReports request.
+REPORTS_PER_BATCH = 5
 
-def fetch_google_analytics_data(current_user: User, query: GoogleAnalyticsQuery):
-    dimensions = [{"name": dimension} for dimension in query.dimensions]
-    metrics = [{"name": metric}  for metric in query.metrics]
-    request_body = {
-        "dimensions": dimensions,
-        "metrics": metrics,
+
+def report_request(
+    query: GoogleAnalyticsQuery, date_range: Tuple[datetime, datetime], offset: int = 0
+) -> dict:
+    """
+    Builds a runReport request body for one page of one date range.
+
+    Args:
+        query (GoogleAnalyticsQuery): The metrics and dimensions to fetch.
+        date_range (Tuple[datetime, datetime]): The first and last day of the report.
+        offset (int, optional): The index of the first row of the page.
+
+    Returns:
+        dict: The request body.
+    """
+    return {
+        "dimensions": [{"name": dimension} for dimension in query.dimensions],
+        "metrics": [{"name": metric} for metric in query.metrics],
         "dateRanges": [
             {
-                "startDate": query.start_date.strftime("%Y-%m-%d"),
-                "endDate": query.end_date.strftime("%Y-%m-%d")
+                "startDate": date_range[0].strftime("%Y-%m-%d"),
+                "endDate": date_range[1].strftime("%Y-%m-%d")
             }
-        ]
+        ],
+        "limit": GOOGLE_ANALYTICS_PAGE_SIZE,
+        "offset": offset,
     }
 
-    # response = client.run_report(request)
-    access_token = get_access_token(current_user.google_analytics_refresh_token)
-    response = requests.post(
-        f"https://analyticsdata.googleapis.com/v1beta/properties/{query.property_id}:runReport",
-        json=request_body,
-        headers={
-            "Authorization": f"Bearer {access_token}"
-        }
-    )   
 
+def parse_report_rows(query: GoogleAnalyticsQuery, report: dict) -> List[dict]:
+    """
+    Converts the rows of a report page into dictionaries keyed by metric and
+    dimension, with dates formatted as YYYY-MM-DD.
+
+    Args:
+        query (GoogleAnalyticsQuery): The query the report was run for.
+        report (dict): The report page.
+
+    Returns:
+        List[dict]: The rows.
+    """
     data = []
-    if response.status_code == 200:
-        json_response = response.json()
-        if "rows" in json_response:
-            for row in json_response["rows"]:
-                data_row = {}
-                for i, dimension in enumerate(query.dimensions):
-                    dimension_value = row["dimensionValues"][i]["value"]
-                    if dimension == "date":
-                        date = str(row["dimensionValues"][i]["value"])
-                        date = datetime.strptime(date, "%Y%m%d")
-                        dimension_value = date.strftime("%Y-%m-%d")
-                    data_row[dimension] = dimension_value
-
-                for i, metric in enumerate(query.metrics):
-                    metric_value = row["metricValues"][i]["value"]
-                    data_row[metric] = metric_value
-
-                data.append(data_row)
-        else:
-            print(response.text)
-            print(json_response)
-            raise HTTPException(
-                status_code=400,
-                detail=f"No values found. {json_response}"
-            )
-    else:
+    # Reports without any rows for the date range omit the rows key.
+    for row in report.get("rows", []):
+        data_row = {}
+        for i, dimension in enumerate(query.dimensions):
+            dimension_value = row["dimensionValues"][i]["value"]
+            if dimension == "date":
+                date = str(row["dimensionValues"][i]["value"])
+                date = datetime.strptime(date, "%Y%m%d")
+                dimension_value = date.strftime("%Y-%m-%d")
+            data_row[dimension] = dimension_value
+
+        for i, metric in enumerate(query.metrics):
+            metric_value = row["metricValues"][i]["value"]
+            data_row[metric] = metric_value
+
+        data.append(data_row)
+    return data
+
+
+def post_report(url: str, body: dict, access_token: str, property_id: str) -> dict:
+    """
+    Posts a report request to the Data API.
+
+    Args:
+        url (str): The runReport or batchRunReports URL of the property.
+        body (dict): The request body.
+        access_token (str): The Google Analytics access token.
+        property_id (str): The property the request counts against in the rate limiter.
+
+    Returns:
+        dict: The response.
+
+    Raises:
+        HTTPException: If the request failed.
+    """
+    response = http_client.post(
+        url,
+        json=body,
+        headers={
+            "Authorization": f"Bearer {access_token}"
+        },
+        idempotent=True,
+        platform=ChannelType.google_analytics,
+        account=property_id,
+    )
+    if response.status_code != 200:
         print(response.text)
         raise HTTPException(
                 status_code=400,
                 detail=f"Could not get data. {response.text}",
             )
+    return response.json()
 
-    return data
+
+def iter_report_pages(
+    query: GoogleAnalyticsQuery,
+    date_range: Tuple[datetime, datetime],
+    access_token: str,
+    first_page: dict = None,
+) -> Iterator[List[dict]]:
+    """
+    Pages through a runReport with limit and offset until every row of the
+    report has been read.
+
+    Args:
+        query (GoogleAnalyticsQuery): The property, metrics and dimensions to fetch.
+        date_range (Tuple[datetime, datetime]): The first and last day of the report.
+        access_token (str): The Google Analytics access token.
+        first_page (dict, optional): The first page if it was already fetched, e.g. by batchRunReports.
+
+    Yields:
+        List[dict]: The rows of the next page.
+    """
+    url = f"{GOOGLE_ANALYTICS_DATA_URL}/properties/{query.property_id}:runReport"
+    report = first_page
+    if report is None:
+        report = post_report(url, report_request(query, date_range), access_token, query.property_id)
+    offset = 0
+    while True:
+        rows = parse_report_rows(query, report)
+        yield rows
+        offset += len(rows)
+        if not rows or offset >= report.get("rowCount", 0):
+            return
+        report = post_report(
+            url, report_request(query, date_range, offset), access_token, query.property_id
+        )
+
+
+def iter_google_analytics_rows(
+    current_user: User, query: GoogleAnalyticsQuery
+) -> Iterator[dict]:
+    """
+    Runs a Google Analytics report and yields its rows page by page.
+
+    Every report is paged through with limit and offset, so results are no
+    longer capped at the default row limit of runReport. When the query has
+    several date ranges, they are requested REPORTS_PER_BATCH at a time with
+    batchRunReports and each range is then paged through on its own.
+
+    Args:
+        current_user (User): The user whose refresh token is used.
+        query (GoogleAnalyticsQuery): The property, metrics, dimensions and date ranges to fetch.
+
+    Yields:
+        dict: The next row, in date range order.
+    """
+    access_token = get_access_token(current_user.google_analytics_refresh_token)
+    date_ranges = query.date_ranges or [(query.start_date, query.end_date)]
+
+    if len(date_ranges) == 1:
+        for page in iter_report_pages(query, date_ranges[0], access_token):
+            yield from page
+        return
+
+    url = f"{GOOGLE_ANALYTICS_DATA_URL}/properties/{query.property_id}:batchRunReports"
+    for start in range(0, len(date_ranges), REPORTS_PER_BATCH):
+        batch = date_ranges[start : start + REPORTS_PER_BATCH]
+        response = post_report(
+            url,
+            {"requests": [report_request(query, date_range) for date_range in batch]},
+            access_token,
+            query.property_id,
+        )
+        for date_range, report in zip(batch, response.get("reports", [])):
+            for page in iter_report_pages(query, date_range, access_token, first_page=report):
+                yield from page
@@ -1,11 +1,126 @@
 from datetime import datetime, timedelta
-from typing import List
-import requests
+import itertools
+from typing import Iterator, List
+from api.config import Config
+from api.utilities.http import http_client
 from fastapi import HTTPException
 
+from api.core.facebook import GRAPH_BATCH_SIZE, GRAPH_URL, graph_batch, iter_facebook_pages
 from api.core.static_data import ChannelType
 from api.models.instagram import InstagramQuery
 from api.models.user import User
+from api.utilities.concurrency import iter_ordered
+
+INSTAGRAM_API_VERSION = "v18.0"
+INSTAGRAM_MEDIA_PAGE_LIMIT = 100
+INSTAGRAM_BATCH_CONCURRENCY = int(Config.INSTAGRAM_BATCH_CONCURRENCY)
+
+
+def media_metrics(query: InstagramQuery, media: dict) -> str:
+    """
+    Returns the insights metrics of the query that are available for the type
+    of a media item.
+
+    Args:
+        query (InstagramQuery): The query.
+        media (dict): The media item, with its media_type and media_product_type.
+
+    Returns:
+        str: The comma separated metrics.
+    """
+    metrics = query.metrics
+    if media["media_type"] == "IMAGE" or media["media_type"] == "CAROUSEL_ALBUM":
+        items_to_remove = ["plays", "ig_reels_avg_watch_time", "ig_reels_video_view_total_time"]
+        metrics = [item for item in metrics if item not in items_to_remove]
+    elif media["media_type"] == "VIDEO" and media["media_product_type"] != "REELS":
+        items_to_remove = ["ig_reels_video_view_total_time", "ig_reels_avg_watch_time"]
+        metrics = [item for item in metrics if item not in items_to_remove]
+    return ','.join(metrics)
+
+
+def media_row(query: InstagramQuery, media: dict, insights: dict) -> dict:
+    """
+    Builds the row of a media item from its fields and insights.
+
+    Args:
+        query (InstagramQuery): The query.
+        media (dict): The media item.
+        insights (dict): The insights response of the media item.
+
+    Returns:
+        dict: The row keyed by metric and dimension.
+    """
+    row = {}
+    for dimension in query.dimensions:
+        if dimension == "date":
+            row[dimension] = datetime.strptime(media["timestamp"], "%Y-%m-%dT%H:%M:%S%z").date()
+        elif dimension == "owner":
+            row[dimension] = media["owner"]["id"]
+        else:
+            try:
+                row[dimension] = media[dimension]
+            except KeyError:
+                pass
+
+    for datum in insights["data"]:
+        name = datum["name"]
+        for value in datum["values"]:
+            row[name] = value['value']
+    return row
+
+
+def iter_media_rows(
+    current_user: User,
+    query: InstagramQuery,
+    dimensions: str,
+    start_date: str,
+    end_date: str,
+) -> Iterator[dict]:
+    """
+    Yields one row per media item of an Instagram account.
+
+    The media edge is paged through with the media fields expanded inline, and
+    the insights of the media are fetched in Graph batch requests of
+    GRAPH_BATCH_SIZE items, with INSTAGRAM_BATCH_CONCURRENCY batches in flight.
+
+    Args:
+        current_user (User): The user whose access token is used.
+        query (InstagramQuery): The account, metrics and dimensions to fetch.
+        dimensions (str): The comma separated media fields to fetch.
+        start_date (str): The first day of the insights, formatted as YYYY-MM-DD.
+        end_date (str): The last day of the insights, formatted as YYYY-MM-DD.
+
+    Yields:
+        dict: The next row, in media order.
+    """
+    access_token = current_user.instagram_access_token
+    fields = ",".join(
+        ["timestamp", "media_type", "media_product_type"] + ([dimensions] if dimensions else [])
+    )
+    pages = iter_facebook_pages(
+        f"{GRAPH_URL}/{INSTAGRAM_API_VERSION}/{query.account_id}/media",
+        {"fields": fields, "limit": INSTAGRAM_MEDIA_PAGE_LIMIT, "access_token": access_token},
+        error="Instagram query failed in getting media",
+        platform=query.channel,
+        account=query.account_id,
+    )
+    media_items = itertools.chain.from_iterable(pages)
+    batches = iter(lambda: list(itertools.islice(media_items, GRAPH_BATCH_SIZE)), [])
+
+    def fetch_batch(batch: List[dict]) -> List[dict]:
+        insights = graph_batch(
+            [
+                f"{INSTAGRAM_API_VERSION}/{media['id']}/insights?metric={media_metrics(query, media)}&since={start_date}&until={end_date}"
+                for media in batch
+            ],
+            access_token,
+            platform=query.channel,
+            account=query.account_id,
+        )
+        return [media_row(query, media, body) for media, body in zip(batch, insights)]
+
+    for rows in iter_ordered(fetch_batch, batches, max_workers=INSTAGRAM_BATCH_CONCURRENCY):
+        yield from rows
 
 
 def fetch_instagram_data(current_user: User, query: InstagramQuery) -> List[object]:
@@ -31,7 +146,7 @@ def fetch_instagram_data(current_user: User, query: InstagramQuery) -> List[obje
     parsed_data = []
     if query.channel == ChannelType.instagram_account:
         url = f"https://graph.facebook.com/v18.0/{query.account_id}?fields={dimensions}&access_token={current_user.instagram_access_token}"
-        response = requests.get(url)
+        response = http_client.get(url, platform=query.channel, account=query.account_id)
         if response.status_code != 200:
             print(response.text)
             raise HTTPException(status_code=response.status_code, detail="Instagram query failed in getting account data: " + response.text)
@@ -43,7 +158,7 @@ def fetch_instagram_data(current_user: User, query: InstagramQuery) -> List[obje
 
         url = f"https://graph.facebook.com/v18.0/{query.account_id}/insights?metric={metrics}&period={query.period}&metric_type={metric_type}&since={start_date}&until={end_date}&access_token={current_user.instagram_access_token}"
 
-        response = requests.get(url)
+        response = http_client.get(url, platform=query.channel, account=query.account_id)
         if response.status_code != 200:
             print(response.text)
             raise HTTPException(status_code=response.status_code, detail="Instagram query failed in getting account data: " + response.text)
@@ -75,65 +190,8 @@ def fetch_instagram_data(current_user: User, query: InstagramQuery) -> List[obje
             parsed_data.append(row)
 
     else:
-        url = f"https://graph.facebook.com/v18.0/{query.account_id}?fields=media&access_token={current_user.instagram_access_token}"
-        response = requests.get(url)
-        if response.status_code != 200:
-            print(response.text)
-            raise HTTPException(status_code=response.status_code, detail="Instagram query failed in getting media ids: " + response.text)
-        json = response.json()
-        data = json["media"]["data"]
-
-        media_ids = [media["id"] for media in data]
-
-        for id in media_ids:
-            url = f"https://graph.facebook.com/v18.0/{id}?fields=timestamp,media_type,media_product_type,{dimensions}&access_token={current_user.instagram_access_token}"
-            response = requests.get(url)
-            if response.status_code != 200:
-                print(response.text)
-                raise HTTPException(status_code=response.status_code, detail="Instagram query failed in getting media timestamp: " + response.text)
-            json = response.json()
-            timestamp = json["timestamp"]
-            media_type = json["media_type"]
-            media_product_type = json["media_product_type"]
-
-            if media_type == "IMAGE" or media_type == "CAROUSEL_ALBUM":
-                metrics = query.metrics
-                items_to_remove = ["plays", "ig_reels_avg_watch_time", "ig_reels_video_view_total_time"]
-                metrics = [item for item in metrics if item not in items_to_remove]
-                metrics = ','.join(metrics)
-            elif media_type == "VIDEO" and media_product_type != "REELS":
-                metrics = query.metrics
-                items_to_remove = ["ig_reels_video_view_total_time", "ig_reels_avg_watch_time"]
-                metrics = [item for item in metrics if item not in items_to_remove]
-                metrics = ','.join(metrics)
-
-            row = {}
-            for dimension in query.dimensions:
-                if dimension == "date":
-                    row[dimension] = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S%z").date()
-                elif dimension == "owner":
-                    row[dimension] = json["owner"]["id"]
-                else:
-                    try:
-                        row[dimension] = json[dimension]
-                    except KeyError:
-                        print("Dimension not foundin json " + dimension)
-                        print(json)
-                        pass
-
-            url = f"https://graph.facebook.com/v18.0/{id}/insights?metric={metrics}&since={start_date}&until={end_date}&access_token={current_user.instagram_access_token}"
-
-            response = requests.get(url)
-            if response.status_code != 200:
-                print(response.text)
-                raise HTTPException(status_code=response.status_code, detail="Instagram query failed in getting media data: " + response.text)
-            json = response.json()
-            data = json["data"]
-
-            for datum in data:
-                name = datum["name"]
-                for value in datum["values"]:
-                    row[name] = value['value']
-            parsed_data.append(row)
+        parsed_data = list(
+            iter_media_rows(current_user, query, dimensions, start_date, end_date)
+        )
 
     return parsed_data
@@ -0,0 +1,346 @@
+from collections import defaultdict, deque
+import datetime
+from fastapi import HTTPException
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from api.config import Config
+from api.core.static_data import JobKind, JobPhase, JobStatus
+from api.database.database import session
+from api.database.models import JobDB
+
+JOB_WORKERS = int(Config.JOB_WORKERS)
+JOB_MAX_PER_USER = int(Config.JOB_MAX_PER_USER)
+
+# Minimum number of seconds between two progress writes of a running job.
+PROGRESS_FLUSH_INTERVAL = 2.0
+
+
+def create_job(
+    user_id: int,
+    kind: JobKind,
+    data_source_id: Optional[int] = None,
+    accounts_total: int = 0,
+) -> JobDB:
+    """
+    Adds a queued job to the database.
+
+    Args:
+        user_id (int): The user the job runs for.
+        kind (JobKind): What the job does.
+        data_source_id (int, optional): The data source the job works on.
+        accounts_total (int, optional): The number of ad accounts the job fetches.
+
+    Returns:
+        JobDB: The new job.
+
+    Raises:
+        HTTPException: If the job could not be saved.
+    """
+    job = JobDB(
+        user_id=user_id,
+        data_source_id=data_source_id,
+        kind=kind,
+        status=JobStatus.queued,
+        phase=JobPhase.queued,
+        accounts_total=accounts_total,
+        accounts_fetched=0,
+        rows_loaded=0,
+        timings={},
+        created_at=datetime.datetime.now(),
+    )
+    try:
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+    except Exception as e:
+        print(e)
+        session.rollback()
+        raise HTTPException(status_code=400, detail=f"Could not save job to database. {e}")
+    finally:
+        session.close()
+        session.remove()
+
+    return job
+
+
+def update_job(job_id: int, **values):
+    """
+    Updates the columns of a job.
+
+    Args:
+        job_id (int): The id of the job.
+        **values: The columns to update.
+    """
+    try:
+        session.query(JobDB).filter(JobDB.id == job_id).update(values)
+        session.commit()
+    except Exception as e:
+        print(f"Could not update job {job_id}. {e}")
+        session.rollback()
+    finally:
+        session.close()
+        session.remove()
+
+
+def get_job(job_id: int) -> Optional[JobDB]:
+    try:
+        job = session.query(JobDB).filter(JobDB.id == job_id).first()
+    except BaseException as e:
+        print(e)
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+        session.remove()
+    return job
+
+
+def fail_interrupted_jobs():
+    """
+    Marks jobs that were queued or running when the process stopped as
+    failed, since the in-process queue does not survive a restart.
+    """
+    try:
+        session.query(JobDB).filter(
+            JobDB.status.in_([JobStatus.queued, JobStatus.running])
+        ).update(
+            {
+                "status": JobStatus.failed,
+                "phase": JobPhase.finished,
+                "error": "Interrupted by a restart.",
+                "finished_at": datetime.datetime.now(),
+            },
+            synchronize_session=False,
+        )
+        session.commit()
+    except Exception as e:
+        print(f"Could not fail interrupted jobs. {e}")
+        session.rollback()
+    finally:
+        session.close()
+        session.remove()
+
+
+class JobProgress:
+    """
+    Tracks the progress of a running job and writes it to the jobs table,
+    at most every PROGRESS_FLUSH_INTERVAL seconds unless forced.
+
+    Counters may be updated from any thread.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.phase = JobPhase.queued
+        self.accounts_fetched = 0
+        self.rows_loaded = 0
+        self.timings: Dict[str, float] = {}
+        self.errors: List[str] = []
+        self._phase_started = time.monotonic()
+        self._flushed = 0.0
+        self._lock = threading.Lock()
+
+    def start_phase(self, phase: JobPhase):
+        """
+        Records how long the current phase took and moves on to the next one.
+
+        Args:
+            phase (JobPhase): The next phase.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.phase != JobPhase.queued:
+                self.timings[self.phase.value] = round(now - self._phase_started, 3)
+            self.phase = phase
+            self._phase_started = now
+        self.flush(force=True)
+
+    def account_done(self, *args):
+        with self._lock:
+            self.accounts_fetched += 1
+
+    def count_rows(self, frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Passes frames through, counting their rows as loaded.
+
+        Args:
+            frames (Iterable[pd.DataFrame]): The frames being loaded.
+
+        Yields:
+            pd.DataFrame: The same frames.
+        """
+        for frame in frames:
+            with self._lock:
+                self.rows_loaded += len(frame)
+            self.flush()
+            yield frame
+
+    def values(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "phase": self.phase,
+                "accounts_fetched": self.accounts_fetched,
+                "rows_loaded": self.rows_loaded,
+                "timings": dict(self.timings),
+                "errors": list(self.errors) or None,
+            }
+
+    def flush(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._flushed < PROGRESS_FLUSH_INTERVAL:
+            return
+        self._flushed = now
+        update_job(self.job_id, **self.values())
+
+
+class JobQueue:
+    """
+    Runs jobs on a bounded pool of worker threads.
+
+    Users take turns: workers pick the next job from the users with queued
+    jobs in round robin order, and each user has at most `max_per_user` jobs
+    running at once, so one user adding many data sources does not hold up
+    everyone else.
+    """
+
+    def __init__(self, workers: int, max_per_user: int):
+        self.workers = workers
+        self.max_per_user = max_per_user
+        self._pending: Dict[Any, Deque[Tuple[int, Callable[[], None]]]] = defaultdict(deque)
+        self._users: Deque[Any] = deque()
+        self._running: Dict[Any, int] = defaultdict(int)
+        self._threads: List[threading.Thread] = []
+        self._condition = threading.Condition()
+
+    def submit(self, user_id: Any, job_id: int, run: Callable[[], None]):
+        """
+        Queues a job.
+
+        Args:
+            user_id: The user the job runs for.
+            job_id (int): The id of the job.
+            run (Callable): Runs the job.
+        """
+        with self._condition:
+            self._pending[user_id].append((job_id, run))
+            if user_id not in self._users:
+                self._users.append(user_id)
+            self._start_workers()
+            self._condition.notify()
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work, name=f"job-worker-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _take(self):
+        for _ in range(len(self._users)):
+            user_id = self._users.popleft()
+            if self._running[user_id] >= self.max_per_user:
+                self._users.append(user_id)
+                continue
+            job = self._pending[user_id].popleft()
+            if self._pending[user_id]:
+                self._users.append(user_id)
+            else:
+                del self._pending[user_id]
+            self._running[user_id] += 1
+            return user_id, job
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                taken = self._take()
+                while taken is None:
+                    self._condition.wait()
+                    taken = self._take()
+            user_id, (job_id, run) = taken
+            try:
+                run()
+            except Exception as e:
+                print(f"Job {job_id} failed. {e}")
+            finally:
+                with self._condition:
+                    self._running[user_id] -= 1
+                    if not self._running[user_id]:
+                        del self._running[user_id]
+                    self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the number of queued and running jobs.
+
+        Returns:
+            dict: The queue counters.
+        """
+        with self._condition:
+            return {
+                "workers": self.workers,
+                "queued": sum(len(jobs) for jobs in self._pending.values()),
+                "running": sum(self._running.values()),
+                "users_waiting": len(self._users),
+            }
+
+
+job_queue = JobQueue(JOB_WORKERS, JOB_MAX_PER_USER)
+
+
+def run_job(job_id: int, work: Callable[[JobProgress], None]):
+    """
+    Runs the work of a job, recording its state, progress and outcome.
+
+    Args:
+        job_id (int): The id of the job.
+        work (Callable): Does the work, reporting progress on the JobProgress it is given.
+    """
+    progress = JobProgress(job_id)
+    update_job(job_id, status=JobStatus.running, started_at=datetime.datetime.now())
+    status, error = JobStatus.succeeded, None
+    try:
+        work(progress)
+    except HTTPException as e:
+        status, error = JobStatus.failed, str(e.detail)
+    except Exception as e:
+        status, error = JobStatus.failed, str(e)
+
+    progress.start_phase(JobPhase.finished)
+    update_job(
+        job_id,
+        status=status,
+        error=error,
+        finished_at=datetime.datetime.now(),
+    )
+
+
+def submit_job(
+    user_id: int,
+    kind: JobKind,
+    work: Callable[[JobProgress], None],
+    data_source_id: Optional[int] = None,
+    accounts_total: int = 0,
+) -> JobDB:
+    """
+    Creates a job and queues its work on the job workers.
+
+    Args:
+        user_id (int): The user the job runs for.
+        kind (JobKind): What the job does.
+        work (Callable): Does the work, reporting progress on the JobProgress it is given.
+        data_source_id (int, optional): The data source the job works on.
+        accounts_total (int, optional): The number of ad accounts the job fetches.
+
+    Returns:
+        JobDB: The queued job.
+    """
+    job = create_job(user_id, kind, data_source_id, accounts_total)
+    job_id = job.id
+    job_queue.submit(user_id, job_id, lambda: run_job(job_id, work))
+    return job
@@ -0,0 +1,589 @@
+import io
+import itertools
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+import uuid
+
+import pandas as pd
+from pandas.api.types import infer_dtype
+import sqlalchemy
+
+from api.config import Config
+from api.core.result_cache import bump_table_version
+from api.database.database import engine
+
+LOAD_CHUNK_ROWS = int(Config.LOAD_CHUNK_ROWS)
+NULL_MARKER = "\\N"
+MAX_IDENTIFIER_LENGTH = 63
+
+# The Postgres type of the staging columns of each kind of values. Columns
+# that have only held NULL so far are text until their first values arrive.
+COLUMN_TYPES = {
+    "integer": "BIGINT",
+    "floating": "DOUBLE PRECISION",
+    "boolean": "BOOLEAN",
+    "datetime": "TIMESTAMP",
+    "date": "DATE",
+    "text": "TEXT",
+    None: "TEXT",
+}
+# The kind of each type pandas infers for the values of a column.
+INFERRED_KINDS = {
+    "integer": "integer",
+    "floating": "floating",
+    "mixed-integer-float": "floating",
+    "decimal": "floating",
+    "boolean": "boolean",
+    "datetime64": "datetime",
+    "datetime": "datetime",
+    "date": "date",
+    "empty": None,
+}
+# The kind of values each Postgres type of a loaded table holds.
+POSTGRES_KINDS = {
+    "bigint": "integer",
+    "integer": "integer",
+    "smallint": "integer",
+    "double precision": "floating",
+    "real": "floating",
+    "boolean": "boolean",
+    "timestamp without time zone": "datetime",
+    "date": "date",
+    "text": "text",
+}
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quotes a Postgres identifier, escaping any embedded double quotes.
+
+    Args:
+        name (str): The identifier to quote.
+
+    Returns:
+        str: The quoted identifier.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def staging_table_name(table_name: str) -> str:
+    """
+    Builds a unique staging table name for the given table, kept within the
+    Postgres identifier length limit.
+
+    Args:
+        table_name (str): The name of the table being loaded.
+
+    Returns:
+        str: The staging table name.
+    """
+    suffix = f"__staging_{uuid.uuid4().hex[:8]}"
+    return str(table_name)[: MAX_IDENTIFIER_LENGTH - len(suffix)] + suffix
+
+
+def iter_slices(df: pd.DataFrame, size: int = LOAD_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Splits a DataFrame into consecutive slices of at most `size` rows.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to split.
+        size (int, optional): The maximum number of rows per slice.
+
+    Yields:
+        pd.DataFrame: The next slice of the DataFrame.
+    """
+    for start in range(0, len(df), size):
+        yield df.iloc[start : start + size]
+
+
+def column_kind(series: pd.Series) -> Optional[str]:
+    """
+    Returns the kind of values a column holds, one of the keys of COLUMN_TYPES,
+    or None if the column holds no values to tell by.
+
+    Args:
+        series (pd.Series): The column.
+
+    Returns:
+        str, optional: The kind of the column.
+    """
+    return INFERRED_KINDS.get(infer_dtype(series, skipna=True), "text")
+
+
+def widen_kind(kind: Optional[str], other: Optional[str]) -> Optional[str]:
+    """
+    Returns the narrowest kind that holds the values of both kinds: floats for
+    integers and floats, text for any other two different kinds.
+
+    Args:
+        kind (str, optional): The kind of a column, None if unknown.
+        other (str, optional): The kind of new values, None if unknown.
+
+    Returns:
+        str, optional: The widened kind.
+    """
+    if kind is None or kind == other:
+        return other
+    if other is None:
+        return kind
+    if {kind, other} <= {"integer", "floating"}:
+        return "floating"
+    return "text"
+
+
+def is_integral(series: pd.Series) -> bool:
+    values = pd.to_numeric(series.dropna())
+    return bool(values.mod(1).eq(0).all())
+
+
+def align_frame(
+    df: pd.DataFrame, kinds: Dict[str, Optional[str]]
+) -> Tuple[pd.DataFrame, Dict[str, Optional[str]]]:
+    """
+    Aligns a frame with the columns of a staging table, and works out which
+    columns the table needs added or widened to hold the frame.
+
+    Frames are typed on their own, so a column can be integers in one frame and
+    floats or text in the next, or only exist in some frames. Columns missing
+    from the frame are copied as NULL.
+
+    Args:
+        df (pd.DataFrame): The frame to align.
+        kinds (Dict[str, str]): The kind of each column of the staging table, None for columns that have only held NULL so far.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, str]]: The aligned frame, and the new kind of every column to add or widen.
+    """
+    changes = {}
+    for column in df.columns:
+        kind = column_kind(df[column])
+        if column not in kinds:
+            changes[column] = kind
+        elif kinds[column] == "integer" and kind == "floating" and is_integral(df[column]):
+            # Integer columns with missing values become floats in pandas, which
+            # would be written as "1.0" and rejected by a bigint column.
+            df = df.assign(**{column: pd.to_numeric(df[column]).astype("Int64")})
+        elif widen_kind(kinds[column], kind) != kinds[column]:
+            changes[column] = widen_kind(kinds[column], kind)
+    return df.reindex(columns=list(kinds) + [c for c in df.columns if c not in kinds]), changes
+
+
+def alter_staging(connection, schema: str, staging: str, kinds: Dict[str, Optional[str]], changes: Dict[str, Optional[str]]):
+    """
+    Adds and widens columns of a staging table, as worked out by `align_frame`,
+    and records their new kinds.
+
+    Args:
+        connection: The connection of the load transaction.
+        schema (str): The schema of the staging table.
+        staging (str): The name of the staging table.
+        kinds (Dict[str, str]): The kind of each column of the staging table, updated in place.
+        changes (Dict[str, str]): The new kind of every column to add or widen.
+    """
+    if not changes:
+        return
+    clauses = []
+    for column, kind in changes.items():
+        column_type = COLUMN_TYPES[kind]
+        if column in kinds:
+            clauses.append(
+                f"ALTER COLUMN {quote_identifier(column)} TYPE {column_type} "
+                f"USING {quote_identifier(column)}::{column_type}"
+            )
+        else:
+            clauses.append(f"ADD COLUMN {quote_identifier(column)} {column_type}")
+        kinds[column] = kind
+    connection.execute(
+        f"ALTER TABLE {quote_identifier(schema)}.{quote_identifier(staging)} {', '.join(clauses)}"
+    )
+
+
+def copy_frame(cursor, schema: str, table_name: str, df: pd.DataFrame):
+    """
+    Copies a DataFrame into an existing table with COPY FROM STDIN.
+
+    Args:
+        cursor: The DBAPI cursor to copy with.
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+        df (pd.DataFrame): The rows to copy.
+    """
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep=NULL_MARKER)
+    buffer.seek(0)
+    columns = ", ".join(quote_identifier(column) for column in df.columns)
+    cursor.copy_expert(
+        f"COPY {quote_identifier(schema)}.{quote_identifier(table_name)} ({columns}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{NULL_MARKER}')",
+        buffer,
+    )
+
+
+def copy_frames_to_db(
+    schema: str,
+    table_name: str,
+    frames: Iterable[pd.DataFrame],
+    before_swap: Optional[Callable] = None,
+) -> int:
+    """
+    Loads a stream of DataFrames into a table and atomically replaces any
+    existing table with the same name.
+
+    The rows are copied into a staging table with COPY FROM STDIN, and the
+    staging table is swapped in within the same transaction, so readers see
+    either the old table or the complete new one and never a partial load.
+
+    Args:
+        schema (str): The name of the schema to add the table to.
+        table_name (str): The name of the table to add.
+        frames (Iterable[pd.DataFrame]): The frames holding the rows of the table.
+        before_swap (Callable, optional): Called with the connection, schema and staging table name once all rows are copied, before the swap.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        first = pd.DataFrame()
+
+    staging = staging_table_name(table_name)
+
+    with engine.begin() as connection:
+        rows, _ = copy_to_staging(connection, schema, staging, first, frames)
+
+        if before_swap is not None:
+            before_swap(connection, schema, staging)
+
+        connection.execute(
+            f"DROP TABLE IF EXISTS {quote_identifier(schema)}.{quote_identifier(table_name)}"
+        )
+        connection.execute(
+            f"ALTER TABLE {quote_identifier(schema)}.{quote_identifier(staging)} "
+            f"RENAME TO {quote_identifier(table_name)}"
+        )
+    bump_table_version(schema, table_name)
+
+    return rows
+
+
+def create_table_as(schema: str, table_name: str, query: str) -> int:
+    """
+    Materialises the rows of a query into a table and atomically replaces any
+    existing table with the same name, as `copy_frames_to_db` does.
+
+    Args:
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+        query (str): The SELECT query whose rows fill the table.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    staging = staging_table_name(table_name)
+    target = f"{quote_identifier(schema)}.{quote_identifier(table_name)}"
+    source = f"{quote_identifier(schema)}.{quote_identifier(staging)}"
+
+    with engine.begin() as connection:
+        connection.execute(f"CREATE SCHEMA IF NOT EXISTS {quote_identifier(schema)}")
+        rows = connection.execute(f"CREATE TABLE {source} AS {query}").rowcount
+        connection.execute(f"DROP TABLE IF EXISTS {target}")
+        connection.execute(f"ALTER TABLE {source} RENAME TO {quote_identifier(table_name)}")
+    bump_table_version(schema, table_name)
+
+    return rows
+
+
+def replace_rows_between(
+    schema: str,
+    table_name: str,
+    column: str,
+    start: str,
+    end: str,
+    query: str,
+) -> int:
+    """
+    Replaces the rows of a table whose `column` is between `start` and `end`
+    with the rows of a query, in one transaction.
+
+    Args:
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+        column (str): The column the rows are selected by, e.g. a date.
+        start (str): The first value of the range, inclusive.
+        end (str): The last value of the range, inclusive.
+        query (str): The SELECT query giving the new rows, with the columns of the table in order.
+
+    Returns:
+        int: The number of rows inserted.
+    """
+    target = f"{quote_identifier(schema)}.{quote_identifier(table_name)}"
+
+    with engine.begin() as connection:
+        connection.execute(
+            sqlalchemy.text(
+                f"DELETE FROM {target} WHERE {quote_identifier(column)} BETWEEN :start AND :end"
+            ),
+            {"start": start, "end": end},
+        )
+        rows = connection.execute(f"INSERT INTO {target} {query}").rowcount
+    bump_table_version(schema, table_name)
+
+    return rows
+
+
+def copy_to_staging(
+    connection,
+    schema: str,
+    staging: str,
+    first: pd.DataFrame,
+    frames: Iterable[pd.DataFrame],
+) -> Tuple[int, Dict[str, Optional[str]]]:
+    """
+    Creates a staging table and copies every frame into it with COPY FROM
+    STDIN.
+
+    The columns of the staging table are added as they first appear, and
+    widened when a later frame holds values their type can not, e.g. floats
+    in a column that was integers so far.
+
+    Args:
+        connection: The connection of the load transaction.
+        schema (str): The schema to create the staging table in.
+        staging (str): The name of the staging table.
+        first (pd.DataFrame): The first frame.
+        frames (Iterable[pd.DataFrame]): The remaining frames.
+
+    Returns:
+        Tuple[int, Dict[str, str]]: The number of rows copied, and the kind of each column of the staging table.
+    """
+    rows = 0
+    kinds: Dict[str, Optional[str]] = {}
+    connection.execute(f"CREATE SCHEMA IF NOT EXISTS {quote_identifier(schema)}")
+    connection.execute(f"CREATE TABLE {quote_identifier(schema)}.{quote_identifier(staging)} ()")
+
+    cursor = connection.connection.cursor()
+    try:
+        for frame in itertools.chain([first], frames):
+            frame, changes = align_frame(frame, kinds)
+            alter_staging(connection, schema, staging, kinds, changes)
+            for chunk in iter_slices(frame):
+                copy_frame(cursor, schema, staging, chunk)
+                rows += len(chunk)
+    finally:
+        cursor.close()
+
+    return rows, kinds
+
+
+def table_column_types(connection, schema: str, table_name: str) -> Dict[str, str]:
+    """
+    Returns the columns of a table and their Postgres types, in table order.
+
+    Args:
+        connection: The connection to query with.
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+
+    Returns:
+        Dict[str, str]: The type of each column, empty if the table does not exist.
+    """
+    result = connection.execute(
+        sqlalchemy.text(
+            "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = to_regclass(:name) AND attnum > 0 AND NOT attisdropped "
+            "ORDER BY attnum"
+        ),
+        name=f"{quote_identifier(schema)}.{quote_identifier(table_name)}",
+    )
+    return {name: column_type for name, column_type in result}
+
+
+def widen_table(
+    connection,
+    schema: str,
+    table_name: str,
+    column_types: Dict[str, str],
+    kinds: Dict[str, Optional[str]],
+    columns: Iterable[str],
+):
+    """
+    Widens the columns of a table that can not hold the values of the staging
+    columns of the same name, and updates their types in `column_types`.
+
+    Args:
+        connection: The connection of the load transaction.
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+        column_types (Dict[str, str]): The type of each column of the table, as returned by `table_column_types`.
+        kinds (Dict[str, str]): The kind of each column of the staging table.
+        columns (Iterable[str]): The columns to check.
+    """
+    clauses = []
+    for column in columns:
+        kind = POSTGRES_KINDS.get(column_types[column])
+        widened = widen_kind(kind, kinds[column])
+        if kind is None or widened == kind:
+            continue
+        column_type = COLUMN_TYPES[widened]
+        clauses.append(
+            f"ALTER COLUMN {quote_identifier(column)} TYPE {column_type} "
+            f"USING {quote_identifier(column)}::{column_type}"
+        )
+        column_types[column] = column_type.lower()
+    if clauses:
+        connection.execute(
+            f"ALTER TABLE {quote_identifier(schema)}.{quote_identifier(table_name)} {', '.join(clauses)}"
+        )
+
+
+def copy_rows_by_column(
+    connection,
+    schema: str,
+    source: str,
+    target: str,
+    column: str,
+    values: Iterable[str],
+) -> int:
+    """
+    Copies the rows of one table whose `column` is one of `values` into
+    another, e.g. the rows of the live table into a staging table.
+
+    Only the columns both tables have are copied. Columns of the target are
+    widened first when they can not hold the values of the source.
+
+    Args:
+        connection: The connection of the load transaction.
+        schema (str): The schema of both tables.
+        source (str): The table to copy rows from.
+        target (str): The table to copy rows into.
+        column (str): The column the rows are selected by, compared as text.
+        values (Iterable[str]): The values of `column` to copy the rows of.
+
+    Returns:
+        int: The number of rows copied, 0 if either table lacks `column`.
+    """
+    values = [str(value) for value in values]
+    source_types = table_column_types(connection, schema, source)
+    target_types = table_column_types(connection, schema, target)
+    if not values or column not in source_types or column not in target_types:
+        return 0
+
+    columns = [name for name in target_types if name in source_types]
+    widen_table(
+        connection,
+        schema,
+        target,
+        target_types,
+        {name: POSTGRES_KINDS.get(source_types[name], "text") for name in columns},
+        columns,
+    )
+    quoted = ", ".join(quote_identifier(name) for name in columns)
+    casts = ", ".join(
+        f"CAST({quote_identifier(name)} AS {target_types[name]})" for name in columns
+    )
+    return connection.execute(
+        sqlalchemy.text(
+            f"INSERT INTO {quote_identifier(schema)}.{quote_identifier(target)} ({quoted}) "
+            f"SELECT {casts} FROM {quote_identifier(schema)}.{quote_identifier(source)} "
+            f"WHERE CAST({quote_identifier(column)} AS TEXT) IN :values"
+        ).bindparams(sqlalchemy.bindparam("values", expanding=True)),
+        values=values,
+    ).rowcount
+
+
+def table_exists(schema: str, table_name: str) -> bool:
+    """
+    Whether a table exists.
+
+    Args:
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+
+    Returns:
+        bool: True if the table exists.
+    """
+    with engine.connect() as connection:
+        return bool(table_column_types(connection, schema, table_name))
+
+
+def upsert_frames_to_db(
+    schema: str,
+    table_name: str,
+    frames: Iterable[pd.DataFrame],
+    value_columns: Iterable[str],
+    before_merge: Optional[Callable] = None,
+) -> int:
+    """
+    Loads a stream of DataFrames into an existing table, replacing the rows
+    that have the same natural key.
+
+    Every column that is not a value column is part of the natural key, e.g.
+    the date, the dimensions and the ad account. The rows are copied into a
+    staging table first, then in one transaction the rows of the table whose
+    key is in the staging table are deleted and the staging rows inserted.
+    Columns of the staging table that the table does not have are dropped,
+    and columns of the table are widened when the new rows need it, e.g. to
+    floats when a metric that was integers so far has decimals.
+    If the table does not exist yet, it is created as by `copy_frames_to_db`.
+
+    Args:
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+        frames (Iterable[pd.DataFrame]): The frames holding the new rows.
+        value_columns (Iterable[str]): The columns that are not part of the natural key, e.g. the metrics.
+        before_merge (Callable, optional): Called with the connection, schema and staging table name once all rows are copied, before the merge.
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    frames = iter(frames)
+    first = next(frames, None)
+    if first is None:
+        return 0
+
+    with engine.connect() as connection:
+        target_types = table_column_types(connection, schema, table_name)
+    if not target_types:
+        return copy_frames_to_db(
+            schema, table_name, itertools.chain([first], frames), before_swap=before_merge
+        )
+
+    staging = staging_table_name(table_name)
+    value_columns = set(value_columns)
+    target = f"{quote_identifier(schema)}.{quote_identifier(table_name)}"
+    source = f"{quote_identifier(schema)}.{quote_identifier(staging)}"
+
+    with engine.begin() as connection:
+        rows, kinds = copy_to_staging(connection, schema, staging, first, frames)
+
+        if before_merge is not None:
+            before_merge(connection, schema, staging)
+
+        columns = [column for column in kinds if column in target_types]
+        widen_table(connection, schema, table_name, target_types, kinds, columns)
+        key_columns = [column for column in columns if column not in value_columns]
+        if not key_columns:
+            raise ValueError(f"{table_name} has no key columns to upsert by.")
+
+        # Keys are compared as text, with NULL_MARKER standing in for NULL so
+        # that the comparison is a plain equality Postgres can hash join on.
+        # COPY reads NULL_MARKER as NULL, so it never occurs as a value.
+        def key(alias: str) -> str:
+            return ", ".join(
+                f"COALESCE(CAST({alias}.{quote_identifier(column)} AS TEXT), '{NULL_MARKER}')"
+                for column in key_columns
+            )
+
+        connection.execute(
+            f"DELETE FROM {target} AS t USING {source} AS s "
+            f"WHERE ({key('t')}) = ({key('s')})"
+        )
+        quoted = ", ".join(quote_identifier(column) for column in columns)
+        casts = ", ".join(
+            f"CAST({quote_identifier(column)} AS {target_types[column]})" for column in columns
+        )
+        connection.execute(f"INSERT INTO {target} ({quoted}) SELECT {casts} FROM {source}")
+        connection.execute(f"DROP TABLE {source}")
+    bump_table_version(schema, table_name)
+
+    return rows
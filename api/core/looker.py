@@ -2,7 +2,7 @@ from fastapi import HTTPException
 
 from api.core.static_data import LookerFieldType, FieldType
 from api.models.looker import LookerField
-from api.core.data import all_fields
+from api.core.field_catalog import field_catalog
 
 
 postgres_to_looker_mapping = {
@@ -107,17 +107,10 @@ def get_looker_fields(schema: dict):
                 field_type=FieldType.dimension,
             )
             looker_fields.append(looker_field)
+            continue
 
-
-        else:
-            matches = [
-                channel_field
-                for channel_field in all_fields
-                if channel_field.alt_value == field
-            ]
-        
-        if matches:
-            matching_field = matches[0]
+        matching_field = field_catalog.by_alt_value(field)
+        if matching_field is not None:
             looker_field = LookerField(
                 id=field,
                 name=matching_field.label,
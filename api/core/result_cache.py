@@ -0,0 +1,275 @@
+from collections import defaultdict
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+import sqlalchemy
+from starlette.responses import Response
+
+from api.config import Config
+from api.database.database import engine
+from api.utilities.cache import LRUCache
+from api.utilities.responses import json_body
+
+RESULT_CACHE_MAX_BYTES = int(Config.RESULT_CACHE_MAX_BYTES)
+# Bounds how long results of tables changed outside the API, e.g. by Airbyte
+# syncs, can be served after the change.
+RESULT_CACHE_TTL = float(Config.RESULT_CACHE_TTL)
+
+# Results larger than a quarter of the budget are not kept, so that one large
+# result can not flush every other.
+result_cache = LRUCache(
+    "query_results",
+    max_bytes=RESULT_CACHE_MAX_BYTES,
+    ttl=RESULT_CACHE_TTL,
+    max_value_bytes=RESULT_CACHE_MAX_BYTES // 4,
+)
+
+# String literals and quoted identifiers.
+QUOTED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"")
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+IDENTIFIER = re.compile(r"[A-Za-z_][\w$]*|\"(?:[^\"]|\"\")*\"")
+# An identifier followed by a dot, e.g. the schema of schema."table".
+QUALIFIER = re.compile(r"(\"(?:[^\"]|\"\")*\"|[A-Za-z_][\w$]*)\s*\.\s*(?=[\"A-Za-z_])")
+READ_STATEMENT = re.compile(r"\s*(select|with|table|values)\b", re.IGNORECASE)
+# Keywords of statements and clauses that write, or may write, to the database.
+WRITE_KEYWORDS = re.compile(
+    r"\b(insert|update|delete|merge|into|create|drop|alter|truncate|grant|revoke"
+    r"|copy|call|lock|refresh|nextval|setval)\b",
+    re.IGNORECASE,
+)
+# Unqualified tables are looked up in the default search path.
+DEFAULT_SCHEMA = "public"
+
+_lock = threading.Lock()
+# Bumped whenever a table is replaced or upserted into by the loader.
+_table_versions: Dict[Tuple[str, str], int] = defaultdict(int)
+# Bumped whenever any table of the schema changes.
+_schema_versions: Dict[str, int] = defaultdict(int)
+# Bumped when a query of unknown scope may have written to the schema.
+_schema_epochs: Dict[str, int] = defaultdict(int)
+
+
+def bump_table_version(schema: str, table_name: str):
+    """
+    Marks a table as changed, so cached results read from it are no longer
+    served. Called once the change is committed.
+
+    Args:
+        schema (str): The schema of the table.
+        table_name (str): The name of the table.
+    """
+    schema = schema.lower()
+    with _lock:
+        _table_versions[(schema, table_name)] += 1
+        _schema_versions[schema] += 1
+
+
+def bump_schema_version(schema: str):
+    """
+    Marks every table of a schema as changed.
+
+    Args:
+        schema (str): The schema, as returned by `query_schemas`.
+    """
+    with _lock:
+        _schema_versions[schema] += 1
+        _schema_epochs[schema] += 1
+
+
+def table_versions(tables: Iterable[Tuple[str, str]]) -> Tuple:
+    keys = {(schema.lower(), table_name) for schema, table_name in tables}
+    with _lock:
+        return tuple(
+            sorted(
+                (
+                    schema,
+                    table_name,
+                    _table_versions.get((schema, table_name), 0),
+                    _schema_epochs.get(schema, 0),
+                )
+                for schema, table_name in keys
+            )
+        )
+
+
+def schema_versions(schemas: Iterable[str]) -> Tuple:
+    with _lock:
+        return tuple(sorted((schema, _schema_versions.get(schema, 0)) for schema in set(schemas)))
+
+
+def plain_identifiers(*names: Optional[str]) -> bool:
+    """
+    Whether every name interpolated into a generated query is a single plain or
+    quoted identifier, so the query reads only the tables it was built for.
+
+    Args:
+        names (str, optional): The names, None for names that are not used.
+
+    Returns:
+        bool: True if the query can be keyed on its known tables.
+    """
+    return all(name is None or IDENTIFIER.fullmatch(name) for name in names)
+
+
+def has_ambiguous_quoting(query: str) -> bool:
+    """
+    Whether a query may contain comments, dollar quoted or escaped strings,
+    which can hide quotes from QUOTED so that it misreads which parts of the
+    query are literals.
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        bool: True if the query can only be handled as opaque text.
+    """
+    return "--" in query or "/*" in query or "\\" in query or "$" in query
+
+
+def normalise_query(query: str) -> str:
+    """
+    Collapses the whitespace of a query outside its literals and quoted
+    identifiers, so that queries differing only in layout share cache entries.
+
+    Queries with comments, dollar quotes or backslashes, whose literals can
+    not be told apart reliably, are returned as they are.
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        str: The normalised query.
+    """
+    if has_ambiguous_quoting(query):
+        return query
+    parts = []
+    last = 0
+    for match in QUOTED.finditer(query):
+        parts.append(re.sub(r"\s+", " ", query[last:match.start()]))
+        parts.append(match.group())
+        last = match.end()
+    parts.append(re.sub(r"\s+", " ", query[last:]))
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def query_schemas(query: str) -> Set[str]:
+    """
+    Returns every schema a query may read from or write to: each identifier it
+    qualifies a name with, and the default schema. Column qualifiers such as
+    table.column are returned as well, which only costs an unused version.
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        Set[str]: The schema names, folded to lower case unless quoted.
+    """
+    schemas = {DEFAULT_SCHEMA}
+    # Literals are only skipped when they can be told apart reliably, names
+    # in a literal otherwise only cost an unused version.
+    if not has_ambiguous_quoting(query):
+        query = STRING_LITERAL.sub("''", query)
+    for match in QUALIFIER.finditer(query):
+        name = match.group(1)
+        if name.startswith('"'):
+            schemas.add(name[1:-1].replace('""', '"'))
+        else:
+            schemas.add(name.lower())
+    return schemas
+
+
+def is_read_query(query: str) -> bool:
+    """
+    Whether a query is a single statement that can only read.
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        bool: True for a single SELECT, WITH, TABLE or VALUES statement without writing clauses, False if that can not be told.
+    """
+    if has_ambiguous_quoting(query):
+        return False
+    unquoted = QUOTED.sub("''", query).strip().rstrip(";")
+    return (
+        READ_STATEMENT.match(unquoted) is not None
+        and ";" not in unquoted
+        and WRITE_KEYWORDS.search(unquoted) is None
+    )
+
+
+def execute_query(query: str) -> Tuple[List[str], List[Any]]:
+    """
+    Runs a query and fetches all of its rows.
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        Tuple[List[str], List[Any]]: The column names and the rows.
+
+    Raises:
+        HTTPException: If the query is invalid.
+    """
+    connection = engine.connect()
+    try:
+        results = connection.execute(query)
+        columns = list(results.keys())
+        rows = results.all()
+    except sqlalchemy.exc.ProgrammingError as e:
+        error_msg = str(e)
+        print(error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    finally:
+        connection.close()
+    return columns, rows
+
+
+def query_response(
+    query: str,
+    build: Callable[[List[str], List[Any]], BaseModel],
+    tables: Optional[Iterable[Tuple[str, str]]] = None,
+) -> Response:
+    """
+    Runs a query and returns its results as a JSON response, served from the
+    result cache while the tables it reads are unchanged.
+
+    The cache key is the normalised query and the versions of the tables it
+    reads: the given `tables`, or for arbitrary SQL the versions of every
+    schema it names. Versions are bumped by the loader once a reload or sync
+    is committed, so a result cached before the change is never served after
+    it. Concurrent identical misses run the query once. Queries that may write
+    are never cached, and bump every schema they name once run.
+
+    Args:
+        query (str): The SQL query.
+        build (Callable): Builds the response model from the column names and rows.
+        tables (Iterable[Tuple[str, str]], optional): The (schema, table) pairs the query reads, when known.
+
+    Returns:
+        Response: The JSON response.
+
+    Raises:
+        HTTPException: If the query is invalid.
+    """
+    if tables is not None:
+        versions = table_versions(tables)
+    else:
+        schemas = query_schemas(query)
+        if not is_read_query(query):
+            try:
+                body = json_body(build(*execute_query(query)))
+            finally:
+                for schema in schemas:
+                    bump_schema_version(schema)
+            return Response(content=body, media_type="application/json")
+        versions = schema_versions(schemas)
+
+    body = result_cache.get_or_load(
+        (normalise_query(query), versions),
+        lambda: json_body(build(*execute_query(query))),
+    )
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,288 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from api.config import Config
+from api.core.static_data import ChannelType
+from api.core.sync import submit_sync_job
+from api.database.crud import get_user_by_id
+from api.database.database import session
+from api.database.models import DataSourceDB
+
+SCHEDULER_ENABLED = Config.SCHEDULER_ENABLED.lower() == "true"
+
+# The user column holding the token each channel is fetched with.
+CHANNEL_TOKENS = {
+    ChannelType.google: "google_refresh_token",
+    ChannelType.google_video: "google_refresh_token",
+    ChannelType.google_analytics: "google_analytics_refresh_token",
+    ChannelType.facebook: "facebook_access_token",
+    ChannelType.youtube: "youtube_refresh_token",
+    ChannelType.instagram_media: "instagram_access_token",
+    ChannelType.instagram_account: "instagram_access_token",
+}
+
+
+def list_refreshable_data_sources() -> List[DataSourceDB]:
+    """
+    Returns the data sources the scheduler keeps fresh: those loaded by the
+    API rather than Airbyte, that have finished their first load and can be
+    synced.
+
+    Returns:
+        List[DataSourceDB]: The data sources.
+    """
+    try:
+        data_sources = (
+            session.query(DataSourceDB)
+            .filter(
+                DataSourceDB.airbyte_connection_id.is_(None),
+                DataSourceDB.load_completed.is_(True),
+                DataSourceDB.ad_accounts.isnot(None),
+            )
+            .all()
+        )
+    except BaseException as e:
+        print(e)
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+        session.remove()
+    return data_sources
+
+
+class ScheduledSource:
+    """
+    A data source in the refresh queue.
+    """
+
+    def __init__(self, data_source_row: DataSourceDB, interval: timedelta, due_at: datetime):
+        self.data_source_row = data_source_row
+        self.interval = interval
+        self.due_at = due_at
+        self.running = False
+        self.started_at: Optional[datetime] = None
+        self.last_job_id: Optional[int] = None
+        self.last_skipped: Optional[str] = None
+
+    @property
+    def channel(self) -> str:
+        return self.data_source_row.channel
+
+
+class RefreshScheduler:
+    """
+    Syncs data sources on a background thread, every `interval_hours` unless
+    the data source sets its own `refresh_interval_hours`.
+
+    Due times are spread by a random jitter of up to `jitter_minutes`, so data
+    sources added or synced together do not all come due at once, and data
+    sources already overdue when the scheduler starts are spread over the
+    first jitter window. At most `max_running` scheduled syncs are queued or
+    running at once, and at most `platform_limit` per platform; due data
+    sources over a limit wait for the next poll. Data sources whose owner has
+    cleared the token of their channel are skipped until their next due time.
+    """
+
+    def __init__(
+        self,
+        interval_hours: float,
+        jitter_minutes: float,
+        max_running: int,
+        platform_limit: int,
+        poll_seconds: float,
+        reload_seconds: float,
+    ):
+        self.interval = timedelta(hours=interval_hours)
+        self.jitter = timedelta(minutes=jitter_minutes)
+        self.max_running = max_running
+        self.platform_limit = platform_limit
+        self.poll_seconds = poll_seconds
+        self.reload_seconds = reload_seconds
+        self._sources: Dict[int, ScheduledSource] = {}
+        self._running_by_platform: Dict[str, int] = defaultdict(int)
+        self._started = 0
+        self._skipped = 0
+        self._reloaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Refresh scheduler tick failed. {e}")
+            self._stop.wait(self.poll_seconds)
+
+    def _jitter(self, interval: timedelta) -> timedelta:
+        jitter = min(self.jitter, interval / 2)
+        return jitter * random.uniform(-1, 1)
+
+    def _interval(self, data_source_row: DataSourceDB) -> Optional[timedelta]:
+        hours = data_source_row.refresh_interval_hours
+        if hours is None:
+            return self.interval
+        if hours <= 0:
+            return None
+        return timedelta(hours=hours)
+
+    def reload(self, now: datetime):
+        """
+        Brings the queue in line with the data sources in the database.
+
+        Args:
+            now (datetime): The current time.
+        """
+        rows = list_refreshable_data_sources()
+        seen = set()
+        with self._lock:
+            for row in rows:
+                interval = self._interval(row)
+                if interval is None:
+                    continue
+                seen.add(row.id)
+                source = self._sources.get(row.id)
+                if source is not None:
+                    source.data_source_row = row
+                    source.interval = interval
+                    continue
+                due_at = (row.synced_until or now) + interval + self._jitter(interval)
+                if due_at <= now:
+                    due_at = now + self.jitter * random.random()
+                self._sources[row.id] = ScheduledSource(row, interval, due_at)
+
+            for data_source_id in list(self._sources):
+                if data_source_id not in seen and not self._sources[data_source_id].running:
+                    del self._sources[data_source_id]
+        self._reloaded_at = time.monotonic()
+
+    def tick(self, now: Optional[datetime] = None):
+        """
+        Starts the syncs of due data sources, oldest due time first, within
+        the global and per platform limits.
+
+        Args:
+            now (datetime, optional): The current time.
+        """
+        now = now or datetime.now()
+        if self._reloaded_at is None or time.monotonic() - self._reloaded_at >= self.reload_seconds:
+            self.reload(now)
+
+        with self._lock:
+            due = sorted(
+                (
+                    source
+                    for source in self._sources.values()
+                    if not source.running and source.due_at <= now
+                ),
+                key=lambda source: source.due_at,
+            )
+
+        for source in due:
+            with self._lock:
+                running = sum(self._running_by_platform.values())
+                if running >= self.max_running:
+                    return
+                if self._running_by_platform[source.channel] >= self.platform_limit:
+                    continue
+                source.running = True
+                self._running_by_platform[source.channel] += 1
+            self._start(source, now)
+
+    def _start(self, source: ScheduledSource, now: datetime):
+        data_source_row = source.data_source_row
+        try:
+            token = CHANNEL_TOKENS.get(ChannelType(data_source_row.channel))
+            user = get_user_by_id(data_source_row.user_id)
+            if user is None or (token is not None and not getattr(user, token)):
+                self._finish(source, skipped="Token cleared.")
+                return
+            job = submit_sync_job(data_source_row, on_done=lambda: self._finish(source))
+        except Exception as e:
+            print(f"Could not schedule sync of data source {data_source_row.id}. {e}")
+            self._finish(source, skipped=str(e))
+            return
+
+        with self._lock:
+            source.started_at = now
+            source.last_job_id = job.id
+            source.last_skipped = None
+            self._started += 1
+
+    def _finish(self, source: ScheduledSource, skipped: Optional[str] = None):
+        with self._lock:
+            source.running = False
+            self._running_by_platform[source.channel] -= 1
+            if not self._running_by_platform[source.channel]:
+                del self._running_by_platform[source.channel]
+            source.due_at = datetime.now() + source.interval + self._jitter(source.interval)
+            if skipped is not None:
+                source.last_skipped = skipped
+                self._skipped += 1
+
+    def stats(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Returns the refresh queue, ordered by due time, and how far behind it is.
+
+        Args:
+            now (datetime, optional): The current time.
+
+        Returns:
+            dict: The queue and its counters.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            sources = sorted(self._sources.values(), key=lambda source: source.due_at)
+            queue = [
+                {
+                    "data_source_id": source.data_source_row.id,
+                    "user_id": source.data_source_row.user_id,
+                    "channel": source.channel,
+                    "interval_hours": source.interval.total_seconds() / 3600,
+                    "synced_until": source.data_source_row.synced_until,
+                    "due_at": source.due_at,
+                    "lag_seconds": max((now - source.due_at).total_seconds(), 0.0),
+                    "running": source.running,
+                    "started_at": source.started_at,
+                    "last_job_id": source.last_job_id,
+                    "last_skipped": source.last_skipped,
+                }
+                for source in sources
+            ]
+            waiting = [item for item in queue if not item["running"] and item["lag_seconds"] > 0]
+            return {
+                "enabled": self._thread is not None,
+                "scheduled": len(queue),
+                "running": sum(self._running_by_platform.values()),
+                "running_by_platform": dict(self._running_by_platform),
+                "due": len(waiting),
+                "max_lag_seconds": max((item["lag_seconds"] for item in waiting), default=0.0),
+                "started": self._started,
+                "skipped": self._skipped,
+                "queue": queue,
+            }
+
+
+refresh_scheduler = RefreshScheduler(
+    interval_hours=float(Config.SCHEDULER_INTERVAL_HOURS),
+    jitter_minutes=float(Config.SCHEDULER_JITTER_MINUTES),
+    max_running=int(Config.SCHEDULER_MAX_RUNNING),
+    platform_limit=int(Config.SCHEDULER_PLATFORM_LIMIT),
+    poll_seconds=float(Config.SCHEDULER_POLL_SECONDS),
+    reload_seconds=float(Config.SCHEDULER_RELOAD_SECONDS),
+)
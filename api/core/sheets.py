@@ -1,6 +1,6 @@
 from fastapi import HTTPException
 import json
-import requests
+from api.utilities.http import http_client
 import sqlalchemy
 
 from api.database.database import engine, session
@@ -28,7 +28,7 @@ def create_sheet(access_token: str, title: str):
         }
     )
 
-    response = requests.post(url, headers=headers, data=body)
+    response = http_client.post(url, headers=headers, data=body)
 
     return response
 
@@ -69,7 +69,7 @@ def write_values(token: str, spreadsheet_id: str, schema: str, name: str):
         }
     )
 
-    response = requests.post(
+    response = http_client.post(
         url, headers={"Authorization": f"Bearer {token}"}, data=body
     )
 
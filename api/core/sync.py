@@ -0,0 +1,241 @@
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from typing import Callable, List, Optional, Set, Tuple
+
+from api.config import Config
+from api.core.data import (
+    delete_failed_account_rows,
+    iter_data_source_frames,
+    keep_failed_account_rows,
+)
+from api.core.field_catalog import DATE_FIELD_VALUES
+from api.core.jobs import JobProgress, submit_job
+from api.core.loader import copy_frames_to_db, upsert_frames_to_db
+from api.core.static_data import FieldType, JobKind, JobPhase
+from api.core.views import refresh_dependent_views
+from api.database.crud import get_data_sources_by_id, get_user_by_id
+from api.database.database import session
+from api.database.models import DataSourceDB, JobDB, UserDB
+from api.models.connector import AdAccount
+from api.models.data import DataSource, FieldOption
+from api.models.user import User
+
+# Days before the last synced day that are fetched again on every sync, so that
+# conversions attributed late to earlier days are picked up.
+SYNC_LOOKBACK_DAYS = int(Config.SYNC_LOOKBACK_DAYS)
+
+
+def sync_date_range(
+    data_source_row: DataSourceDB, now: datetime, full: bool = False
+) -> Tuple[datetime, datetime, bool]:
+    """
+    Returns the date range the next sync of a data source fetches.
+
+    An incremental sync starts SYNC_LOOKBACK_DAYS before the high-water mark
+    of the data source, but never before its start date. Data sources that
+    have never been fully synced are refetched from their start date.
+
+    Args:
+        data_source_row (DataSourceDB): The data source.
+        now (datetime): The end of the sync.
+        full (bool, optional): Whether to refetch the whole date range.
+
+    Returns:
+        Tuple[datetime, datetime, bool]: The first and last day to fetch, and whether the sync is incremental.
+    """
+    synced_until = data_source_row.synced_until
+    if full or synced_until is None:
+        return data_source_row.start_date, now, False
+    start_date = max(
+        synced_until - timedelta(days=SYNC_LOOKBACK_DAYS), data_source_row.start_date
+    )
+    return start_date, now, True
+
+
+def user_from_db(db_user: UserDB) -> User:
+    return User(**{name: getattr(db_user, name) for name in User.__fields__})
+
+
+def data_source_from_row(
+    data_source_row: DataSourceDB,
+    user: User,
+    start_date: datetime,
+    end_date: datetime,
+    incremental: bool,
+) -> DataSource:
+    """
+    Rebuilds the data source a table was loaded from, for a new date range.
+
+    Args:
+        data_source_row (DataSourceDB): The saved data source.
+        user (User): The owner of the data source, whose tokens are used.
+        start_date (datetime): The first day to fetch.
+        end_date (datetime): The last day to fetch.
+        incremental (bool): Whether the rows are upserted into the existing table.
+
+    Returns:
+        DataSource: The data source.
+
+    Raises:
+        HTTPException: If the data source was saved before its ad accounts and fields were kept.
+    """
+    if not data_source_row.ad_accounts or not data_source_row.field_options:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Data source {data_source_row.id} can not be synced, add it again to enable syncing.",
+        )
+    return DataSource(
+        name=data_source_row.name,
+        user=user,
+        fields=[FieldOption(**field) for field in data_source_row.field_options],
+        adAccounts=[AdAccount(**ad_account) for ad_account in data_source_row.ad_accounts],
+        start_date=start_date,
+        end_date=end_date,
+        window=data_source_row.date_window,
+        incremental=incremental,
+    )
+
+
+def has_date_dimension(fields: List[FieldOption]) -> bool:
+    return any(
+        field.type == FieldType.dimension and field.value in DATE_FIELD_VALUES
+        for field in fields
+    )
+
+
+def metric_columns(fields: List[FieldOption]) -> Set[str]:
+    """
+    Returns every column name a metric of the data source may be loaded as.
+
+    Args:
+        fields (List[FieldOption]): The fields of the data source.
+
+    Returns:
+        Set[str]: The metric column names.
+    """
+    columns = set()
+    for field in fields:
+        if field.type != FieldType.metric:
+            continue
+        columns.update([field.value, field.value.split(".")[-1]])
+        if field.alt_value:
+            columns.add(field.alt_value)
+    return columns
+
+
+def sync_data_source(data_source_id: int, full: bool, progress: JobProgress):
+    """
+    Fetches the new rows of a data source and loads them into its table.
+
+    Incremental syncs fetch from SYNC_LOOKBACK_DAYS before the high-water mark
+    until now and upsert the rows by their natural key, the date and
+    dimensions of the row and its ad account. Full syncs refetch the whole
+    date range and replace the table, as do syncs of data sources without a
+    date dimension, whose rows are totals over the whole range. The high-water mark only moves on when
+    every ad account was fetched, so failed accounts are caught up on the next
+    sync. Full syncs keep the rows of failed accounts from the table they
+    replace, so their history is not lost until then. Saved views blending the data source are then refreshed, only over
+    the synced days after an incremental sync.
+
+    Args:
+        data_source_id (int): The id of the data source.
+        full (bool): Whether to refetch the whole date range.
+        progress (JobProgress): The progress of the job.
+
+    Raises:
+        HTTPException: If the data source does not exist or could not be synced.
+    """
+    data_source_row = get_data_sources_by_id(data_source_id)
+    if data_source_row is None:
+        raise HTTPException(status_code=404, detail=f"Data source {data_source_id} not found.")
+    user = user_from_db(get_user_by_id(data_source_row.user_id))
+
+    data_source = data_source_from_row(
+        data_source_row, user, data_source_row.start_date, datetime.now(), incremental=False
+    )
+    full = full or not has_date_dimension(data_source.fields)
+    start_date, end_date, incremental = sync_date_range(data_source_row, data_source.end_date, full)
+    data_source.start_date = start_date
+    data_source.incremental = incremental
+
+    progress.start_phase(JobPhase.loading)
+    failures = []
+    frames = progress.count_rows(
+        iter_data_source_frames(data_source, failures, on_account_done=progress.account_done)
+    )
+    if incremental:
+        upsert_frames_to_db(
+            data_source_row.db_schema,
+            data_source_row.name,
+            frames,
+            metric_columns(data_source.fields),
+            before_merge=delete_failed_account_rows(failures),
+        )
+    else:
+        copy_frames_to_db(
+            data_source_row.db_schema,
+            data_source_row.name,
+            frames,
+            before_swap=keep_failed_account_rows(failures, data_source_row.name),
+        )
+    progress.errors = [
+        f"{result.ad_account.name or result.ad_account.id}: {result.error}"
+        for result in failures
+    ]
+
+    progress.start_phase(JobPhase.finalizing)
+    values = {"load_completed": True, "end_date": end_date}
+    if not failures:
+        values["synced_until"] = end_date
+    try:
+        session.query(DataSourceDB).filter(DataSourceDB.id == data_source_id).update(values)
+        session.commit()
+    except Exception as e:
+        print(e)
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not update sync state of data source {data_source_id}. {e}",
+        )
+    finally:
+        session.close()
+        session.remove()
+
+    if incremental:
+        refresh_dependent_views(data_source_id, start_date, end_date)
+    else:
+        refresh_dependent_views(data_source_id)
+
+
+def submit_sync_job(
+    data_source_row: DataSourceDB,
+    full: bool = False,
+    on_done: Optional[Callable[[], None]] = None,
+) -> JobDB:
+    """
+    Queues a sync of a data source on the job workers.
+
+    Args:
+        data_source_row (DataSourceDB): The data source to sync.
+        full (bool, optional): Whether to refetch the whole date range.
+        on_done (Callable, optional): Called on the job worker once the sync has finished, whether it failed or not.
+
+    Returns:
+        JobDB: The queued job.
+    """
+    data_source_id = data_source_row.id
+
+    def work(progress: JobProgress):
+        try:
+            sync_data_source(data_source_id, full, progress)
+        finally:
+            if on_done is not None:
+                on_done()
+
+    return submit_job(
+        data_source_row.user_id,
+        JobKind.sync_data_source,
+        work,
+        data_source_id=data_source_id,
+        accounts_total=len(data_source_row.ad_accounts or []),
+    )
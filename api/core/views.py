@@ -0,0 +1,301 @@
+from collections import defaultdict
+from datetime import datetime
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from api.core.data import airpipe_field_option, build_blend_query
+from api.core.field_catalog import DATE_FIELD_VALUES, field_catalog
+from api.core.loader import create_table_as, replace_rows_between
+from api.core.static_data import FieldType, JoinType
+from api.database.crud import (
+    get_data_source_by_name,
+    get_data_sources_by_id,
+    get_join_conditions_by_view_id,
+    get_view_by_id,
+    get_view_by_name,
+    get_views_by_data_source_id,
+)
+from api.database.database import session
+from api.database.models import DataSourceDB, JoinConditionDB, ViewDB
+from api.models.data import FieldOption, FieldOptionWithDataSourceId, JoinCondition
+
+# The join types whose rows all come from the left or the right table, so that
+# a date of that table is set on every row of the view.
+PRESERVED_SIDES = {
+    JoinType.inner: "left",
+    JoinType.left: "left",
+    JoinType.right: "right",
+}
+
+# Refreshes of a view run one at a time, so that refreshes triggered by syncs
+# of both its data sources do not insert the same rows twice.
+_view_locks: Dict[int, threading.Lock] = defaultdict(threading.Lock)
+_view_locks_lock = threading.Lock()
+
+
+def view_lock(view_id: int) -> threading.Lock:
+    with _view_locks_lock:
+        return _view_locks[view_id]
+
+
+def field_option(alt_value: str) -> FieldOption:
+    return field_catalog.by_alt_value(alt_value) or airpipe_field_option(alt_value)
+
+
+def is_date_field(alt_value: str) -> bool:
+    field = field_catalog.by_alt_value(alt_value)
+    return (
+        field is not None
+        and field.type == FieldType.dimension
+        and field.value in DATE_FIELD_VALUES
+    )
+
+
+class ViewDefinition:
+    """
+    The blend a saved view is materialised from, rebuilt from its join
+    conditions and the tables of its data sources.
+    """
+
+    def __init__(self, view_row: ViewDB, join_conditions: List[JoinConditionDB]):
+        if not join_conditions:
+            raise HTTPException(
+                status_code=400, detail=f"View {view_row.id} has no join conditions."
+            )
+        self.view_row = view_row
+        self.join_condition_rows = join_conditions
+        self.left = self._data_source(join_conditions[0].left_data_source_id)
+        self.right = self._data_source(join_conditions[0].right_data_source_id)
+
+        left_columns = set(self.left.fields.split(","))
+        right_columns = set(self.right.fields.split(","))
+        self.columns = view_row.fields.split(",")
+        self.fields: List[FieldOptionWithDataSourceId] = []
+        for column in self.columns:
+            if column in left_columns:
+                data_source_id = self.left.id
+            elif column in right_columns:
+                data_source_id = self.right.id
+            else:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{column} of view {view_row.id} is not a column of its data sources.",
+                )
+            self.fields.append(
+                FieldOptionWithDataSourceId(
+                    **field_option(column).dict(), data_source_id=data_source_id
+                )
+            )
+        self.join_conditions = [
+            JoinCondition(
+                left_field=field_option(condition.left_field),
+                right_field=field_option(condition.right_field),
+                join_type=JoinType(condition.join_type),
+                left_data_source_id=condition.left_data_source_id,
+                right_data_source_id=condition.right_data_source_id,
+            )
+            for condition in join_conditions
+        ]
+
+    @staticmethod
+    def _data_source(data_source_id: int) -> DataSourceDB:
+        data_source_row = get_data_sources_by_id(data_source_id)
+        if data_source_row is None:
+            raise HTTPException(
+                status_code=404, detail=f"Data source {data_source_id} not found."
+            )
+        return data_source_row
+
+    def date_column(self) -> Optional[Tuple[str, str]]:
+        """
+        Returns the date column incremental refreshes of the view replace rows
+        by, if the view can be refreshed by date.
+
+        That needs a single join on the dates of both data sources, so a row of
+        either table only affects rows of the view with the same date, and the
+        view has to select the date of the table every row of the join comes
+        from.
+
+        Returns:
+            Tuple[str, str], optional: The column of the view and the qualified column of its data source.
+        """
+        if len(self.join_condition_rows) != 1:
+            return None
+        condition = self.join_condition_rows[0]
+        side = PRESERVED_SIDES.get(JoinType(condition.join_type))
+        if side is None or not (
+            is_date_field(condition.left_field) and is_date_field(condition.right_field)
+        ):
+            return None
+        if side == "left":
+            column, table_name = condition.left_field, self.left.name
+        else:
+            column, table_name = condition.right_field, self.right.name
+        if column not in self.columns:
+            return None
+        return column, f'"{table_name}"."{column}"'
+
+    def query(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> str:
+        """
+        Builds the blend query of the view, the same query /create_blend runs.
+
+        Args:
+            start_date (datetime, optional): Only select rows from this date on, needs a date column.
+            end_date (datetime, optional): Only select rows up to this date, needs a date column.
+
+        Returns:
+            str: The SQL query.
+        """
+        date_column = self.date_column()
+        return build_blend_query(
+            fields=self.fields,
+            join_conditions=self.join_conditions,
+            # build_blend_query only reads the id, schema and name of the data sources.
+            left_data_source=self.left,
+            right_data_source=self.right,
+            date_column=date_column[1] if date_column is not None else None,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+
+def clamp_date_range(
+    view_row: ViewDB, start_date: datetime, end_date: datetime
+) -> Optional[Tuple[datetime, datetime]]:
+    if view_row.start_date is not None:
+        start_date = max(start_date, view_row.start_date)
+    if view_row.end_date is not None:
+        end_date = min(end_date, view_row.end_date)
+    if start_date > end_date:
+        return None
+    return start_date, end_date
+
+
+def refresh_view(
+    view_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> ViewDB:
+    """
+    Materialises a saved view into its table, db_schema."name", so that reads
+    of the view are plain table reads.
+
+    Given a date range, and if the view has been materialised before and can
+    be refreshed by date, only the rows of the view in that range are
+    replaced. Otherwise the whole table is rebuilt, limited to the date range
+    of the view when it has one.
+
+    Args:
+        view_id (int): The id of the view.
+        start_date (datetime, optional): The first day that changed in a data source of the view.
+        end_date (datetime, optional): The last day that changed in a data source of the view.
+
+    Returns:
+        ViewDB: The refreshed view.
+
+    Raises:
+        HTTPException: If the view or its data sources do not exist, its table belongs to another data source or view, or the view could not be materialised.
+    """
+    with view_lock(view_id):
+        return _refresh_view(view_id, start_date, end_date)
+
+
+def _refresh_view(
+    view_id: int, start_date: Optional[datetime], end_date: Optional[datetime]
+) -> ViewDB:
+    view_row = get_view_by_id(view_id)
+    if view_row is None:
+        raise HTTPException(status_code=404, detail=f"View {view_id} not found.")
+    # Views saved before names were checked may share their table with a data
+    # source or an older view, which materialising would replace.
+    if get_data_source_by_name(view_row.user_id, view_row.name) or (
+        get_view_by_name(view_row.user_id, view_row.name).id != view_id
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"The table {view_row.name} of view {view_id} belongs to another data source or view.",
+        )
+    definition = ViewDefinition(view_row, get_join_conditions_by_view_id(view_id))
+    date_column = definition.date_column()
+
+    incremental = (
+        start_date is not None
+        and end_date is not None
+        and date_column is not None
+        and view_row.materialized_at is not None
+        and view_row.refresh_date_column == date_column[0]
+    )
+    if incremental:
+        date_range = clamp_date_range(view_row, start_date, end_date)
+        if date_range is not None:
+            replace_rows_between(
+                view_row.db_schema,
+                view_row.name,
+                date_column[0],
+                date_range[0].strftime("%Y-%m-%d"),
+                date_range[1].strftime("%Y-%m-%d"),
+                definition.query(*date_range),
+            )
+    elif date_column is not None and view_row.start_date and view_row.end_date:
+        create_table_as(
+            view_row.db_schema,
+            view_row.name,
+            definition.query(view_row.start_date, view_row.end_date),
+        )
+    else:
+        create_table_as(view_row.db_schema, view_row.name, definition.query())
+
+    values = {
+        "materialized_at": datetime.now(),
+        "refresh_date_column": date_column[0] if date_column is not None else None,
+    }
+    try:
+        session.query(ViewDB).filter(ViewDB.id == view_id).update(values)
+        session.commit()
+    except Exception as e:
+        print(e)
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not update materialisation state of view {view_id}. {e}",
+        )
+    finally:
+        session.close()
+        session.remove()
+
+    for name, value in values.items():
+        setattr(view_row, name, value)
+    return view_row
+
+
+def refresh_dependent_views(
+    data_source_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[int]:
+    """
+    Refreshes every saved view that blends a data source, after its table was
+    reloaded or synced.
+
+    A failed view is logged and skipped, it does not fail the sync.
+
+    Args:
+        data_source_id (int): The id of the data source.
+        start_date (datetime, optional): The first day that changed, None if the whole table was replaced.
+        end_date (datetime, optional): The last day that changed, None if the whole table was replaced.
+
+    Returns:
+        List[int]: The ids of the views that were refreshed.
+    """
+    refreshed = []
+    for view_row in get_views_by_data_source_id(data_source_id):
+        try:
+            refresh_view(view_row.id, start_date, end_date)
+            refreshed.append(view_row.id)
+        except Exception as e:
+            print(f"Could not refresh view {view_row.id} of data source {data_source_id}. {e}")
+    return refreshed
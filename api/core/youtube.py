@@ -1,20 +1,22 @@
 from api.config import Config
 from api.models.user import User
 from api.models.youtube import YoutubeQuery
+from api.core.static_data import ChannelType
 from api.database.models import UserDB
 from api.database.database import session
 from api.core.google import get_access_token
 
 from datetime import datetime
 from fastapi import HTTPException
-import requests
-from typing import List
+from api.utilities.http import http_client
+from typing import Dict, Iterator
 
 REFRESH_ERROR = "Invalid refresh token"
 
 GOOGLE_CLIENT_ID = Config.GOOGLE_CLIENT_ID
 GOOGLE_CLIENT_SECRET = Config.GOOGLE_CLIENT_SECRET
 GOOGLE_ADS_DEVELOPER_TOKEN = Config.GOOGLE_ADS_DEVELOPER_TOKEN
+YOUTUBE_PAGE_SIZE = int(Config.YOUTUBE_PAGE_SIZE)
 
 
 def handleGoogleTokenException(ex, current_user: User):
@@ -49,9 +51,20 @@ def handleGoogleTokenException(ex, current_user: User):
         )
 
 
-def fetch_youtube_data(
+def iter_youtube_pages(
     current_user: User, query: YoutubeQuery
-) -> List[object]:
+) -> Iterator[Dict[str, list]]:
+    """
+    Pages through a YouTube Analytics report with maxResults and startIndex and
+    yields every page as column arrays rather than one dict per row.
+
+    Args:
+        current_user (User): The user whose refresh token is used.
+        query (YoutubeQuery): The channel, metrics, dimensions and date range to fetch.
+
+    Yields:
+        Dict[str, list]: The values of each column of the next page, keyed by column name.
+    """
     access_token = get_access_token(current_user.youtube_refresh_token)
     url = f"https://youtubeanalytics.googleapis.com/v2/reports"
     params = {
@@ -60,30 +73,36 @@ def fetch_youtube_data(
         'endDate': query.end_date.strftime("%Y-%m-%d"),
         'metrics': ','.join(query.metrics),
         'dimensions': ','.join(query.dimensions),
+        'maxResults': YOUTUBE_PAGE_SIZE,
+        'startIndex': 1,
     }
     headers = {
         "Authorization": f"Bearer {access_token}",
         "developer-token": GOOGLE_ADS_DEVELOPER_TOKEN,
     }
-    response = requests.get(url, headers=headers, params=params)
-    data = []
 
-    if response.status_code == 200:
+    while True:
+        response = http_client.get(
+            url,
+            headers=headers,
+            params=params,
+            platform=ChannelType.youtube,
+            account=query.account_id,
+        )
+        if response.status_code != 200:
+            print(response.text)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Could not get youtube data. {response.text}",
+            )
+
         results = response.json()
         # Extract column names from the columnHeaders
         column_names = [header['name'] for header in results['columnHeaders']]
+        rows = results.get('rows', [])
+        if rows:
+            yield {name: list(values) for name, values in zip(column_names, zip(*rows))}
 
-        # Iterate over each row in the 'rows' array
-        for row in results['rows']:
-            # Create a dictionary for each row
-            row_dict = {column_names[i]: row[i] for i in range(len(column_names))}
-            # Append the dictionary to the parsed_data list
-            data.append(row_dict)
-    else:
-        print(response.text)
-        raise HTTPException(
-            status_code=response.status_code,
-            detail=f"Could not get youtube data. {response.text}",
-        )
-
-    return data
\ No newline at end of file
+        if len(rows) < YOUTUBE_PAGE_SIZE:
+            return
+        params['startIndex'] += len(rows)
@@ -1,5 +1,5 @@
 from api.database.database import session
-from api.database.models import UserDB, DataSourceDB, ViewDB, ChartDB
+from api.database.models import UserDB, DataSourceDB, ViewDB, ChartDB, JoinConditionDB
 from api.models.user import User
 
 from typing import List
@@ -34,6 +34,20 @@ def get_user_by_email(email: str) -> UserDB:
         return user
     
 
+def get_user_by_id(user_id: int) -> UserDB:
+    try:
+        user = session.query(UserDB).filter(UserDB.id == user_id).first()
+    except BaseException as e:
+        print(e)
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+        session.remove()
+    if user:
+        return user
+
+
 def get_all_users() -> List[UserDB]:
     try:
         users = session.query(UserDB).all()
@@ -143,4 +157,76 @@ def get_chart_by_chart_id(chart_id) -> ChartDB:
         session.close()
         session.remove()
     if chart:
-        return chart
\ No newline at end of file
+        return chart
+
+
+def get_join_conditions_by_view_id(view_id: int) -> List[JoinConditionDB]:
+    try:
+        join_conditions = (
+            session.query(JoinConditionDB)
+            .filter(JoinConditionDB.view_id == view_id)
+            .order_by(JoinConditionDB.condition_id)
+            .all()
+        )
+    except BaseException as e:
+        print(e)
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+        session.remove()
+    return join_conditions
+
+
+def get_views_by_data_source_id(data_source_id: int) -> List[ViewDB]:
+    try:
+        views = (
+            session.query(ViewDB)
+            .join(JoinConditionDB, JoinConditionDB.view_id == ViewDB.id)
+            .filter(
+                (JoinConditionDB.left_data_source_id == data_source_id)
+                | (JoinConditionDB.right_data_source_id == data_source_id)
+            )
+            .distinct()
+            .all()
+        )
+    except BaseException as e:
+        print(e)
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+        session.remove()
+    return views
+
+
+def get_data_source_by_name(user_id: int, name: str) -> DataSourceDB:
+    try:
+        data_source = (
+            session.query(DataSourceDB)
+            .filter(DataSourceDB.user_id == user_id, DataSourceDB.name == name)
+            .first()
+        )
+    except BaseException as e:
+        print(e)
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+        session.remove()
+    if data_source:
+        return data_source
+
+
+def get_view_by_name(user_id: int, name: str) -> ViewDB:
+    try:
+        view = session.query(ViewDB).filter(ViewDB.user_id == user_id, ViewDB.name == name).first()
+    except BaseException as e:
+        print(e)
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+        session.remove()
+    if view:
+        return view
@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import String, Column, Integer, Boolean, DateTime, Date
+from sqlalchemy import String, Column, Integer, Boolean, DateTime, Date, JSON
 
 from api.database.database import Base
 
@@ -46,10 +46,36 @@ class DataSourceDB(Base):
     airbyte_source_id = Column(String(), nullable=True)
     airbyte_connection_id = Column(String(), nullable=True)
     load_completed = Column(Boolean(), nullable=True, default=False)
+    ad_accounts = Column(JSON(), nullable=True)
+    field_options = Column(JSON(), nullable=True)
+    date_window = Column(String(), nullable=True)
+    synced_until = Column(DateTime(), nullable=True)
+    refresh_interval_hours = Column(Integer(), nullable=True)
 
     created_at = Column(DateTime(), default=datetime.datetime.now())
 
 
+class JobDB(Base):
+    __tablename__ = "jobs"
+    __table_args__ = {"schema": "public"}
+
+    id = Column(Integer(), primary_key=True)
+    user_id = Column(Integer(), index=True)
+    data_source_id = Column(Integer(), nullable=True)
+    kind = Column(String())
+    status = Column(String())
+    phase = Column(String())
+    accounts_total = Column(Integer(), default=0)
+    accounts_fetched = Column(Integer(), default=0)
+    rows_loaded = Column(Integer(), default=0)
+    timings = Column(JSON(), nullable=True)
+    errors = Column(JSON(), nullable=True)
+    error = Column(String(), nullable=True)
+    created_at = Column(DateTime(), default=datetime.datetime.now)
+    started_at = Column(DateTime(), nullable=True)
+    finished_at = Column(DateTime(), nullable=True)
+
+
 class ConversationsDB(Base):
     __tablename__ = "conversations"
     __table_args__ = {"schema": "public"}
@@ -76,6 +102,11 @@ class ViewDB(Base):
     start_date = Column(DateTime(), nullable=True)
     end_date = Column(DateTime(), nullable=True)
     created_at = Column(DateTime(), default=datetime.datetime.now())
+    # When the view was last materialised into its table, None if it never was.
+    materialized_at = Column(DateTime(), nullable=True)
+    # The date column of the view whose rows incremental refreshes replace,
+    # None if the view can only be refreshed in full.
+    refresh_date_column = Column(String(), nullable=True)
 
 
 class JoinConditionDB(Base):
@@ -84,9 +115,9 @@ class JoinConditionDB(Base):
 
     id = Column(Integer(), primary_key=True)
     condition_id = Column(Integer())
-    view_id = Column(Integer())
-    left_data_source_id = Column(Integer())
-    right_data_source_id = Column(Integer())
+    view_id = Column(Integer(), index=True)
+    left_data_source_id = Column(Integer(), index=True)
+    right_data_source_id = Column(Integer(), index=True)
     left_field = Column(String())
     right_field = Column(String())
     join_type = Column(String())
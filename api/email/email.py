@@ -1,4 +1,4 @@
-import requests
+from api.utilities.http import http_client
 from fastapi import HTTPException
 
 from api.config import Config
@@ -16,7 +16,7 @@ def add_contact_to_loops(contact: Contact):
         "email": contact.email,
         "environment": contact.environment,
     }
-    response = requests.post(url, headers=headers, json=body)
+    response = http_client.post(url, headers=headers, json=body)
 
     if response.status_code != 200:
         print(response.text)
@@ -38,7 +38,7 @@ def send_remind_connect_event(contact: Contact):
         "Content-Type": "application/json"
     }
 
-    response = requests.request("POST", url, json=payload, headers=headers)
+    response = http_client.request("POST", url, json=payload, headers=headers)
 
     if response.status_code != 200:
         print(response.text)
@@ -60,7 +60,7 @@ def send_remind_data_source_event(contact: Contact):
         "Content-Type": "application/json"
     }
 
-    response = requests.request("POST", url, json=payload, headers=headers)
+    response = http_client.request("POST", url, json=payload, headers=headers)
 
     if response.status_code != 200:
         print(response.text)
@@ -82,7 +82,7 @@ def send_added_data_source_event(contact: Contact):
         "Content-Type": "application/json"
     }
 
-    response = requests.request("POST", url, json=payload, headers=headers)
+    response = http_client.request("POST", url, json=payload, headers=headers)
 
     if response.status_code != 200:
         print(response.text)
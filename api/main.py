@@ -1,6 +1,8 @@
 from api.config import Config
 from api.admin import admin_router
 from api.connector import connector_router
+from api.core.jobs import fail_interrupted_jobs
+from api.core.scheduler import SCHEDULER_ENABLED, refresh_scheduler
 from api.core.static_data import FieldType, ChannelType, OnboardingStage, UserRoleType
 from api.query import query_router
 from api.user import user_router
@@ -112,6 +114,14 @@ app.include_router(user_router.router)
 templates = Jinja2Templates(directory="api/templates")
 
 
+@app.on_event("startup")
+def startup():
+    # Jobs only live in this process, any left unfinished by the last one are lost.
+    fail_interrupted_jobs()
+    if SCHEDULER_ENABLED:
+        refresh_scheduler.start()
+
+
 @app.get("/", response_class=HTMLResponse)
 def read_root(request: Request):
     return templates.TemplateResponse(
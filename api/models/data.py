@@ -4,7 +4,7 @@ from typing import List, Dict, Optional, Union
 
 from api.models.connector import AdAccount
 from api.models.user import User
-from api.core.static_data import ChannelType, FieldType, JoinType, StreamType, ReportType
+from api.core.static_data import ChannelType, DateWindow, FieldType, JoinType, StreamType, ReportType
 
 
 class TableColumns(BaseModel):
@@ -75,6 +75,17 @@ class DataSource(BaseModel):
     adAccounts: List[AdAccount]
     start_date: datetime
     end_date: datetime
+    window: Optional[DateWindow]
+    # Hours between scheduled refreshes, 0 turns them off.
+    refresh_interval_hours: Optional[int]
+    # Set by incremental syncs, which must fetch exactly the date range given.
+    incremental: bool = False
+
+
+class AccountFetchResult(BaseModel):
+    ad_account: AdAccount
+    error: Optional[str]
+    status_code: Optional[int]
 
 
 class DataSourceInDB(BaseModel):
@@ -95,6 +106,8 @@ class DataSourceInDB(BaseModel):
     airbyte_connection_id: Optional[str]
     airbyte_stream: Optional[str]
     load_completed: Optional[bool]
+    synced_until: Optional[datetime]
+    refresh_interval_hours: Optional[int]
 
 
 class DataPrompt(BaseModel):
@@ -128,6 +141,7 @@ class ViewInDB(BaseModel):
     start_date: Optional[datetime]
     end_date: Optional[datetime]
     dh_connection_id: Optional[str]
+    materialized_at: Optional[datetime]
 
     class Config:
         orm_mode = True
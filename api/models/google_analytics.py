@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 
@@ -16,3 +16,4 @@ class GoogleAnalyticsQuery(BaseModel):
     dimensions: List[str]
     start_date: datetime
     end_date: datetime
+    date_ranges: Optional[List[Tuple[datetime, datetime]]]
@@ -0,0 +1,26 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+from api.core.static_data import JobKind, JobPhase, JobStatus
+
+
+class Job(BaseModel):
+    id: int
+    user_id: int
+    data_source_id: Optional[int]
+    kind: JobKind
+    status: JobStatus
+    phase: JobPhase
+    accounts_total: int = 0
+    accounts_fetched: int = 0
+    rows_loaded: int = 0
+    timings: Optional[Dict[str, float]]
+    errors: Optional[List[str]]
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        orm_mode = True
@@ -18,25 +18,44 @@ from api.database.crud import (
     get_user_by_email, get_chart_by_chart_id, 
     get_data_sources_by_id, get_view_by_id
 )
-from api.core.static_data import ChannelType, get_enum_member_by_value, OnboardingStage
+from api.core.static_data import (
+    ChannelType,
+    get_enum_member_by_value,
+    JobKind,
+    JobPhase,
+    OnboardingStage,
+    ResultFormat
+)
 from api.core.data import (
     create_field_list,
-    fetch_data,
     add_table_to_db,
-    all_fields,
     build_blend_query,
-    airpipe_field_option
+    airpipe_field_option,
+    stream_query_results,
+    iter_data_source_frames,
+    delete_failed_account_rows
 )
+from api.core.field_catalog import field_catalog
+from api.core.jobs import JobProgress, submit_job
+from api.core.loader import copy_frames_to_db, table_exists
+from api.core.result_cache import plain_identifiers, query_response
+from api.core.sync import submit_sync_job
+from api.core.views import refresh_view
 from api.core.auth import get_user_with_id
 from api.email.email import send_added_data_source_event
 from api.models.data import DataSourceInDB, JoinCondition, View, ViewInDB
+from api.models.job import Job
 from api.models.loops import Contact
 
 from api.models.user import User
 from api.database.models import DataSourceDB, ViewDB, JoinConditionDB, ChartDB
-from api.database.crud import get_data_sources_by_user_id, get_views_by_user_id
+from api.database.crud import (
+    get_data_source_by_name,
+    get_data_sources_by_user_id,
+    get_view_by_name,
+    get_views_by_user_id,
+)
 from api.utilities.data import (
-    insert_alt_values,
     get_channel_img,
     get_channel_name_from_enum
 )
@@ -63,10 +82,7 @@ def get_table_columns(token: str, table_name: str):
     "/data_source_field_options", response_model=List[FieldOption], status_code=200
 )
 def data_source_field_options(data_source: DataSourceInDB) -> List[FieldOption]:
-    source_fields = data_source.fields.split(",")
-    selected_fields = [
-        field for field in all_fields if field.alt_value in source_fields
-    ]
+    selected_fields = field_catalog.with_alt_values(data_source.fields.split(","))
 
     return selected_fields
 
@@ -74,7 +90,7 @@ def data_source_field_options(data_source: DataSourceInDB) -> List[FieldOption]:
 @router.post("/field_options", response_model=List[FieldOption], status_code=200)
 def field_options(fields: List[str], data: List[object]) -> List[FieldOption]:
     fields_list = [
-        next((field for field in all_fields if field.alt_value == field_name), airpipe_field_option(field_name, data[0][field_name]))
+        field_catalog.by_alt_value(field_name) or airpipe_field_option(field_name, data[0][field_name])
         for field_name in fields
     ]
     
@@ -82,21 +98,14 @@ def field_options(fields: List[str], data: List[object]) -> List[FieldOption]:
 
 
 @router.get("/run_query", response_model=QueryResults, status_code=200)
-def run_query(token: str, query: str):
+def run_query(token: str, query: str, format: ResultFormat = ResultFormat.json):
     get_current_user(token)
-    connection = engine.connect()
-    try:
-        results = connection.execute(query)
-        columns = list(results.keys())
-    except sqlalchemy.exc.ProgrammingError as e:
-        error_msg = str(e)
-        raise HTTPException(status_code=400, detail=error_msg)
-    finally:
-        connection.close()
-
-    query_results = QueryResults(columns=columns, results=results.all())
+    if format != ResultFormat.json:
+        return stream_query_results(query, format)
 
-    return query_results
+    return query_response(
+        query, lambda columns, rows: QueryResults(columns=columns, results=rows)
+    )
 
 
 @router.get("/table_results", response_model=CurrentResults, status_code=200)
@@ -107,52 +116,48 @@ def table_results(
     date_column: Optional[str] = None,
     start_date: datetime = None,
     end_date: datetime = None,
+    format: ResultFormat = ResultFormat.json,
 ):
     get_current_user(token)
     query = f'SELECT * FROM {schema}."{name}" '
     if date_column is not None and start_date is not None and end_date is not None:
         query += f"WHERE {date_column} BETWEEN '{start_date.strftime('%Y-%m-%d')}' AND '{end_date.strftime('%Y-%m-%d')}'"
-    connection = engine.connect()
-    try:
-        results = connection.execute(query)
-    except sqlalchemy.exc.ProgrammingError as e:
-        print(e)
-        error_msg = str(e)
-        raise HTTPException(status_code=400, detail=error_msg)
-    finally:
-        connection.close()
-
-    current_results = CurrentResults(
-        name=f'{schema}."{name}"', results=results.all(), columns=list(results.keys())
+    if format != ResultFormat.json:
+        return stream_query_results(query, format)
+
+    tables = None
+    if plain_identifiers(schema, f'"{name}"', date_column):
+        tables = [(schema, name)]
+    return query_response(
+        query,
+        lambda columns, rows: CurrentResults(
+            name=f'{schema}."{name}"', results=rows, columns=columns
+        ),
+        tables=tables,
     )
 
-    return current_results
-
-
-@router.post("/add_data_source", response_model=DataSourceInDB, status_code=200)
-def add_data_source(data_source: DataSource) -> DataSourceInDB:
-
-    def model_to_dict(instance):
-        return {c.key: getattr(instance, c.key)
-                for c in sqlalchemy.inspect(instance).mapper.column_attrs}
 
+@router.post("/add_data_source", response_model=Job, status_code=202)
+def add_data_source(data_source: DataSource) -> Job:
+    """
+    Saves a data source and queues a job that fetches and loads its data.
 
-    # Reads data source
-    data_list = fetch_data(data_source)
-    data_list = [insert_alt_values(data, data_source.fields) for data in data_list]
-    df = pd.DataFrame(data_list[0])
-
-    # Convert the DataFrame numerica values to numeric
-    df = df.apply(pd.to_numeric, errors="ignore")
-
+    Returns the queued job straight away, poll `/query/jobs/{job_id}` for its
+    progress. `load_completed` of the data source is set once the data has
+    been loaded.
+    """
     db_user = get_user_by_email(data_source.user.email)
+    user_id = db_user.id
     name = data_source.name.replace(" ", "_")
 
-    table_name = f"_{db_user.id}.{name}"
-    db_schema = f"_{db_user.id}"
+    table_name = f"_{user_id}.{name}"
+    db_schema = f"_{user_id}"
 
-    # Saves table to the dataabase
-    add_table_to_db(db_schema, name, df)
+    if get_view_by_name(user_id, name):
+        raise HTTPException(
+            status_code=400,
+            detail=f"A view named {name} already exists.",
+        )
 
     columns, metrics, dimensions = create_field_list(
         data_source.fields, use_alt_value=True, split_value=True
@@ -166,7 +171,7 @@ def add_data_source(data_source: DataSource) -> DataSourceInDB:
     # Saves data source to database.
     string_fields = ",".join(columns)
     data_source_row = DataSourceDB(
-        user_id=db_user.id,
+        user_id=user_id,
         db_schema=db_schema,
         name=name,
         table_name=table_name,
@@ -177,11 +182,17 @@ def add_data_source(data_source: DataSource) -> DataSourceInDB:
         ad_account_name=data_source.adAccounts[0].name,
         start_date=data_source.start_date,
         end_date=data_source.end_date,
+        load_completed=False,
+        ad_accounts=[ad_account.dict() for ad_account in data_source.adAccounts],
+        field_options=[field.dict() for field in data_source.fields],
+        date_window=data_source.window,
+        refresh_interval_hours=data_source.refresh_interval_hours,
     )
 
     try:
         session.add(data_source_row)
         session.commit()
+        data_source_id = data_source_row.id
     except Exception as e:
         print(e)
         session.rollback()
@@ -189,7 +200,88 @@ def add_data_source(data_source: DataSource) -> DataSourceInDB:
             status_code=400,
             detail=f"Could not save data_source_row to database. {e}",
         )
-    
+    finally:
+        session.close()
+        session.remove()
+
+    def load(progress: JobProgress):
+        try:
+            load_data_source(data_source, db_schema, name, data_source_id, progress)
+        except BaseException:
+            # A data source whose data could not be loaded is not kept.
+            delete_data_source_row(data_source_id)
+            raise
+
+    job = submit_job(
+        user_id,
+        JobKind.add_data_source,
+        load,
+        data_source_id=data_source_id,
+        accounts_total=len(data_source.adAccounts),
+    )
+
+    return Job.from_orm(job)
+
+
+def load_data_source(
+    data_source: DataSource,
+    db_schema: str,
+    name: str,
+    data_source_id: int,
+    progress: JobProgress,
+):
+    """
+    Streams the fetched rows of every ad account of a data source into its
+    table, then marks the data source as loaded and moves the user on to the
+    next onboarding stage. Runs on a job worker.
+
+    Args:
+        data_source (DataSource): The data source to fetch data from.
+        db_schema (str): The schema of the table.
+        name (str): The name of the table.
+        data_source_id (int): The id of the saved data source.
+        progress (JobProgress): The progress of the job.
+
+    Raises:
+        HTTPException: If no ad account could be fetched or the data source could not be updated.
+    """
+    progress.start_phase(JobPhase.loading)
+    failures = []
+    copy_frames_to_db(
+        db_schema,
+        name,
+        progress.count_rows(
+            iter_data_source_frames(
+                data_source, failures, on_account_done=progress.account_done
+            )
+        ),
+        before_swap=delete_failed_account_rows(failures),
+    )
+    progress.errors = [
+        f"{result.ad_account.name or result.ad_account.id}: {result.error}"
+        for result in failures
+    ]
+
+    progress.start_phase(JobPhase.finalizing)
+    values = {"load_completed": True}
+    if not failures:
+        # Accounts that failed are fetched in full by the next sync.
+        values["synced_until"] = data_source.end_date
+    try:
+        session.query(DataSourceDB).filter(DataSourceDB.id == data_source_id).update(values)
+        session.commit()
+    except Exception as e:
+        print(e)
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not update data_source_row. {e}",
+        )
+    finally:
+        session.close()
+        session.remove()
+
+    db_user = get_user_by_email(data_source.user.email)
     if db_user.onboarding_stage == OnboardingStage.connected:
         
         contact = Contact(
@@ -209,11 +301,36 @@ def add_data_source(data_source: DataSource) -> DataSourceInDB:
                 status_code=400,
                 detail=f"Could not update onboarding stage of user. {e}",
             )
-        
-    data_source_dict = model_to_dict(data_source_row)
-    data_source_in_db = DataSourceInDB(**data_source_dict)
+        finally:
+            session.close()
+            session.remove()
 
-    return data_source_in_db
+
+@router.post("/sync_data_source", response_model=Job, status_code=202)
+def sync_data_source(token: str, data_source_id: int, full: bool = False) -> Job:
+    """
+    Queues a sync of a data source, fetching only the days since its last sync
+    unless `full` is set.
+    """
+    current_user: User = get_current_user(token)
+    db_user = get_user_by_email(current_user.email)
+    data_source_row = get_data_sources_by_id(data_source_id)
+    if data_source_row is None or data_source_row.user_id != db_user.id:
+        raise HTTPException(status_code=404, detail=f"Data source {data_source_id} not found.")
+
+    return Job.from_orm(submit_sync_job(data_source_row, full))
+
+
+def delete_data_source_row(data_source_id: int):
+    try:
+        session.query(DataSourceDB).filter(DataSourceDB.id == data_source_id).delete()
+        session.commit()
+    except Exception as e:
+        print(f"Could not delete data source {data_source_id}. {e}")
+        session.rollback()
+    finally:
+        session.close()
+        session.remove()
 
 
 @router.get("/data_sources", response_model=List[DataSourceInDB], status_code=200)
@@ -236,7 +353,10 @@ def data_sources(token: str):
             ad_account_name=data_source.ad_account_name,
             start_date=data_source.start_date,
             end_date=data_source.end_date,
-            dh_connection_id=data_source.dh_connection_id
+            dh_connection_id=data_source.dh_connection_id,
+            load_completed=data_source.load_completed,
+            synced_until=data_source.synced_until,
+            refresh_interval_hours=data_source.refresh_interval_hours
         )
         for data_source in data_sources
     ]
@@ -262,7 +382,10 @@ def data_source(token: str, data_source_id: int):
         ad_account_name=data_source.ad_account_name,
         start_date=data_source.start_date,
         end_date=data_source.end_date,
-        dh_connection_id=data_source.dh_connection_id
+        dh_connection_id=data_source.dh_connection_id,
+        load_completed=data_source.load_completed,
+        synced_until=data_source.synced_until,
+        refresh_interval_hours=data_source.refresh_interval_hours
     )
 
 
@@ -281,7 +404,8 @@ def views(token: str):
             fields=view.fields,
             start_date=view.start_date,
             end_date=view.end_date,
-            dh_connection_id=view.dh_connection_id
+            dh_connection_id=view.dh_connection_id,
+            materialized_at=view.materialized_at,
         )
         for view in views
     ]
@@ -302,10 +426,25 @@ def view(token: str, view_id: int):
         fields=view.fields,
         start_date=view.start_date,
         end_date=view.end_date,
-        dh_connection_id=view.dh_connection_id
+        dh_connection_id=view.dh_connection_id,
+        materialized_at=view.materialized_at,
     )
 
 
+@router.post("/refresh_view", response_model=ViewInDB)
+def refresh_saved_view(token: str, view_id: int) -> ViewInDB:
+    """
+    Rebuilds the table of a saved view from its data sources.
+    """
+    current_user: User = get_current_user(token)
+    db_user = get_user_by_email(current_user.email)
+    view = get_view_by_id(view_id)
+    if view is None or view.user_id != db_user.id:
+        raise HTTPException(status_code=404, detail=f"View {view_id} not found.")
+
+    return ViewInDB.from_orm(refresh_view(view_id))
+
+
 @router.get("/tables", response_model=List[Table])
 def tables(token: str) -> List[Table]:
     current_user: User = get_current_user(token)
@@ -377,20 +516,27 @@ def create_blend(
         end_date=end_date,
     )
 
-    connection = engine.connect()
-    try:
-        results = connection.execute(query)
-        columns = list(results.keys())
-    except sqlalchemy.exc.ProgrammingError as e:
-        error_msg = str(e)
-        print(error_msg)
-        raise HTTPException(status_code=400, detail=error_msg)
-    finally:
-        connection.close()
-
-    query_results = QueryResults(columns=columns, results=results.all())
-
-    return query_results
+    # The blend query reads both tables from the schema of the left data source.
+    tables = None
+    quoted_names = [left_data_source.name, right_data_source.name] + [
+        field.alt_value for field in fields
+    ] + [
+        alt_value
+        for condition in join_conditions
+        for alt_value in (condition.left_field.alt_value, condition.right_field.alt_value)
+    ]
+    if plain_identifiers(
+        left_data_source.db_schema, date_column, *(f'"{name}"' for name in quoted_names)
+    ):
+        tables = [
+            (left_data_source.db_schema, left_data_source.name),
+            (left_data_source.db_schema, right_data_source.name),
+        ]
+    return query_response(
+        query,
+        lambda columns, rows: QueryResults(columns=columns, results=rows),
+        tables=tables,
+    )
 
 
 @router.post("/save_view", response_model=ViewInDB)
@@ -402,6 +548,18 @@ def save_view(view: View, token: str) -> ViewInDB:
     table_name = f"_{db_user.id}.{name}"
     db_schema = f"_{db_user.id}"
 
+    # The view is materialised into db_schema."name", which would replace any
+    # data source or view table of the same name.
+    if (
+        get_data_source_by_name(db_user.id, name)
+        or get_view_by_name(db_user.id, name)
+        or table_exists(db_schema, name)
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"A data source or view named {name} already exists.",
+        )
+
     columns, metrics, dimensions = create_field_list(
         view.fields, use_alt_value=True, split_value=True
     )
@@ -457,6 +615,14 @@ def save_view(view: View, token: str) -> ViewInDB:
     session.close()
     session.remove()
 
+    # Reads of the view are reads of its table from now on.
+    try:
+        view_in_db = ViewInDB.from_orm(refresh_view(view_in_db.id))
+    except HTTPException as e:
+        print(f"Could not materialise view {view_in_db.id}. {e.detail}")
+    except Exception as e:
+        print(f"Could not materialise view {view_in_db.id}. {e}")
+
     return view_in_db
 
 
@@ -493,7 +659,7 @@ def chart_data(chart_id: str) -> ChartData:
         name=f'_{chart.user_id}."{chart_id}"', results=results.all(), columns=list(results.keys())
     )    
     field_options = [
-        next((field for field in all_fields if field.alt_value == field_name), airpipe_field_option(field_name, current_results.results[0][field_name]))
+        field_catalog.by_alt_value(field_name) or airpipe_field_option(field_name, current_results.results[0][field_name])
         for field_name in current_results.columns
     ]
 
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-import requests
+from api.utilities.http import http_client
 from api.config import Config
 
 from api.database.models import DataSourceDB, ViewDB
@@ -23,7 +23,7 @@ def connect_db(table_id: int, db_schema: str, use_ssh:bool=False, data_source:bo
         "connection_uri": f"{DATABASE_URL}?options=-csearch_path%3D{db_schema}"
     }
 
-    response = requests.post("https://dataherald.onrender.com/api/v1/database-connections", json=request_body)
+    response = http_client.post("https://dataherald.onrender.com/api/v1/database-connections", json=request_body)
 
     if response.status_code != 201:
         print(response.json())
@@ -39,7 +39,7 @@ def connect_db(table_id: int, db_schema: str, use_ssh:bool=False, data_source:bo
         "table_names": [table.name]
     }
 
-    response = requests.post("https://dataherald.onrender.com/api/v1/table-descriptions/sync-schemas", json=scan_request_body)
+    response = http_client.post("https://dataherald.onrender.com/api/v1/table-descriptions/sync-schemas", json=scan_request_body)
 
     if response.status_code != 201:
         print(response.json())
@@ -57,7 +57,7 @@ def connect_db(table_id: int, db_schema: str, use_ssh:bool=False, data_source:bo
             "Unless specified, give calculations to two decimal places.",
     }
 
-    response = requests.post("https://dataherald.onrender.com/api/v1/instructions", json=instruction_one_request_body)
+    response = http_client.post("https://dataherald.onrender.com/api/v1/instructions", json=instruction_one_request_body)
 
     if response.status_code != 201:
         print(response.json())
@@ -71,7 +71,7 @@ def connect_db(table_id: int, db_schema: str, use_ssh:bool=False, data_source:bo
             f"Only use the table: {table.name} to answer the question.",
     }
 
-    response = requests.post("https://dataherald.onrender.com/api/v1/instructions", json=instruction_two_request_body)
+    response = http_client.post("https://dataherald.onrender.com/api/v1/instructions", json=instruction_two_request_body)
 
     if response.status_code != 201: 
         print(response.json())
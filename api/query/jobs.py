@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+
+from api.core.auth import get_current_user
+from api.core.jobs import get_job
+from api.database.crud import get_user_by_email
+from api.models.job import Job
+from api.models.user import User
+
+router = APIRouter(prefix="/jobs")
+
+
+@router.get("/{job_id}", response_model=Job, status_code=200)
+def job(token: str, job_id: int) -> Job:
+    current_user: User = get_current_user(token)
+    db_user = get_user_by_email(current_user.email)
+    job = get_job(job_id)
+    if job is None or job.user_id != db_user.id:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+
+    return Job.from_orm(job)
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from api.query import codex, data, conversation, dataherald
+from api.query import codex, data, conversation, dataherald, jobs
 
 router = APIRouter(prefix="/query")
 
@@ -10,3 +10,4 @@ router.include_router(data.router)
 router.include_router(codex.router)
 router.include_router(conversation.router)
 router.include_router(dataherald.router)
+router.include_router(jobs.router)
@@ -3,6 +3,8 @@ from api.database.crud import insert_new_user, get_all_users
 from api.database.models import UserDB
 from api.models.user import User, UserInDB, UserWithId
 from api.core.auth import get_password_hash, get_user_with_id, get_current_user
+from api.core.google import clear_cached_access_token
+from api.connector.google import ad_accounts_cache as google_ad_accounts_cache
 from api.core.static_data import ChannelType, OnboardingStage
 from api.email.email import add_contact_to_loops, send_remind_connect_event, send_remind_data_source_event
 from api.models.loops import Contact
@@ -71,20 +73,29 @@ def update_onboarding_stage(user: User, new_stage: OnboardingStage) -> UserDB:
 def clear_access_token(token: str, channel: ChannelType):
     user = get_current_user(token)
     db_uder = session.query(UserDB).filter(UserDB.email == user.email).first()
+    clears_google_ads = False
 
     if channel == ChannelType.google_analytics:
+        clear_cached_access_token(db_uder.google_analytics_refresh_token)
         db_uder.google_analytics_refresh_token = None
     elif channel == ChannelType.sheets:
+        clear_cached_access_token(db_uder.google_sheets_refresh_token)
         db_uder.google_sheets_refresh_token = None
     elif channel == ChannelType.youtube:
+        clear_cached_access_token(db_uder.youtube_refresh_token)
         db_uder.youtube_refresh_token = None
     else:
+        clear_cached_access_token(db_uder.google_refresh_token)
         db_uder.google_refresh_token = None
+        clears_google_ads = True
 
     # update existing user in database
     try: 
         session.add(db_uder)
         session.commit()
+        if clears_google_ads:
+            # The ad accounts were listed with the Google Ads token just cleared.
+            google_ad_accounts_cache.invalidate(user.email)
     except Exception as e:
         print(e)
         session.rollback()
@@ -0,0 +1,259 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+# Every cache registers itself here so its counters can be reported together.
+caches: Dict[str, Union["TTLCache", "LRUCache"]] = {}
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache whose entries expire after a time to live.
+
+    Concurrent misses for the same key are collapsed into a single call of the
+    loader, the other callers wait for it and share its value. With a
+    `maxsize`, expired entries are purged once the cache is full, then the
+    oldest entries.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: Optional[int] = None):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, tuple] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def _get_fresh(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry
+        return None
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._get_fresh(key)
+            if entry is None:
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            if self.maxsize is not None and len(self._entries) >= self.maxsize:
+                self._evict_expired()
+                if len(self._entries) >= self.maxsize:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (value, time.monotonic() + ttl)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl_of: Optional[Callable[[Any], float]] = None,
+    ) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader` to fill the cache
+        on a miss.
+
+        Args:
+            key (Hashable): The cache key.
+            loader (Callable): Called with no arguments to load the value on a miss.
+            ttl_of (Callable, optional): Computes the time to live of a loaded value. Defaults to the cache ttl.
+
+        Returns:
+            The cached or loaded value.
+        """
+        with self._lock:
+            entry = self._get_fresh(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._get_fresh(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry[0]
+                self.misses += 1
+
+            try:
+                value = loader()
+                self.set(key, value, ttl_of(value) if ttl_of is not None else None)
+            finally:
+                # Callers still waiting on the lock find the value once it is
+                # released, later misses start a new lock.
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._key_locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[1] <= now]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+
+class _Flight:
+    """
+    A load in progress, shared by the callers that missed the same key.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache bounded by the total size of its values, which
+    evicts the least recently used entries first.
+
+    Entries also expire after a time to live. Values larger than
+    `max_value_bytes` are returned but not kept. Concurrent misses for the same
+    key are collapsed into a single call of the loader, the other callers wait
+    for it and share its value or exception.
+    """
+
+    def __init__(self, name: str, max_bytes: int, ttl: float, max_value_bytes: Optional[int] = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_value_bytes = max_bytes if max_value_bytes is None else max_value_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.too_large = 0
+        self.bytes = 0
+        # key -> (value, size in bytes, expiry), least recently used first.
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        size_of: Callable[[Any], int] = len,
+    ) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader` to fill the cache
+        on a miss.
+
+        Args:
+            key (Hashable): The cache key.
+            loader (Callable): Called with no arguments to load the value on a miss.
+            size_of (Callable, optional): Computes the size in bytes of a loaded value. Defaults to its length.
+
+        Returns:
+            The cached or loaded value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            self._set(key, flight.value, size_of(flight.value))
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        return flight.value
+
+    def _set(self, key: Hashable, value: Any, size: int):
+        with self._lock:
+            self._pop(key)
+            if self.max_bytes <= 0:
+                return
+            if size > self.max_value_bytes or size > self.max_bytes:
+                self.too_large += 1
+                return
+            while self._entries and self.bytes + size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (value, size, time.monotonic() + self.ttl)
+            self.bytes += size
+
+    def _pop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "too_large": self.too_large,
+                "size": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the counters of every registered cache.
+
+    Returns:
+        dict: The counters of each cache, keyed by cache name.
+    """
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -0,0 +1,113 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+import itertools
+import threading
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class PlatformLimiter:
+    """Caps the number of calls in flight per platform across all threads."""
+
+    def __init__(self, limits: Dict[str, int], default: int):
+        self.limits = limits
+        self.default = default
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, platform: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if platform not in self._semaphores:
+                limit = self.limits.get(platform, self.default)
+                self._semaphores[platform] = threading.BoundedSemaphore(limit)
+            return self._semaphores[platform]
+
+    @contextmanager
+    def limit(self, platform: str):
+        semaphore = self._semaphore(platform)
+        with semaphore:
+            yield
+
+    def iter_limited(self, platform: str, produce: Callable[[], Iterable[T]]) -> Iterator[T]:
+        """
+        Iterates over a stream, e.g. of paged API responses, holding a slot of
+        the platform only while the next item is produced.
+
+        The slot is released while the consumer handles an item, so a slow
+        consumer does not keep other accounts on the platform waiting.
+
+        Args:
+            platform (str): The platform the stream calls.
+            produce (Callable): Returns the stream, called under the first slot as it may already fetch.
+
+        Yields:
+            The items of the stream.
+        """
+        iterator = None
+        semaphore = self._semaphore(platform)
+        while True:
+            with semaphore:
+                if iterator is None:
+                    iterator = iter(produce())
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+def map_ordered(fn: Callable[[T], R], items: Iterable[T], max_workers: int) -> List[R]:
+    """
+    Applies `fn` to every item on a bounded thread pool.
+
+    Args:
+        fn (Callable): The function to apply.
+        items (Iterable): The items to apply it to.
+        max_workers (int): The maximum number of threads.
+
+    Returns:
+        list: The results, in the same order as `items`.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(fn, items))
+
+
+def iter_ordered(fn: Callable[[T], R], items: Iterable[T], max_workers: int) -> Iterator[R]:
+    """
+    Applies `fn` to every item on a bounded thread pool and yields the results
+    in the same order as `items`.
+
+    At most `max_workers` items are in flight or waiting to be consumed, so a
+    slow consumer holds back the pool instead of buffering every result.
+    Pending work is cancelled if the consumer stops early.
+
+    Args:
+        fn (Callable): The function to apply.
+        items (Iterable): The items to apply it to.
+        max_workers (int): The maximum number of threads.
+
+    Yields:
+        The next result, in item order.
+    """
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: Deque[Future] = deque()
+    try:
+        for item in itertools.islice(items, max_workers):
+            pending.append(executor.submit(fn, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in itertools.islice(items, 1):
+                pending.append(executor.submit(fn, item))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
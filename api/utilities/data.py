@@ -1,6 +1,10 @@
 from collections import defaultdict
+import datetime
+from decimal import Decimal
+import itertools
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
 import json
 from sqlalchemy import MetaData
 from sqlalchemy.inspection import inspect
@@ -9,12 +13,7 @@ from api.database.database import engine
 from api.models.data import FieldOption
 from api.core.static_data import (
     ChannelType,
-    google_metrics,
-    google_dimensions,
-    google_analytics_metrics,
-    google_analytics_dimensions,
-    facebook_metrics,
-    facebook_dimensions,
+    DateWindow,
 )
 
 
@@ -75,20 +74,53 @@ def tuples_to_recharts_dict(tuples_list, as_json=False):
     return dicts_list
 
 
-def convert_metric(metric, name: str):
-    name_list = [
-        "averageCpc",
-        "averageCpe",
-        "averageCpm",
-        "costPerConversion",
-        "averageCpv",
-        "costMicros",
-    ]
+def json_default(value):
+    """
+    Serialises values that the json module cannot handle natively, such as the
+    dates and decimals returned by Postgres.
+
+    Args:
+        value: The value to serialise.
+
+    Returns:
+        A JSON serialisable representation of the value.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
 
-    if str(name) in name_list:
-        metric = float(metric) / 1000000.0
-        metric = round(metric, 2)
-    return metric
+
+def split_date_range(
+    start_date: datetime.datetime, end_date: datetime.datetime, window: DateWindow
+) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    """
+    Splits an inclusive date range into consecutive windows.
+
+    Weekly windows are seven days long starting from `start_date`. Monthly
+    windows follow calendar months, so the first and last windows may be
+    partial months.
+
+    Args:
+        start_date (datetime): The first day of the range.
+        end_date (datetime): The last day of the range, inclusive.
+        window (DateWindow): The size of the windows.
+
+    Returns:
+        List[Tuple[datetime, datetime]]: The first and last day of each window, in order.
+    """
+    windows = []
+    window_start = start_date
+    while window_start.date() <= end_date.date():
+        if window == DateWindow.week:
+            next_start = window_start + datetime.timedelta(days=7)
+        else:
+            next_start = (window_start.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        window_end = min(next_start - datetime.timedelta(days=1), end_date)
+        windows.append((window_start, window_end))
+        window_start = next_start
+    return windows
 
 
 def get_table_schema(schema: str, table_name: str):
@@ -237,6 +269,159 @@ def object_list_to_df(data: dict):
     return df
 
 
+def merge_frames_by_date(
+    frames: Iterable[pd.DataFrame], pad_with_date: bool = True
+) -> pd.DataFrame:
+    """
+    Merges frames of rows from several sources into one frame keyed on date,
+    the columnar equivalent of `object_list_to_df(merge_objects(...))`.
+
+    Every frame must have a "date" column, each of its rows adds one value
+    per other column to its date. A date gets as many rows as the column with
+    the most values for that date, and the n-th value of a column for a date
+    goes in the n-th row of that date. Dates keep the order they first appear
+    in, and so do the columns, column by column within each date.
+
+    Padding: where a column has fewer values for a date than that date has
+    rows, the missing cells hold the date itself, as `object_list_to_df`
+    does, or None with `pad_with_date=False`, as after `pad_object_list`.
+    Columns with no value at all for a date are NaN for that date.
+
+    Instead of a dict per output row, values are placed with one array
+    assignment per column. Numeric columns stay numeric, and only columns
+    that are still objects are converted to numbers.
+
+    Args:
+        frames (Iterable[pd.DataFrame]): The frames to merge, in source order.
+        pad_with_date (bool, optional): Whether to pad with the date rather than None.
+
+    Returns:
+        pd.DataFrame: The merged rows, with a "date" column first.
+    """
+    frames = [frame for frame in frames if len(frame.columns)]
+    if not frames:
+        return pd.DataFrame()
+
+    # Dates are numbered in the order they first appear.
+    date_codes, dates = pd.factorize(
+        pd.concat([frame["date"] for frame in frames], ignore_index=True), sort=False
+    )
+    date_count = len(dates)
+    dates = np.asarray(dates, dtype=object)
+    if date_count <= np.iinfo(np.uint16).max:
+        # Sorts in linear time, numpy radix sorts 16 bit integers.
+        date_codes = date_codes.astype(np.uint16)
+
+    frame_codes = []
+    sources: dict = {}
+    first_seen = []
+    offset = 0
+    for frame_index, frame in enumerate(frames):
+        codes = date_codes[offset : offset + len(frame)]
+        frame_codes.append(codes)
+        # The first row of each date in this frame, where its columns are first seen.
+        first_rows = np.full(date_count, -1, dtype=np.int64)
+        first_rows[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+        frame_dates = np.flatnonzero(first_rows >= 0)
+        for position, column in enumerate(frame.columns):
+            if column == "date":
+                continue
+            sources.setdefault(column, []).append(frame_index)
+            first_seen.append(
+                pd.DataFrame(
+                    {
+                        "date": frame_dates,
+                        "row": first_rows[frame_dates] + offset,
+                        "position": position,
+                        "column": column,
+                    }
+                )
+            )
+        offset += len(frame)
+
+    # Columns in the order a row by row merge would first create them.
+    order = (
+        pd.concat(first_seen, ignore_index=True)
+        .sort_values(["date", "row", "position"], kind="stable")
+        .drop_duplicates("column")["column"]
+        .tolist()
+    )
+
+    # Where the values of a set of frames go: their date, how many values each
+    # date has and which of them each value is, counted in source order.
+    # Columns of the same frames share their placement.
+    placements = {}
+
+    def place(frame_indexes: Tuple[int, ...]):
+        if frame_indexes not in placements:
+            codes = np.concatenate([frame_codes[index] for index in frame_indexes])
+            counts = np.bincount(codes, minlength=date_count)
+            sort = np.argsort(codes, kind="stable")
+            nth = np.empty(len(codes), dtype=np.int64)
+            nth[sort] = np.arange(len(codes)) - (np.cumsum(counts) - counts)[codes[sort]]
+            placements[frame_indexes] = codes, counts, nth
+        return placements[frame_indexes]
+
+    counts = np.zeros((date_count, len(order)), dtype=np.int64)
+    for index, column in enumerate(order):
+        counts[:, index] = place(tuple(sources[column]))[1]
+
+    rows_per_date = counts.max(axis=1)
+    starts = np.cumsum(rows_per_date) - rows_per_date
+    row_count = int(rows_per_date.sum())
+    row_dates = np.repeat(np.arange(date_count), rows_per_date)
+    row_index = np.arange(row_count) - starts[row_dates]
+
+    data = {"date": pd.to_numeric(pd.Series(dates[row_dates]), errors="ignore")}
+    for column in order:
+        codes, column_counts, nth = place(tuple(sources[column]))
+        parts = [frames[index][column] for index in sources[column]]
+        targets = starts[codes] + nth
+        row_counts = column_counts[row_dates]
+        padded = (row_index >= row_counts) & (row_counts > 0)
+        complete = not padded.any() and bool((row_counts > 0).all())
+
+        numeric = all(
+            isinstance(part.dtype, np.dtype) and part.dtype.kind in "iuf" for part in parts
+        )
+        if numeric and (complete or not pad_with_date):
+            # Stays numeric, as ints and floats would be after to_numeric.
+            if complete and all(part.dtype.kind in "iu" for part in parts):
+                merged = np.empty(row_count, dtype=np.int64)
+            else:
+                merged = np.full(row_count, np.nan)
+            merged[targets] = np.concatenate([part.to_numpy() for part in parts])
+            data[column] = merged
+            continue
+
+        merged = np.full(row_count, np.nan, dtype=object)
+        merged[targets] = np.concatenate([part.to_numpy(dtype=object) for part in parts])
+        merged[padded] = dates[row_dates[padded]] if pad_with_date else None
+        merged = pd.Series(merged).infer_objects()
+        if merged.dtype == object:
+            merged = pd.to_numeric(merged, errors="ignore")
+        data[column] = merged
+
+    return pd.DataFrame(data)
+
+
+def object_lists_to_frames(object_lists) -> Iterator[pd.DataFrame]:
+    """
+    Converts lists of objects, as taken by `merge_objects`, to frames for
+    `merge_frames_by_date`. Consecutive objects with the same keys share a
+    frame, so an object only adds values for the keys it has.
+
+    Args:
+        object_lists (list of lists of dictionaries): The objects of each source, each with a "date" key.
+
+    Yields:
+        pd.DataFrame: The objects as frames, in order.
+    """
+    for obj_list in object_lists:
+        for keys, objects in itertools.groupby(obj_list, key=tuple):
+            yield pd.DataFrame.from_records(list(objects), columns=list(keys))
+
+
 def insert_alt_values(data: List[object], fields: List[FieldOption]):
     """
     Replaces specific keys in a list of dictionaries with their corresponding values from a given list of FieldOptions.
@@ -0,0 +1,101 @@
+from fastapi import HTTPException
+from typing import Iterable, List, NamedTuple, Tuple
+
+from api.utilities.string import underscore_to_camel_case
+
+# Google Ads metrics reported in micros, converted to currency units.
+MICRO_METRICS = frozenset(
+    [
+        "averageCpc",
+        "averageCpe",
+        "averageCpm",
+        "costPerConversion",
+        "averageCpv",
+        "costMicros",
+    ]
+)
+
+# Maps a GAQL resource prefix to its path in a searchStream result row.
+RESOURCE_PATHS = {
+    "segments.": ("segments",),
+    "ad_group_ad.ad.": ("adGroupAd", "ad"),
+    "ad_group.": ("adGroup",),
+    "campaign.": ("campaign",),
+    "video.": ("video",),
+}
+
+
+class FieldAccessor(NamedTuple):
+    key: str
+    path: Tuple[str, ...]
+    micros: bool
+
+
+def compile_google_fields(
+    metrics: Iterable[str], dimensions: Iterable[str]
+) -> List[FieldAccessor]:
+    """
+    Compiles the metrics and dimensions of a Google Ads query into accessor
+    paths into a searchStream result row, so the per row work is reduced to
+    dictionary lookups.
+
+    Args:
+        metrics (Iterable[str]): The GAQL metrics, e.g. `metrics.cost_micros`.
+        dimensions (Iterable[str]): The GAQL dimensions, e.g. `segments.date`.
+
+    Returns:
+        List[FieldAccessor]: One accessor per field, metrics first.
+
+    Raises:
+        HTTPException: If a dimension belongs to an unsupported resource.
+    """
+    accessors = []
+    for metric in metrics:
+        metric_name = underscore_to_camel_case(metric.replace("metrics.", ""))
+        accessors.append(
+            FieldAccessor(metric, ("metrics", metric_name), metric_name in MICRO_METRICS)
+        )
+
+    for dimension in dimensions:
+        if dimension.startswith("segments.keyword"):
+            path = ("segments", "keyword", "info", "text")
+        else:
+            prefix = next(
+                (prefix for prefix in RESOURCE_PATHS if dimension.startswith(prefix)),
+                None,
+            )
+            if prefix is None:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid dimension: {dimension}"
+                )
+            dimension_name = underscore_to_camel_case(dimension[len(prefix):])
+            path = RESOURCE_PATHS[prefix] + (dimension_name,)
+        accessors.append(FieldAccessor(dimension, path, False))
+
+    return accessors
+
+
+def extract_google_row(row: dict, accessors: List[FieldAccessor]) -> dict:
+    """
+    Extracts the compiled fields from a searchStream result row. Fields that
+    are missing from the row, such as metrics with a zero value, are left out.
+
+    Args:
+        row (dict): The result row.
+        accessors (List[FieldAccessor]): The compiled fields, see `compile_google_fields`.
+
+    Returns:
+        dict: The row keyed by metric and dimension.
+    """
+    data_row = {}
+    for key, path, micros in accessors:
+        value = row
+        try:
+            for part in path:
+                value = value[part]
+        except (KeyError, TypeError):
+            continue
+        if micros:
+            value = round(float(value) / 1000000.0, 2)
+        data_row[key] = value
+    return data_row
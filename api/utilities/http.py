@@ -0,0 +1,193 @@
+from collections import defaultdict
+from fastapi import HTTPException
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from api.config import Config
+from api.utilities.rate_limit import backoff_delay, parse_retry_after, rate_limiter
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+RETRY_STATUSES = frozenset([500, 502, 503, 504])
+
+
+class HttpClient:
+    """
+    Shared HTTP client for calls to external APIs.
+
+    Connections are kept alive in a pool per host, every call gets a default
+    timeout, and idempotent calls are retried with jittered exponential backoff
+    on connection errors and 5xx responses. Throttled calls (429) are retried
+    whatever their method, after any Retry-After the server asked for. Calls
+    tagged with a platform go through the shared rate limiter.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        pool_connections: int,
+        pool_maxsize: int,
+        retries: int,
+        backoff_factor: float,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)
+        self._retries = defaultdict(int)
+        self._throttled = defaultdict(int)
+        self._in_flight = defaultdict(int)
+        self._peak_in_flight = defaultdict(int)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        idempotent: Optional[bool] = None,
+        platform: Optional[str] = None,
+        account: Optional[str] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Sends a request through the shared session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            idempotent (bool, optional): Whether the call may be retried after a connection error or 5xx. Defaults to True for GET, HEAD, OPTIONS, PUT and DELETE.
+            platform (str, optional): The platform the call counts against, see `rate_limiter`.
+            account (str, optional): The ad account the call counts against.
+            **kwargs: Passed on to `requests.Session.request`.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            HTTPException: If the host could not be reached or timed out after all retries.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = self.retries + 1
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            retry_after = None
+            if platform is not None:
+                rate_limiter.acquire(platform, account)
+            self._start(host)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt or not idempotent:
+                    status_code = 504 if isinstance(e, requests.Timeout) else 502
+                    raise HTTPException(
+                        status_code=status_code,
+                        detail=f"Request to {host} failed. {e}",
+                    )
+            else:
+                if platform is not None:
+                    retry_after = rate_limiter.observe(platform, account, response)
+                else:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                throttled = response.status_code == 429
+                if throttled:
+                    self._count_throttled(host)
+                retryable = throttled or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or last_attempt:
+                    return response
+                response.close()
+            finally:
+                self._finish(host)
+
+            self._count_retry(host)
+            # The rate limiter already holds back calls tagged with a platform
+            # until the Retry-After has passed.
+            if platform is not None:
+                retry_after = None
+            time.sleep(backoff_delay(attempt, self.backoff_factor, retry_after))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def _start(self, host: str):
+        with self._lock:
+            self._requests[host] += 1
+            self._in_flight[host] += 1
+            self._peak_in_flight[host] = max(
+                self._peak_in_flight[host], self._in_flight[host]
+            )
+
+    def _finish(self, host: str):
+        with self._lock:
+            self._in_flight[host] -= 1
+
+    def _count_retry(self, host: str):
+        with self._lock:
+            self._retries[host] += 1
+
+    def _count_throttled(self, host: str):
+        with self._lock:
+            self._throttled[host] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns per host request counters and connection pool utilisation.
+
+        Returns:
+            dict: The counters of each host.
+        """
+        pools = {}
+        pool_manager = self.adapter.poolmanager
+        for key in list(pool_manager.pools.keys()):
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+            pools[pool.host] = {
+                "connections_opened": pool.num_connections,
+                "idle_connections": idle,
+                "maxsize": pool.pool.maxsize,
+            }
+
+        with self._lock:
+            hosts = set(self._requests) | set(pools)
+            return {
+                host: {
+                    "requests": self._requests[host],
+                    "retries": self._retries[host],
+                    "throttled": self._throttled[host],
+                    "in_flight": self._in_flight[host],
+                    "peak_in_flight": self._peak_in_flight[host],
+                    **pools.get(host, {}),
+                }
+                for host in hosts
+            }
+
+
+http_client = HttpClient(
+    connect_timeout=float(Config.HTTP_CONNECT_TIMEOUT),
+    read_timeout=float(Config.HTTP_READ_TIMEOUT),
+    pool_connections=int(Config.HTTP_POOL_CONNECTIONS),
+    pool_maxsize=int(Config.HTTP_POOL_MAXSIZE),
+    retries=int(Config.HTTP_RETRIES),
+    backoff_factor=float(Config.HTTP_BACKOFF_FACTOR),
+)
@@ -0,0 +1,75 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, List
+
+_SPECIAL = re.compile(r'[\\"\[\]{}]')
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Incrementally parses a JSON array of objects or arrays, yielding each
+    element as soon as it has been received.
+
+    Only the element currently being received is kept in memory, so the size
+    of the whole document does not matter. Scalar top level elements are not
+    supported.
+
+    Args:
+        chunks (Iterable[bytes]): The raw body, e.g. `response.iter_content()`.
+
+    Yields:
+        The parsed elements of the array, in order.
+
+    Raises:
+        ValueError: If the body is not a JSON array or ends before the array is closed.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    # The text of the element currently being received, from earlier chunks.
+    pieces: List[str] = []
+    skip = 0
+    depth = 0
+    start = None
+    in_string = False
+
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+
+        for match in _SPECIAL.finditer(text, skip):
+            i = match.start()
+            if i < skip:
+                continue
+            char = match.group()
+
+            if in_string:
+                if char == "\\":
+                    # Skip whatever character is escaped, including quotes.
+                    skip = i + 2
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                if depth == 0 and char != "[":
+                    raise ValueError("Expected a JSON array.")
+                depth += 1
+                if depth == 2:
+                    start = i
+            else:
+                depth -= 1
+                if depth == 1:
+                    pieces.append(text[start : i + 1])
+                    yield json.loads("".join(pieces))
+                    pieces = []
+                    start = None
+                elif depth == 0:
+                    return
+
+        # Keep only the part of the element received so far, joined once the
+        # element is closed, so each chunk is copied once whatever its size.
+        if start is not None:
+            pieces.append(text[start:])
+            start = 0
+        skip = max(skip - len(text), 0)
+
+    raise ValueError("Unexpected end of JSON array.")
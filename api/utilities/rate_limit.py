@@ -0,0 +1,292 @@
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from api.config import Config
+from api.core.static_data import ChannelType
+
+# Sustained requests per second and burst size of each platform, shared by all
+# accounts on the platform.
+PLATFORM_RATES: Dict[str, Tuple[float, int]] = {
+    ChannelType.google: (10.0, 20),
+    ChannelType.google_video: (10.0, 20),
+    ChannelType.google_analytics: (10.0, 20),
+    ChannelType.youtube: (5.0, 10),
+    ChannelType.facebook: (5.0, 10),
+    ChannelType.instagram_media: (5.0, 10),
+    ChannelType.instagram_account: (5.0, 10),
+}
+
+# Facebook usage, in percent, above which requests are slowed down.
+USAGE_SLOWDOWN_THRESHOLD = 75.0
+# The slowest a throttled bucket is allowed to get, as a fraction of its rate.
+MIN_THROTTLE = 0.1
+# The usage of the whole app, shared by every account on the platform.
+APP_USAGE_HEADERS = ("x-app-usage",)
+# The usage of the business or ad account of the request only.
+ACCOUNT_USAGE_HEADERS = ("x-business-use-case-usage", "x-ad-account-usage")
+USAGE_HEADERS = APP_USAGE_HEADERS + ACCOUNT_USAGE_HEADERS
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `capacity`.
+
+    The refill rate can be throttled to a fraction of `rate`, and the bucket can
+    be paused until a point in time, e.g. for a Retry-After.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.throttle = 1.0
+        self.paused_until = 0.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = max(now - max(self.updated, self.paused_until), 0.0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate * self.throttle)
+        self.updated = max(now, self.updated)
+
+    def reserve(self) -> float:
+        """
+        Takes a token, going into debt if none is left.
+
+        Returns:
+            float: The number of seconds to wait before the token may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(self.paused_until - now, 0.0)
+            if self.tokens < 0:
+                wait += -self.tokens / (self.rate * self.throttle)
+            return wait
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def set_throttle(self, throttle: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.throttle = min(max(throttle, MIN_THROTTLE), 1.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "tokens": round(self.tokens, 2),
+                "capacity": self.capacity,
+                "rate": self.rate,
+                "throttle": round(self.throttle, 2),
+                "paused_for": round(max(self.paused_until - now, 0.0), 2),
+            }
+
+
+def usage_throttle(usage: float) -> float:
+    """
+    Returns the fraction of its rate a bucket is slowed down to at a usage,
+    linearly from full speed at USAGE_SLOWDOWN_THRESHOLD to MIN_THROTTLE at 100%.
+
+    Args:
+        usage (float): The usage in percent.
+
+    Returns:
+        float: The throttle, at most 1.0.
+    """
+    return (100.0 - usage) / (100.0 - USAGE_SLOWDOWN_THRESHOLD)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given in seconds.
+
+    Args:
+        value (str, optional): The header value.
+
+    Returns:
+        float: The number of seconds to wait, or None if the header is missing or not in seconds.
+    """
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_facebook_usage(
+    headers, names: Iterable[str] = USAGE_HEADERS
+) -> Tuple[Optional[float], float]:
+    """
+    Reads the Facebook app, business use case and ad account usage headers.
+
+    Args:
+        headers: The response headers.
+        names (Iterable[str], optional): The usage headers to read. Defaults to all of them.
+
+    Returns:
+        Tuple[Optional[float], float]: The highest usage in percent, None if no usage header was sent, and the longest time in seconds until access is regained.
+    """
+    usage = None
+    regain = 0.0
+
+    def visit(value):
+        nonlocal usage, regain
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == "estimated_time_to_regain_access":
+                    # Reported in minutes.
+                    regain = max(regain, float(item or 0) * 60)
+                elif key in ("call_count", "total_cputime", "total_time", "acc_id_util_pct"):
+                    usage = max(usage or 0.0, float(item or 0))
+                else:
+                    visit(item)
+        elif isinstance(value, list):
+            for item in value:
+                visit(item)
+
+    for header in names:
+        raw = headers.get(header)
+        if not raw:
+            continue
+        try:
+            visit(json.loads(raw))
+        except (ValueError, TypeError):
+            continue
+
+    return usage, regain
+
+
+class RateLimiter:
+    """
+    Token buckets per platform and per ad account.
+
+    Every request takes a token from the bucket of its platform and, if given,
+    of its account. Responses feed back into the buckets: Retry-After pauses
+    them, and the Facebook usage headers slow them down before the platform
+    starts rejecting calls.
+    """
+
+    def __init__(
+        self,
+        platform_rates: Dict[str, Tuple[float, int]],
+        default_rate: Tuple[float, int],
+        account_rate: Tuple[float, int],
+    ):
+        self.platform_rates = platform_rates
+        self.default_rate = default_rate
+        self.account_rate = account_rate
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: Hashable, rate: Tuple[float, int]) -> TokenBucket:
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(*rate)
+            return self._buckets[key]
+
+    def _platform_bucket(self, platform: str) -> TokenBucket:
+        return self._bucket(platform, self.platform_rates.get(platform, self.default_rate))
+
+    def _account_bucket(self, platform: str, account: str) -> TokenBucket:
+        return self._bucket((platform, str(account)), self.account_rate)
+
+    def _buckets_for(self, platform: str, account: Optional[str]):
+        platform = getattr(platform, "value", platform)
+        buckets = [self._platform_bucket(platform)]
+        if account is not None:
+            buckets.append(self._account_bucket(platform, account))
+        return buckets
+
+    def acquire(self, platform: str, account: Optional[str] = None):
+        """
+        Blocks until both the platform and the account bucket allow a request.
+
+        Args:
+            platform (str): The platform being called.
+            account (str, optional): The ad account being called.
+        """
+        wait = max(bucket.reserve() for bucket in self._buckets_for(platform, account))
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, platform: str, account: Optional[str], response):
+        """
+        Adjusts the buckets of a platform and account to a response.
+
+        Retry-After pauses both buckets. The Facebook app usage throttles and
+        pauses the platform bucket, as it is shared by every account, while the
+        business use case and ad account usage only throttle and pause the
+        bucket of the account the response is for.
+
+        Args:
+            platform (str): The platform that was called.
+            account (str, optional): The ad account that was called.
+            response (requests.Response): The response.
+
+        Returns:
+            float: The number of seconds the platform asked to wait, or None if it did not.
+        """
+        buckets = self._buckets_for(platform, account)
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after:
+            for bucket in buckets:
+                bucket.pause(retry_after)
+
+        scopes = [(buckets[0], APP_USAGE_HEADERS)]
+        if account is not None:
+            scopes.append((buckets[1], ACCOUNT_USAGE_HEADERS))
+        for bucket, names in scopes:
+            usage, regain = parse_facebook_usage(response.headers, names)
+            if usage is not None:
+                bucket.set_throttle(usage_throttle(usage))
+            if regain:
+                bucket.pause(regain)
+                retry_after = max(retry_after or 0.0, regain)
+        return retry_after
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current level of every bucket.
+
+        Returns:
+            dict: The bucket levels, keyed by platform or `platform:account`.
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            key if isinstance(key, str) else ":".join(key): bucket.stats()
+            for key, bucket in buckets.items()
+        }
+
+
+def backoff_delay(attempt: int, factor: float, retry_after: Optional[float] = None) -> float:
+    """
+    Returns a jittered exponential backoff delay, at least as long as any
+    Retry-After the server asked for.
+
+    Args:
+        attempt (int): The number of the attempt that failed, starting at 0.
+        factor (float): The base delay in seconds.
+        retry_after (float, optional): The delay requested by the server.
+
+    Returns:
+        float: The number of seconds to wait.
+    """
+    delay = random.uniform(0, factor * (2 ** attempt))
+    if retry_after:
+        delay += retry_after
+    return delay
+
+
+rate_limiter = RateLimiter(
+    PLATFORM_RATES,
+    default_rate=(float(Config.RATE_LIMIT_DEFAULT_RATE), int(Config.RATE_LIMIT_DEFAULT_BURST)),
+    account_rate=(float(Config.RATE_LIMIT_ACCOUNT_RATE), int(Config.RATE_LIMIT_ACCOUNT_BURST)),
+)
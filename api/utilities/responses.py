@@ -1,8 +1,10 @@
 """Customer reponse models"""
 
 
-from typing import Optional
+import json
+from typing import Any, Optional
 
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 
 
@@ -10,3 +12,23 @@ class SuccessResponse(BaseModel):
     """Used for sending a simple 200 success"""
 
     detail: Optional[str]
+
+
+def json_body(content: Any) -> bytes:
+    """
+    Serialises response content the way FastAPI's JSONResponse does, so that
+    cached bodies are byte-identical to the ones FastAPI would send.
+
+    Args:
+        content (Any): The content, e.g. a pydantic model or a list of them.
+
+    Returns:
+        bytes: The JSON body.
+    """
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
@@ -0,0 +1,74 @@
+"""Measures the cold start cost of the field catalog.
+
+Each step runs in a fresh interpreter, so nothing is cached between runs, and
+reports the wall time and the growth of the resident memory, read from
+/proc so Linux only, over the step:
+
+- import: importing api.core.field_catalog, which every worker does at start.
+- one channel: import, then the /fields options of one channel.
+- lookup: import, then a field lookup by alt_value across all channels.
+
+With --cold the interpreters neither read nor write bytecode caches, as in a
+fresh container, so the modules are compiled on every run.
+
+    python -m benchmarks.bench_import --repeat 20 [--cold]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+
+STEPS = {
+    "import": "",
+    "one channel": "field_catalog.field_options(ChannelType.facebook)",
+    "lookup": "field_catalog.by_alt_value('facebook_clicks')",
+}
+
+SCRIPT = """
+import os, time
+def rss_kb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+start_rss = rss_kb()
+start = time.perf_counter()
+from api.core.field_catalog import field_catalog
+from api.core.static_data import ChannelType
+{step}
+seconds = time.perf_counter() - start
+print(seconds, rss_kb() - start_rss)
+"""
+
+# Imported before timing, as every worker imports them anyway.
+PRELUDE = "import pydantic, fastapi, sqlalchemy"
+
+
+def run_step(step: str, cold: bool):
+    script = PRELUDE + "\n" + SCRIPT.format(step=step)
+    command = [sys.executable]
+    if cold:
+        # An empty cache directory that is never written to.
+        command += ["-B", "-X", f"pycache_prefix={tempfile.gettempdir()}/bench_import_no_cache"]
+    output = subprocess.run(
+        command + ["-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    seconds, rss_kb = output.split()
+    return float(seconds), int(rss_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cold", action="store_true")
+    args = parser.parse_args()
+
+    for name, step in STEPS.items():
+        runs = [run_step(step, args.cold) for _ in range(args.repeat)]
+        seconds = statistics.median(run[0] for run in runs)
+        rss_kb = statistics.median(run[1] for run in runs)
+        print(f"{name:<12} {seconds * 1000:7.1f} ms  {rss_kb / 1024:6.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
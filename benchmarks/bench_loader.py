@@ -0,0 +1,82 @@
+"""Compares rows/sec of the COPY loader against the previous to_sql path.
+
+Requires DATABASE_URL to point at a scratch Postgres database. Tables are
+written to the `bench_loader` schema, which is dropped afterwards.
+
+    python -m benchmarks.bench_loader --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from api.core.loader import copy_frames_to_db
+from api.database.database import engine
+
+SCHEMA = "bench_loader"
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2021-01-01", periods=730).strftime("%Y-%m-%d")
+    return pd.DataFrame(
+        {
+            "google_date": rng.choice(dates, rows),
+            "google_campaign_name": rng.choice([f"campaign {i}" for i in range(50)], rows),
+            "google_ad_id": rng.integers(10**9, 10**10, rows),
+            "google_clicks": rng.integers(0, 500, rows),
+            "google_impressions": rng.integers(0, 50000, rows),
+            "google_cost_micros": rng.random(rows).round(2) * 100,
+        }
+    )
+
+
+def load_to_sql(df: pd.DataFrame):
+    df.to_sql(
+        "to_sql",
+        engine,
+        schema=SCHEMA,
+        if_exists="replace",
+        index=False,
+        chunksize=100,
+    )
+
+
+def load_copy(df: pd.DataFrame):
+    copy_frames_to_db(SCHEMA, "copy", [df])
+
+
+def timed(fn, df: pd.DataFrame) -> float:
+    start = time.perf_counter()
+    fn(df)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-to-sql", action="store_true", help="Only time the COPY loader.")
+    args = parser.parse_args()
+
+    engine.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}"')
+    print(f"{'rows':>10} {'to_sql rows/s':>15} {'copy rows/s':>15} {'speedup':>8}")
+    try:
+        for rows in args.sizes:
+            df = make_frame(rows)
+            copy_seconds = timed(load_copy, df)
+            if args.skip_to_sql:
+                print(f"{rows:>10} {'-':>15} {rows / copy_seconds:>15,.0f} {'-':>8}")
+                continue
+            to_sql_seconds = timed(load_to_sql, df)
+            print(
+                f"{rows:>10} {rows / to_sql_seconds:>15,.0f} {rows / copy_seconds:>15,.0f} "
+                f"{to_sql_seconds / copy_seconds:>7.1f}x"
+            )
+    finally:
+        engine.execute(f'DROP SCHEMA "{SCHEMA}" CASCADE')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compares the columnar merge of multi-source rows by date against the
+merge_objects / pad_object_list / object_list_to_df loops.
+
+Builds three synthetic sources totalling 1M rows over two years of dates,
+checks both engines give the same frame and reports the time of each.
+Nothing is read from the database, but importing api.utilities.data creates
+the engine, so DATABASE_URL must be set to any Postgres URL.
+
+    python -m benchmarks.bench_merge --rows 1000000
+"""
+
+import argparse
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+
+from api.utilities.data import (
+    merge_frames_by_date,
+    merge_objects,
+    object_list_to_df,
+    object_lists_to_frames,
+    pad_object_list,
+)
+
+# The share of the rows that comes from each source.
+SOURCES = {
+    "google": 0.5,
+    "facebook": 0.3,
+    "google_analytics": 0.2,
+}
+
+
+def make_frames(rows: int):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2022-01-01", periods=730).strftime("%Y-%m-%d").to_numpy()
+    frames = []
+    for source, share in SOURCES.items():
+        count = int(rows * share)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": rng.choice(dates, count),
+                    f"{source}_campaign": rng.choice([f"campaign {i}" for i in range(50)], count),
+                    f"{source}_clicks": rng.integers(0, 500, count),
+                    f"{source}_cost": rng.random(count).round(2) * 100,
+                }
+            )
+        )
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    frames = make_frames(args.rows)
+    object_lists = [frame.to_dict("records") for frame in frames]
+
+    results = {}
+    for pad_with_date in (True, False):
+        lists = copy.deepcopy(object_lists)
+        start = time.perf_counter()
+        merged = merge_objects(lists)
+        if not pad_with_date:
+            merged = pad_object_list(merged)
+        legacy = object_list_to_df(merged)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columnar = merge_frames_by_date(frames, pad_with_date=pad_with_date)
+        columnar_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_objects = merge_frames_by_date(
+            object_lists_to_frames(object_lists), pad_with_date=pad_with_date
+        )
+        from_objects_seconds = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(legacy, columnar)
+        pd.testing.assert_frame_equal(legacy, from_objects)
+        results[pad_with_date] = (legacy_seconds, columnar_seconds, from_objects_seconds, len(legacy))
+
+    print(f"input rows: {args.rows:,}")
+    for pad_with_date, (legacy_seconds, columnar_seconds, from_objects_seconds, output_rows) in results.items():
+        padding = "date" if pad_with_date else "None"
+        print(f"pad with {padding}, {output_rows:,} output rows")
+        print(f"  legacy loops:        {legacy_seconds:.2f}s")
+        print(f"  columnar (frames):   {columnar_seconds:.2f}s  {legacy_seconds / columnar_seconds:.1f}x")
+        print(f"  columnar (objects):  {from_objects_seconds:.2f}s  {legacy_seconds / from_objects_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
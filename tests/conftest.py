@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+# Importing the api creates the database engine, which needs a URL but does not
+# connect until it is used, and reads the token expiry of the auth module.
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/airpipe_test")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+
+class FakeResult:
+    def __init__(self, rows=(), rowcount=0):
+        self.rows = list(rows)
+        self.rowcount = rowcount
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def copy_expert(self, sql, buffer):
+        self.connection.copies.append((sql, buffer.getvalue()))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """
+    Records the statements run on it. Tables are described by their quoted
+    schema."name" and the Postgres type of each column, as `table_column_types`
+    reads them.
+    """
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.statements = []
+        self.copies = []
+        self.connection = self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def execute(self, statement, *args, **params):
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if "pg_attribute" in sql:
+            return FakeResult(self.tables.get(params["name"], {}).items())
+        if "information_schema.columns" in sql:
+            columns = self.tables.get(f'"{params["schema"]}"."{params["table_name"]}"', {})
+            return FakeResult([(1,)] if "ad_account_id" in columns else [])
+        return FakeResult(rowcount=1)
+
+    def sql(self, keyword):
+        return [sql for sql, _ in self.statements if sql.lstrip().startswith(keyword)]
+
+
+@pytest.fixture
+def fake_connection():
+    return FakeConnection
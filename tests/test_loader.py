@@ -0,0 +1,79 @@
+import pandas as pd
+
+from api.core.loader import copy_to_staging, widen_kind
+
+
+def stage(connection, frames):
+    """Copies frames into a staging table the way a load does."""
+    return copy_to_staging(connection, "_1", "ads__staging", frames[0], frames[1:])
+
+
+def test_later_float_frame_widens_integer_column(fake_connection):
+    connection = fake_connection()
+    first = pd.DataFrame({"date": ["2024-01-01"], "spend": [0]})
+    second = pd.DataFrame({"date": ["2024-01-02"], "spend": [1.25]})
+
+    rows, kinds = stage(connection, [first, second])
+
+    assert rows == 2
+    assert kinds == {"date": "text", "spend": "floating"}
+    assert connection.sql("ALTER TABLE") == [
+        'ALTER TABLE "_1"."ads__staging" ADD COLUMN "date" TEXT, ADD COLUMN "spend" BIGINT',
+        'ALTER TABLE "_1"."ads__staging" ALTER COLUMN "spend" TYPE DOUBLE PRECISION '
+        'USING "spend"::DOUBLE PRECISION',
+    ]
+    assert connection.copies[1][1] == "2024-01-02,1.25\n"
+
+
+def test_integral_floats_stay_integers(fake_connection):
+    connection = fake_connection()
+    first = pd.DataFrame({"clicks": [1, 2]})
+    second = pd.DataFrame({"clicks": [3.0, None]})
+
+    _, kinds = stage(connection, [first, second])
+
+    assert kinds == {"clicks": "integer"}
+    assert len(connection.sql("ALTER TABLE")) == 1
+    assert connection.copies[1][1] == "3\n\\N\n"
+
+
+def test_later_text_frame_widens_numeric_column(fake_connection):
+    connection = fake_connection()
+
+    _, kinds = stage(connection, [pd.DataFrame({"id": [1]}), pd.DataFrame({"id": ["abc"]})])
+
+    assert kinds == {"id": "text"}
+    assert 'ALTER COLUMN "id" TYPE TEXT' in connection.sql("ALTER TABLE")[-1]
+
+
+def test_columns_missing_from_first_frame_are_added(fake_connection):
+    connection = fake_connection()
+    first = pd.DataFrame({"date": ["2024-01-01"], "clicks": [1]})
+    second = pd.DataFrame({"date": ["2024-01-02"], "spend": [1.5]})
+
+    _, kinds = stage(connection, [first, second])
+
+    assert list(kinds) == ["date", "clicks", "spend"]
+    assert connection.sql("ALTER TABLE")[-1] == (
+        'ALTER TABLE "_1"."ads__staging" ADD COLUMN "spend" DOUBLE PRECISION'
+    )
+    sql, body = connection.copies[1]
+    assert '("date", "clicks", "spend")' in sql
+    assert body == "2024-01-02,\\N,1.5\n"
+
+
+def test_null_columns_take_the_kind_of_their_first_values(fake_connection):
+    connection = fake_connection()
+
+    _, kinds = stage(connection, [pd.DataFrame({"spend": [None]}), pd.DataFrame({"spend": [2]})])
+
+    assert kinds == {"spend": "integer"}
+    assert 'ALTER COLUMN "spend" TYPE BIGINT' in connection.sql("ALTER TABLE")[-1]
+
+
+def test_widen_kind():
+    assert widen_kind("integer", "floating") == "floating"
+    assert widen_kind("floating", "integer") == "floating"
+    assert widen_kind("integer", None) == "integer"
+    assert widen_kind(None, "date") == "date"
+    assert widen_kind("date", "integer") == "text"
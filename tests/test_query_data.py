@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+
+from api.core.static_data import ChannelType, FieldType, JoinType
+from api.models.data import DataSourceInDB, FieldOption, FieldOptionWithDataSourceId, JoinCondition
+from api.query import data
+
+
+@pytest.fixture
+def cached_tables(monkeypatch):
+    """Captures the tables `query_response` would key the result on."""
+    calls = []
+    monkeypatch.setattr(data, "get_current_user", lambda token: None)
+    monkeypatch.setattr(
+        data,
+        "query_response",
+        lambda query, build, tables=None: calls.append((query, tables)),
+    )
+    return calls
+
+
+def test_table_results_keys_plain_names_on_the_table(cached_tables):
+    data.table_results("token", "_1", "ads", date_column="date")
+
+    assert cached_tables[0][1] == [("_1", "ads")]
+
+
+@pytest.mark.parametrize(
+    "schema, name, date_column",
+    [
+        ("_1", 'ads" UNION SELECT * FROM _2."secrets', None),
+        ("_1, _2.secrets", "ads", None),
+        ("_1", "ads", "date IN (SELECT date FROM _2.secrets)"),
+    ],
+)
+def test_table_results_scans_other_queries_for_schemas(cached_tables, schema, name, date_column):
+    data.table_results("token", schema, name, date_column=date_column)
+
+    assert cached_tables[0][1] is None
+
+
+def field(alt_value: str, data_source_id: int) -> FieldOptionWithDataSourceId:
+    return FieldOptionWithDataSourceId(
+        value=alt_value,
+        label=alt_value,
+        type=FieldType.dimension,
+        channel=ChannelType.facebook,
+        alt_value=alt_value,
+        data_source_id=data_source_id,
+    )
+
+
+def data_source(id: int, name: str) -> DataSourceInDB:
+    return DataSourceInDB(
+        id=id,
+        user_id="1",
+        db_schema="_1",
+        name=name,
+        table_name=f"_1.{name}",
+        fields="date",
+        channel="facebook",
+        channel_img="",
+        ad_account_id="act_1",
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 2, 1),
+    )
+
+
+def blend(cached_tables, left_name="fb", right_name="gg", alt_value="fb_clicks"):
+    condition = JoinCondition(
+        left_field=FieldOption(**field("fb_date", 1).dict(exclude={"data_source_id"})),
+        right_field=FieldOption(**field("gg_date", 2).dict(exclude={"data_source_id"})),
+        join_type=JoinType.left,
+        left_data_source_id=1,
+        right_data_source_id=2,
+    )
+    data.create_blend(
+        "token",
+        fields=[field("fb_date", 1), field(alt_value, 1)],
+        join_conditions=[condition],
+        left_data_source=data_source(1, left_name),
+        right_data_source=data_source(2, right_name),
+    )
+    return cached_tables[0][1]
+
+
+def test_create_blend_keys_plain_names_on_both_tables(cached_tables):
+    assert blend(cached_tables) == [("_1", "fb"), ("_1", "gg")]
+
+
+@pytest.mark.parametrize(
+    "names",
+    [
+        {"right_name": 'gg" JOIN _2."secrets'},
+        {"alt_value": 'fb_clicks", (SELECT 1 FROM _2.secrets) AS "x'},
+    ],
+)
+def test_create_blend_scans_other_queries_for_schemas(cached_tables, names):
+    assert blend(cached_tables, **names) is None
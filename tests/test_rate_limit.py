@@ -0,0 +1,162 @@
+import json
+
+import pytest
+
+from api.utilities import rate_limit
+from api.utilities.rate_limit import (
+    MIN_THROTTLE,
+    RateLimiter,
+    TokenBucket,
+    parse_facebook_usage,
+    parse_retry_after,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def usage_headers(**headers):
+    return {name.replace("_", "-"): json.dumps(value) for name, value in headers.items()}
+
+
+def business_usage(account_id, call_count, regain=0):
+    return {
+        account_id: [
+            {
+                "type": "ads_insights",
+                "call_count": call_count,
+                "total_cputime": 1,
+                "total_time": 1,
+                "estimated_time_to_regain_access": regain,
+            }
+        ]
+    }
+
+
+def test_parse_facebook_usage_reads_highest_usage_and_regain():
+    headers = usage_headers(
+        x_app_usage={"call_count": 12, "total_cputime": 30, "total_time": 5},
+        x_business_use_case_usage=business_usage("act_1", 80, regain=10),
+        x_ad_account_usage={"acc_id_util_pct": 40},
+    )
+
+    assert parse_facebook_usage(headers) == (80.0, 600.0)
+    assert parse_facebook_usage(headers, ("x-app-usage",)) == (30.0, 0.0)
+    assert parse_facebook_usage(headers, ("x-ad-account-usage",)) == (40.0, 0.0)
+
+
+def test_parse_facebook_usage_without_headers():
+    assert parse_facebook_usage({}) == (None, 0.0)
+    assert parse_facebook_usage({"x-app-usage": "not json"}) == (None, 0.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+
+def test_token_bucket_allows_burst_then_waits_for_refill(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    clock.now += 1.5
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_throttle_slows_refill(clock):
+    bucket = TokenBucket(rate=2.0, capacity=1)
+    bucket.set_throttle(0.5)
+
+    bucket.reserve()
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    bucket.set_throttle(0.0)
+    assert bucket.throttle == MIN_THROTTLE
+
+
+def test_token_bucket_pause_delays_requests_and_refill(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket.pause(10)
+    bucket.pause(5)
+
+    assert bucket.reserve() == pytest.approx(10.0)
+    clock.now += 10
+    # Nothing was refilled while paused, so the token taken above is still owed.
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def limiter():
+    return RateLimiter({"facebook": (5.0, 10)}, default_rate=(5.0, 10), account_rate=(2.0, 5))
+
+
+def test_account_usage_only_pauses_its_account(clock):
+    rate_limiter = limiter()
+    response = Response(
+        usage_headers(x_business_use_case_usage=business_usage("act_1", 100, regain=10))
+    )
+
+    assert rate_limiter.observe("facebook", "act_1", response) == 600.0
+
+    stats = rate_limiter.stats()
+    assert stats["facebook"]["paused_for"] == 0.0
+    assert stats["facebook"]["throttle"] == 1.0
+    assert stats["facebook:act_1"]["paused_for"] == 600.0
+    assert stats["facebook:act_1"]["throttle"] == MIN_THROTTLE
+
+
+def test_healthy_account_does_not_reset_another_accounts_throttle(clock):
+    rate_limiter = limiter()
+    rate_limiter.observe(
+        "facebook", "act_1", Response(usage_headers(x_ad_account_usage={"acc_id_util_pct": 95}))
+    )
+    rate_limiter.observe(
+        "facebook", "act_2", Response(usage_headers(x_ad_account_usage={"acc_id_util_pct": 1}))
+    )
+
+    stats = rate_limiter.stats()
+    assert stats["facebook:act_1"]["throttle"] == pytest.approx(0.2)
+    assert stats["facebook:act_2"]["throttle"] == 1.0
+    assert stats["facebook"]["throttle"] == 1.0
+
+
+def test_app_usage_throttles_the_platform(clock):
+    rate_limiter = limiter()
+    rate_limiter.observe(
+        "facebook", "act_1", Response(usage_headers(x_app_usage={"call_count": 90}))
+    )
+
+    stats = rate_limiter.stats()
+    assert stats["facebook"]["throttle"] == pytest.approx(0.4)
+    assert stats["facebook:act_1"]["throttle"] == 1.0
+
+
+def test_retry_after_pauses_platform_and_account(clock):
+    rate_limiter = limiter()
+
+    assert rate_limiter.observe("facebook", "act_1", Response({"Retry-After": "3"})) == 3.0
+
+    stats = rate_limiter.stats()
+    assert stats["facebook"]["paused_for"] == 3.0
+    assert stats["facebook:act_1"]["paused_for"] == 3.0
@@ -0,0 +1,109 @@
+import pytest
+
+from api.core.result_cache import (
+    is_read_query,
+    normalise_query,
+    plain_identifiers,
+    query_schemas,
+)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * FROM _1.ads",
+        "  select date, sum(spend) from _1.\"ads\" group by date;",
+        "WITH daily AS (SELECT * FROM _1.ads) SELECT * FROM daily",
+        "TABLE _1.ads",
+        "VALUES (1), (2)",
+        "SELECT 'delete from _1.ads; drop table x' AS note FROM _1.ads",
+        'SELECT "into" FROM _1.ads',
+    ],
+)
+def test_read_queries(query):
+    assert is_read_query(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT * INTO _1.copy FROM _1.ads",
+        "WITH gone AS (DELETE FROM _1.ads RETURNING *) SELECT * FROM gone",
+        "WITH moved AS (UPDATE _1.ads SET spend = 0 RETURNING *) SELECT 1",
+        "SELECT 1; DELETE FROM _1.ads",
+        "SELECT 1;DROP TABLE _1.ads;",
+        "SELECT * FROM _1.ads FOR UPDATE",
+        "SELECT nextval('_1.seq')",
+        "DELETE FROM _1.ads",
+        "INSERT INTO _1.ads VALUES (1)",
+        "CREATE TABLE _1.copy AS SELECT * FROM _1.ads",
+    ],
+)
+def test_write_queries(query):
+    assert not is_read_query(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        # The apostrophe in the comment would pair with the one at the end.
+        "SELECT 1 -- it's\n; DELETE FROM _1.ads --'",
+        "SELECT 1 /* it's */; DELETE FROM _1.ads /*'*/",
+        "SELECT $$'$$; DELETE FROM _1.ads; SELECT $$'$$",
+        "SELECT E'\\''; DELETE FROM _1.ads; SELECT ''",
+    ],
+)
+def test_queries_hiding_statements_are_not_read_queries(query):
+    assert not is_read_query(query)
+
+
+def test_normalise_query_collapses_whitespace_outside_literals():
+    assert (
+        normalise_query("SELECT  *\n\tFROM _1.\"my  ads\"\nWHERE name = 'a   b' ;")
+        == "SELECT * FROM _1.\"my  ads\" WHERE name = 'a   b'"
+    )
+    assert normalise_query("SELECT 1") == normalise_query("  SELECT\n1;")
+
+
+def test_normalise_query_keeps_queries_with_comments():
+    query = "SELECT 1 -- first\n, 2"
+    assert normalise_query(query) == query
+    assert normalise_query("SELECT 1 /* a */") == "SELECT 1 /* a */"
+
+
+def test_query_schemas():
+    assert query_schemas("SELECT * FROM ads") == {"public"}
+    assert query_schemas("SELECT * FROM _1.ads JOIN _2.\"x\" ON true") >= {"public", "_1", "_2"}
+    assert "_1" in query_schemas("SELECT * FROM _1 . ads")
+    assert "mixed" in query_schemas("SELECT * FROM Mixed.ads")
+
+
+def test_query_schemas_unescapes_quoted_schemas():
+    schemas = query_schemas('SELECT * FROM "my""schema"."ads", "Upper".ads')
+    assert 'my"schema' in schemas
+    assert "Upper" in schemas
+
+
+def test_query_schemas_skips_literals():
+    assert query_schemas("SELECT * FROM ads WHERE name = 'other.ads'") == {"public"}
+
+
+def test_query_schemas_reads_names_hidden_by_comments():
+    query = "SELECT 1 -- it's\n; DELETE FROM _2.ads --'"
+    assert "_2" in query_schemas(query)
+
+
+@pytest.mark.parametrize(
+    "names, plain",
+    [
+        (("_1", '"ads"'), True),
+        (("_1", '"my ""quoted"" ads"', None), True),
+        (("_1", '"ads" UNION SELECT * FROM _2."x"'), False),
+        (("_1; DROP TABLE _1.ads", '"ads"'), False),
+        (("_1", '"ads"', "date"), True),
+        (("_1", '"ads"', "date OR 1=1"), False),
+        (("_1", '"ads"', '"ads"."date"'), False),
+    ],
+)
+def test_plain_identifiers(names, plain):
+    assert plain_identifiers(*names) == plain
@@ -0,0 +1,57 @@
+from api.core.data import keep_failed_account_rows
+from api.core.static_data import ChannelType
+from api.models.connector import AdAccount
+from api.models.data import AccountFetchResult
+
+
+def failure(account_id: str) -> AccountFetchResult:
+    return AccountFetchResult(
+        ad_account=AdAccount(id=account_id, channel=ChannelType.facebook),
+        error="Timed out",
+        status_code=500,
+    )
+
+
+def test_full_sync_keeps_rows_of_failed_accounts(fake_connection):
+    connection = fake_connection(
+        {
+            '"_1"."ads"': {"date": "text", "ad_account_id": "text", "spend": "bigint"},
+            '"_1"."ads__staging"': {"date": "text", "ad_account_id": "text", "spend": "double precision"},
+        }
+    )
+
+    keep_failed_account_rows([failure("act_2")], "ads")(connection, "_1", "ads__staging")
+
+    [delete] = connection.sql("DELETE")
+    assert delete.startswith('DELETE FROM "_1"."ads__staging"')
+    [insert] = connection.sql("INSERT")
+    assert insert.startswith('INSERT INTO "_1"."ads__staging" ("date", "ad_account_id", "spend")')
+    assert 'FROM "_1"."ads" WHERE CAST("ad_account_id" AS TEXT) IN' in insert
+    assert connection.statements[-1][1] == {"values": ["act_2"]}
+    # Rows loaded before the account failed are deleted before the old ones are copied in.
+    statements = [sql for sql, _ in connection.statements]
+    assert statements.index(delete) < statements.index(insert)
+
+
+def test_full_sync_without_failures_copies_nothing(fake_connection):
+    connection = fake_connection({'"_1"."ads"': {"ad_account_id": "text"}})
+
+    keep_failed_account_rows([], "ads")(connection, "_1", "ads__staging")
+
+    assert connection.statements == []
+
+
+def test_staging_columns_are_widened_for_the_kept_rows(fake_connection):
+    connection = fake_connection(
+        {
+            '"_1"."ads"': {"ad_account_id": "text", "spend": "double precision"},
+            '"_1"."ads__staging"': {"ad_account_id": "text", "spend": "bigint"},
+        }
+    )
+
+    keep_failed_account_rows([failure("act_2")], "ads")(connection, "_1", "ads__staging")
+
+    [alter] = connection.sql("ALTER TABLE")
+    assert 'ALTER COLUMN "spend" TYPE DOUBLE PRECISION' in alter
+    [insert] = connection.sql("INSERT")
+    assert 'CAST("spend" AS double precision)' in insert